@@ -7,9 +7,13 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.subplots import make_subplots
 from pathlib import Path
 import sys
 import os
+import hashlib
+import tempfile
+import weakref
 
 # Add modules to path
 sys.path.append(str(Path(__file__).parent))
@@ -19,6 +23,7 @@ from modules.file_processor import FileProcessor
 from modules.symptom_checker import SymptomChecker
 from modules.chatbot import SeizureChatbot
 from modules.doctor_recommender import DoctorRecommender
+from modules.recording_viewer import RecordingViewer
 
 
 # Page configuration
@@ -76,16 +81,78 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# Shared resources: created once per server process and used by every
+# session and rerun. Only the chatbot, which keeps a conversation, is per session.
+@st.cache_resource(show_spinner="Loading model...")
+def get_predictor():
+    # Raises (and is not cached) until a model has been trained
+    return SeizurePredictor()
+
+
+@st.cache_resource
+def get_file_processor():
+    return FileProcessor()
+
+
+@st.cache_resource
+def get_symptom_checker():
+    return SymptomChecker()
+
+
+@st.cache_resource
+def get_doctor_recommender():
+    return DoctorRecommender()
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def process_upload(file_hash, file_name, _contents):
+    """
+    FileProcessor result for an upload, cached by content hash so reruns and
+    other sessions uploading the same file skip parsing
+    """
+    suffix = os.path.splitext(file_name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(_contents)
+        temp_path = f.name
+    try:
+        return get_file_processor().process_file(temp_path)
+    finally:
+        os.remove(temp_path)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing recording...")
+def load_recording(file_hash, _contents):
+    """
+    Signal pyramid and probability timeline of an EDF upload, built once per
+    file; the EDF stays on disk because views read raw samples from it, and
+    is deleted once the cache evicts the viewer and no session still uses it
+    """
+    # Every load writes its own file, so a viewer evicted while a session
+    # still holds it never has its file removed by a newer load
+    fd, path = tempfile.mkstemp(prefix=f"seizureguard_{file_hash}_", suffix='.edf')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(_contents)
+    
+    try:
+        predict_batch = get_predictor().predict_batch
+    except Exception:
+        predict_batch = None
+    try:
+        viewer = RecordingViewer.from_edf(path, predict_batch_fn=predict_batch,
+                                          feature_fn=get_file_processor().extract_features_from_eeg)
+    except Exception:
+        os.remove(path)
+        raise
+    weakref.finalize(viewer, os.remove, path)
+    return viewer
+
+
 # Initialize session state
 def init_session_state():
     if 'chatbot' not in st.session_state:
         st.session_state.chatbot = SeizureChatbot()
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
-    if 'predictor_loaded' not in st.session_state:
-        st.session_state.predictor_loaded = False
-    if 'predictor' not in st.session_state:
-        st.session_state.predictor = None
 
 
 init_session_state()
@@ -206,18 +273,15 @@ def upload_file_page():
     )
     
     if uploaded_file is not None:
-        # Save uploaded file temporarily
-        temp_path = f"temp_{uploaded_file.name}"
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        contents = uploaded_file.getvalue()
+        file_hash = hashlib.sha256(contents).hexdigest()
         
         st.success(f"✓ File uploaded: {uploaded_file.name}")
         
         # Process file
         with st.spinner("Processing file..."):
             try:
-                processor = FileProcessor()
-                result = processor.process_file(temp_path)
+                result = process_upload(file_hash, uploaded_file.name, contents)
                 
                 if result['success']:
                     st.success(f"✓ {result['message']}")
@@ -233,13 +297,8 @@ def upload_file_page():
                     if st.button("🔍 Analyze for Seizure Detection", type="primary"):
                         with st.spinner("Analyzing..."):
                             try:
-                                # Load predictor
-                                if not st.session_state.predictor_loaded:
-                                    st.session_state.predictor = SeizurePredictor()
-                                    st.session_state.predictor_loaded = True
-                                
                                 # Make prediction
-                                prediction_result = st.session_state.predictor.predict(result['features'])
+                                prediction_result = get_predictor().predict(result['features'])
                                 
                                 # Display results
                                 display_prediction_results(prediction_result)
@@ -247,7 +306,7 @@ def upload_file_page():
                                 # Recommend doctors
                                 st.markdown("---")
                                 recommend_doctors_section(prediction_result['risk_level'])
-                                
+                            
                             except FileNotFoundError:
                                 st.error("⚠️ Model not found. Please train the model first.")
                                 st.info("Run: `python modules/trainer.py` to train the model")
@@ -255,13 +314,15 @@ def upload_file_page():
                                 st.error(f"Error during prediction: {str(e)}")
                 else:
                     st.error(f"Error processing file: {result.get('error', 'Unknown error')}")
-                
+            
             except Exception as e:
                 st.error(f"Error: {str(e)}")
-            finally:
-                # Clean up temp file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+        
+        if uploaded_file.name.lower().endswith('.edf'):
+            try:
+                recording_section(load_recording(file_hash, contents))
+            except Exception as e:
+                st.error(f"Error reading recording: {str(e)}")
     else:
         # Show example
         st.info("👆 Upload a file to begin analysis")
@@ -290,8 +351,7 @@ def symptom_checker_page():
     if st.button("🔍 Analyze Symptoms", type="primary"):
         if symptom_text.strip():
             with st.spinner("Analyzing symptoms..."):
-                checker = SymptomChecker()
-                result = checker.analyze_symptoms(symptom_text)
+                result = get_symptom_checker().analyze_symptoms(symptom_text)
                 
                 # Display results
                 st.markdown("---")
@@ -440,7 +500,7 @@ def find_neurologist_page():
     st.markdown("# 👨‍⚕️ Find a Neurologist")
     st.markdown("Search for qualified neurologists in your area")
     
-    recommender = DoctorRecommender()
+    recommender = get_doctor_recommender()
     
     # Search filters
     col1, col2, col3 = st.columns(3)
@@ -554,11 +614,65 @@ def display_prediction_results(result):
     st.plotly_chart(fig, use_container_width=True)
 
 
+RECORDING_SPANS = {"10 s": 10, "1 min": 60, "10 min": 600, "1 h": 3600}
+
+
+def recording_section(viewer):
+    """Zoomable EEG traces with the seizure probability timeline underneath"""
+    st.markdown("### 📈 Recording")
+    duration = viewer.duration
+    
+    col1, col2, col3 = st.columns([1, 3, 2])
+    with col1:
+        spans = {label: span for label, span in RECORDING_SPANS.items() if span < duration}
+        spans["Whole recording"] = duration
+        span = spans[st.selectbox("Window", list(spans), index=len(spans) - 1)]
+    with col2:
+        start = 0.0
+        if duration > span:
+            start = st.slider("Start (s)", 0.0, float(duration - span), 0.0, step=max(span / 10, 1.0))
+    with col3:
+        names = st.multiselect("Channels", viewer.channels, default=viewer.channels)
+    channels = [viewer.channels.index(name) for name in names] or [0]
+    
+    # About one point per pixel of plot width, whatever the zoom
+    view = viewer.view(start, start + span, channels=channels, max_points=1000)
+    
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.8, 0.2], vertical_spacing=0.03)
+    spread = np.percentile(view['max'] - view['min'], 90) if view['bin_samples'] > 1 else 0
+    spacing = float(max(spread, np.percentile(np.abs(view['max']), 99) * 2, 1e-9))
+    offsets = -spacing * np.arange(len(channels))
+    for name, offset, mins, maxs in zip(view['channels'], offsets, view['min'], view['max']):
+        if view['bin_samples'] == 1:
+            x, y = view['time'], mins
+        else:
+            # One vertical stroke from min to max per bin keeps every spike visible
+            x, y = np.repeat(view['time'], 2), np.column_stack([mins, maxs]).ravel()
+        fig.add_trace(go.Scattergl(x=x, y=y + offset, mode='lines', name=name, line=dict(width=1)), row=1, col=1)
+    fig.update_yaxes(tickvals=offsets, ticktext=view['channels'], row=1, col=1)
+    
+    timeline = view['timeline']
+    if timeline is not None and len(timeline['time']):
+        for label, color in (('PREICTAL', 'orange'), ('SEIZURE', 'red')):
+            fig.add_trace(go.Scatter(x=timeline['time'], y=timeline[label], mode='lines', name=label,
+                                     line=dict(color=color), fill='tozeroy'), row=2, col=1)
+        fig.update_yaxes(title_text="Prob. (%)", range=[0, 100], row=2, col=1)
+    
+    fig.update_layout(height=max(400, 40 * len(channels) + 200), showlegend=False,
+                      margin=dict(l=10, r=10, t=10, b=10))
+    fig.update_xaxes(title_text="Time (s)", row=2, col=1)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    resolution = "raw samples" if view['bin_samples'] == 1 else f"min/max of {view['bin_samples']} samples per point"
+    length = f"{duration / 3600:.1f} h" if duration >= 3600 else f"{duration / 60:.1f} min"
+    st.caption(f"{length}, {len(viewer.channels)} channels at {viewer.sfreq:g} Hz; showing {resolution}")
+
+
 def recommend_doctors_section(risk_level):
     """Display doctor recommendations based on risk level"""
     st.markdown("## 👨‍⚕️ Recommended Neurologists")
     
-    recommender = DoctorRecommender()
+    recommender = get_doctor_recommender()
     
     # Get recommendations based on risk level
     emergency = risk_level == 'HIGH'
@@ -2,43 +2,194 @@
 Flask Backend API for SeizureGuard AI
 RESTful API endpoints for all AI functionalities
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import sys
 import os
+import json
+import re
+import threading
+import time
 from pathlib import Path
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from modules.predictor import SeizurePredictor
+from modules.model_registry import ModelRegistry
+from modules.micro_batcher import MicroBatcher
+from modules.prediction_cache import PredictionCache
+from modules.incremental_updater import FeedbackStore, IncrementalUpdater
+from modules.stream_processor import StreamProcessor
+from modules.alert_engine import AlertEngine
 from modules.symptom_checker import SymptomChecker
 from modules.chatbot import SeizureChatbot
-from modules.doctor_recommender import DoctorRecommender
+from modules.doctor_recommender import DoctorRecommender, SEARCH_FIELDS
 from modules.file_processor import FileProcessor
+from utils.metrics import metrics, timed
+from utils.profiler import SamplingProfiler
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Records response serialization time for every jsonify call"""
+    
+    @staticmethod
+    def default(value):
+        # File features come back as numpy scalars and arrays
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        return DefaultJSONProvider.default(value)
+    
+    def dumps(self, obj, **kwargs):
+        with timed('response_serialization'):
+            return super().dumps(obj, **kwargs)
+
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 CORS(app)  # Enable CORS for React frontend
 
+# Send "X-Profile: 1" on a request to write its sampled stacks to PROFILE_DIR
+# (only when the server runs with ENABLE_PROFILING=1)
+PROFILING_ENABLED = os.environ.get('ENABLE_PROFILING') == '1'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+metrics.describe('request_duration_seconds', 'Time to handle each API request')
+
 # Initialize modules
+# Repeated feature vectors (steady-state device windows) are answered from
+# the cache; PREDICT_CACHE_DECIMALS rounds values so near-duplicates share
+# an entry, and PREDICT_CACHE_SIZE=0 disables caching
+cache_decimals = os.environ.get('PREDICT_CACHE_DECIMALS')
+prediction_cache = PredictionCache(
+    capacity=int(os.environ.get('PREDICT_CACHE_SIZE', 10000)),
+    ttl_seconds=float(os.environ.get('PREDICT_CACHE_TTL', 300)),
+    decimals=int(cache_decimals) if cache_decimals else None
+)
+model_registry = ModelRegistry(prediction_cache=prediction_cache)
+model_registry.register('default', 'random_forest', 'models')
+# Versions registered over the API load only from their own directory here,
+# so a request cannot make the server unpickle files from another path
+MODEL_VERSIONS_DIR = os.path.join('models', 'versions')
+MODEL_VERSION_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]{0,63}')
+model_registry.discover(MODEL_VERSIONS_DIR)
 try:
-    predictor = SeizurePredictor()
-    predictor_loaded = True
-except:
-    predictor_loaded = False
+    model_registry.load('default')
+    model_registry.activate('default')
+except Exception:
+    pass
+
+# Concurrent /api/predict requests are coalesced into one batched model call
+# (set PREDICT_MAX_BATCH_SIZE=1 to score every request on its own)
+# Requests only reach the batcher after a cache miss, so it skips the lookup;
+# PREDICT_TIMEOUT_S bounds how long a request waits for its batch
+predict_batcher = MicroBatcher(
+    lambda features_list: model_registry.predict_batch(features_list, check_cache=False),
+    max_batch_size=int(os.environ.get('PREDICT_MAX_BATCH_SIZE', 64)),
+    max_wait_ms=float(os.environ.get('PREDICT_BATCH_WINDOW_MS', 2)),
+    timeout_s=float(os.environ.get('PREDICT_TIMEOUT_S', 30))
+)
+
+# Clinician-confirmed labels from /api/feedback grow the active forest with
+# new trees; INCREMENTAL_UPDATE_INTERVAL > 0 checks for new feedback every
+# N seconds (in one worker under prefork.py), otherwise updates run on
+# POST /api/feedback/update
+feedback_store = FeedbackStore(os.environ.get('FEEDBACK_PATH', 'datasets/feedback/feedback.jsonl'))
+incremental_updater = IncrementalUpdater(
+    model_registry,
+    feedback_store,
+    trees_per_update=int(os.environ.get('INCREMENTAL_TREES', 20)),
+    min_new_labels=int(os.environ.get('INCREMENTAL_MIN_LABELS', 50)),
+    publish=os.environ.get('INCREMENTAL_PUBLISH', 'shadow')
+)
+update_interval = float(os.environ.get('INCREMENTAL_UPDATE_INTERVAL', 0))
+if update_interval > 0:
+    incremental_updater.start(update_interval)
 
 symptom_checker = SymptomChecker()
 chatbot = SeizureChatbot()
 doctor_recommender = DoctorRecommender()
+# The doctor CSV is checked every DOCTOR_RELOAD_INTERVAL seconds and changes
+# are swapped in while requests keep running; 0 disables the check here, and
+# the server entry points check every 60 seconds unless it is set
+doctor_reload_interval = float(os.environ.get('DOCTOR_RELOAD_INTERVAL', 0))
+if doctor_reload_interval > 0:
+    doctor_recommender.start_watcher(doctor_reload_interval)
 file_processor = FileProcessor()
 
+# Each open EEG stream holds a server thread (Flask) or connection (ASGI)
+MAX_STREAMS = int(os.environ.get('STREAM_MAX_STREAMS', 32))
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+# Smoothing and hysteresis for stream alerts; each stream keeps its own state
+alert_engine = AlertEngine(
+    alpha=float(os.environ.get('ALERT_ALPHA', 0.3)),
+    onset_threshold=float(os.environ.get('ALERT_ONSET_THRESHOLD', 0.6)),
+    offset_threshold=float(os.environ.get('ALERT_OFFSET_THRESHOLD', 0.4)),
+    onset_windows=int(os.environ.get('ALERT_ONSET_WINDOWS', 2)),
+    offset_windows=int(os.environ.get('ALERT_OFFSET_WINDOWS', 3))
+)
+
+
+def create_stream_processor(params, stream_id=None) -> StreamProcessor:
+    """Build a StreamProcessor from query parameters (channels, sfreq, window, hop)"""
+    if 'channels' not in params:
+        raise ValueError('channels query parameter is required')
+    
+    return StreamProcessor(
+        predict_fn=predict_batcher.predict,
+        feature_fn=file_processor.extract_features_from_eeg,
+        n_channels=int(params['channels']),
+        sfreq=float(params.get('sfreq', 256)),
+        window_seconds=float(params.get('window', 2.0)),
+        hop_seconds=float(params.get('hop', 0.5)),
+        max_backlog=int(params.get('max_backlog', 4)),
+        stream_id=stream_id or params.get('stream_id'),
+        alert_engine=alert_engine
+    )
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if PROFILING_ENABLED and request.headers.get('X-Profile'):
+        g.profiler = SamplingProfiler().start()
+
+
+@app.after_request
+def record_request_metrics(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        response.headers['X-Profile-File'] = profiler.stop().write(PROFILE_DIR, request.endpoint or 'unmatched')
+    
+    start = g.pop('request_start', None)
+    if start is not None:
+        metrics.observe('request_duration_seconds', time.perf_counter() - start, {
+            'endpoint': request.endpoint or 'unmatched',
+            'method': request.method,
+            'status': response.status_code
+        })
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Stage and request latency histograms in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'predictor_loaded': predictor_loaded,
+        'predictor_loaded': model_registry.is_ready(),
+        'model_version': model_registry.active_version,
+        'prediction_cache': prediction_cache.get_stats(),
         'version': '1.0.0'
     })
 
@@ -47,7 +198,7 @@ def health_check():
 def predict():
     """Predict seizure from features"""
     try:
-        if not predictor_loaded:
+        if not model_registry.is_ready():
             return jsonify({
                 'success': False,
                 'error': 'Model not loaded. Please train the model first.'
@@ -56,7 +207,12 @@ def predict():
         data = request.json
         features = data.get('features', {})
         
-        result = predictor.predict(features)
+        result = model_registry.get_cached(features)
+        if result is None and 'profiler' in g:
+            # Profiled requests skip the batcher so the sampled thread does the work
+            result = model_registry.predict(features)
+        elif result is None:
+            result = predict_batcher.predict(features)
         
         return jsonify({
             'success': True,
@@ -74,13 +230,17 @@ def predict():
 def upload_file():
     """Process uploaded file"""
     try:
-        if 'file' not in request.files:
+        # The multipart body is read and parsed on first access
+        with timed('upload_read'):
+            files = request.files
+        
+        if 'file' not in files:
             return jsonify({
                 'success': False,
                 'error': 'No file provided'
             }), 400
         
-        file = request.files['file']
+        file = files['file']
         
         if file.filename == '':
             return jsonify({
@@ -90,7 +250,8 @@ def upload_file():
         
         # Save file temporarily
         temp_path = f"temp_{file.filename}"
-        file.save(temp_path)
+        with timed('upload_save'):
+            file.save(temp_path)
         
         # Process file
         result = file_processor.process_file(temp_path)
@@ -101,10 +262,13 @@ def upload_file():
         
         if result['success']:
             # Make prediction if model is loaded
-            if predictor_loaded:
-                prediction = predictor.predict(result['features'])
+            if model_registry.is_ready():
+                prediction = model_registry.predict(result['features'])
                 result['prediction'] = prediction
             
+            # Raw DataFrames are not JSON serializable
+            result.pop('raw_data', None)
+            
             return jsonify({
                 'success': True,
                 'result': result
@@ -122,6 +286,82 @@ def upload_file():
         }), 500
 
 
+@app.route('/api/stream', methods=['POST'])
+def stream_eeg():
+    """
+    Stream raw EEG over chunked HTTP
+    
+    The body is little-endian float32 frames (one value per channel, sample
+    after sample); the response is NDJSON with one prediction per hop,
+    written as soon as each hop completes, then a final stats line
+    """
+    try:
+        if not model_registry.is_ready():
+            return jsonify({
+                'success': False,
+                'error': 'Model not loaded. Please train the model first.'
+            }), 500
+        
+        processor = create_stream_processor(request.args)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    if not stream_slots.acquire(blocking=False):
+        response = jsonify({
+            'success': False,
+            'error': 'Too many open streams, please retry'
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    
+    input_stream = request.stream
+    read_size = processor.hop * processor.frame_bytes
+    
+    def generate():
+        while True:
+            chunk = input_stream.read(read_size)
+            if not chunk:
+                break
+            for message in processor.process(chunk):
+                yield json.dumps(message) + '\n'
+        yield json.dumps({'done': True, **processor.get_stats()}) + '\n'
+    
+    response = Response(generate(), mimetype='application/x-ndjson')
+    # Runs when the server closes the response, even if the client went away early
+    response.call_on_close(stream_slots.release)
+    return response
+
+
+@app.route('/api/alerts/evaluate', methods=['POST'])
+def evaluate_alerts():
+    """Debounced onset/offset events for a recorded timeline of window predictions"""
+    try:
+        data = request.json or {}
+        predictions = data.get('predictions')
+        
+        if not isinstance(predictions, list) or not predictions:
+            return jsonify({
+                'success': False,
+                'error': 'No predictions provided'
+            }), 400
+        
+        result = alert_engine.evaluate(predictions, stream_id=data.get('stream_id'))
+        return jsonify({
+            'success': True,
+            **result
+        })
+    
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Each prediction needs probabilities and time: {str(e)}'
+        }), 400
+
+
 @app.route('/api/symptoms/analyze', methods=['POST'])
 def analyze_symptoms():
     """Analyze symptoms"""
@@ -186,7 +426,8 @@ def get_doctors():
         risk_level = request.args.get('risk_level')
         top_n = int(request.args.get('top_n', 5))
         
-        doctors = doctor_recommender.recommend_doctors(
+        # The doctors come pre-serialized; only the envelope is added here
+        doctors = doctor_recommender.recommend_doctors_json(
             risk_level=risk_level,
             location=location,
             specialization=specialization,
@@ -194,11 +435,126 @@ def get_doctors():
             top_n=top_n
         )
         
+        return Response(b'{"doctors":' + doctors + b',"success":true}', mimetype='application/json')
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/doctors/nearest', methods=['GET'])
+def get_nearest_doctors():
+    """Get the doctors nearest to a latitude/longitude"""
+    try:
+        if 'latitude' not in request.args or 'longitude' not in request.args:
+            return jsonify({
+                'success': False,
+                'error': 'latitude and longitude are required'
+            }), 400
+        
+        radius_km = request.args.get('radius_km')
+        doctors = doctor_recommender.nearest_doctors(
+            latitude=float(request.args['latitude']),
+            longitude=float(request.args['longitude']),
+            top_n=int(request.args.get('top_n', 5)),
+            radius_km=float(radius_km) if radius_km else None,
+            specialization=request.args.get('specialization'),
+            emergency=request.args.get('emergency', 'false').lower() == 'true',
+            rank_by=request.args.get('rank_by', 'score')
+        )
+        
+        return jsonify({
+            'success': True,
+            'doctors': doctors
+        })
+    
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/doctors/search', methods=['GET'])
+def search_doctors():
+    """Typo-tolerant search of doctor names, hospitals and locations"""
+    try:
+        fields = request.args.get('fields')
+        doctors = doctor_recommender.search_doctors(
+            request.args.get('q', ''),
+            fields=fields.split(',') if fields else SEARCH_FIELDS,
+            top_n=int(request.args.get('top_n', 20))
+        )
+        
         return jsonify({
             'success': True,
             'doctors': doctors
         })
     
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/doctors/autocomplete', methods=['GET'])
+def autocomplete_doctors():
+    """Search box suggestions for a prefix"""
+    try:
+        suggestions = doctor_recommender.autocomplete(
+            request.args.get('q', ''),
+            limit=int(request.args.get('limit', 10))
+        )
+        return jsonify({
+            'success': True,
+            'suggestions': suggestions
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/doctors/status', methods=['GET'])
+def doctor_database_status():
+    """Size of the doctor database and its last reload"""
+    return jsonify({
+        'success': True,
+        'status': doctor_recommender.get_status()
+    })
+
+
+@app.route('/api/doctors/reload', methods=['POST'])
+def reload_doctors():
+    """Pick up changes to the doctor CSV now; other requests keep using the current data until it is swapped in"""
+    try:
+        force = request.args.get('force', 'false').lower() == 'true'
+        result = doctor_recommender.reload(force=force)
+        
+        return jsonify({
+            'success': True,
+            'reload': result
+        })
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -238,5 +594,217 @@ def get_specializations():
         }), 500
 
 
+@app.route('/api/models', methods=['GET'])
+def list_models():
+    """List registered model versions"""
+    try:
+        model_registry.discover(MODEL_VERSIONS_DIR)
+        return jsonify({
+            'success': True,
+            'active': model_registry.active_version,
+            'shadow': model_registry.get_shadow_report(),
+            'models': model_registry.list_versions()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/models', methods=['POST'])
+def register_model():
+    """Register a model version and load it in the background"""
+    try:
+        data = request.json
+        version = data.get('version')
+        
+        if not version:
+            return jsonify({
+                'success': False,
+                'error': 'No version provided'
+            }), 400
+        
+        if not isinstance(version, str) or not MODEL_VERSION_PATTERN.fullmatch(version):
+            return jsonify({
+                'success': False,
+                'error': 'Version must be 1-64 letters, digits, ".", "_" or "-", starting with a letter or digit'
+            }), 400
+        
+        if 'model_dir' in data:
+            return jsonify({
+                'success': False,
+                'error': f"model_dir is not accepted; place the model in {MODEL_VERSIONS_DIR}/<version>/"
+            }), 400
+        
+        model_registry.register(
+            version,
+            kind=data.get('kind', 'random_forest'),
+            model_dir=os.path.join(MODEL_VERSIONS_DIR, version)
+        )
+        model_registry.load_async(version, activate=data.get('activate', False))
+        
+        return jsonify({
+            'success': True,
+            'message': f"Loading model version '{version}'"
+        }), 202
+    
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/models/<version>/activate', methods=['POST'])
+def activate_model(version):
+    """Swap a model version in (loads it in the background first if needed)"""
+    try:
+        entry = model_registry.versions.get(version)
+        if entry is None:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown model version '{version}'"
+            }), 404
+        
+        if entry.status != 'ready':
+            model_registry.load_async(version, activate=True)
+            return jsonify({
+                'success': True,
+                'message': f"Loading model version '{version}', it will be activated when ready"
+            }), 202
+        
+        model_registry.activate(version)
+        return jsonify({
+            'success': True,
+            'active': model_registry.active_version
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/models/<version>/shadow', methods=['POST'])
+def shadow_model(version):
+    """Shadow-score live traffic with a loaded candidate version"""
+    try:
+        if version not in model_registry.versions:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown model version '{version}'"
+            }), 404
+        
+        model_registry.set_shadow(version)
+        return jsonify({
+            'success': True,
+            'shadow': model_registry.get_shadow_report()
+        })
+    
+    except (RuntimeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/models/shadow', methods=['DELETE'])
+def stop_shadow():
+    """Stop shadow scoring"""
+    model_registry.set_shadow(None)
+    return jsonify({
+        'success': True
+    })
+
+
+@app.route('/api/feedback', methods=['POST'])
+def submit_feedback():
+    """Store a clinician-confirmed label for a scored feature window"""
+    try:
+        data = request.json or {}
+        features = data.get('features')
+        label = data.get('label')
+        
+        if not isinstance(features, dict) or not features:
+            return jsonify({
+                'success': False,
+                'error': 'No features provided'
+            }), 400
+        
+        # Accept class names as returned by /api/predict, or class indices
+        with model_registry.acquire() as (_, predictor):
+            class_indices = {name: index for index, name in predictor.class_mapping.items()}
+        if isinstance(label, str):
+            label = class_indices.get(label.upper())
+        if label not in class_indices.values():
+            return jsonify({
+                'success': False,
+                'error': f"label must be one of {list(class_indices)} or {sorted(class_indices.values())}"
+            }), 400
+        
+        feedback_store.add(
+            features,
+            label,
+            model_version=data.get('model_version', model_registry.active_version),
+            prediction=data.get('prediction'),
+            source=data.get('source')
+        )
+        
+        return jsonify({
+            'success': True,
+            'pending_labels': incremental_updater.pending_labels()
+        }), 201
+    
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/feedback', methods=['GET'])
+def feedback_status():
+    """Pending feedback and the last incremental update"""
+    return jsonify({
+        'success': True,
+        'updater': incremental_updater.get_status()
+    })
+
+
+@app.route('/api/feedback/update', methods=['POST'])
+def run_incremental_update():
+    """Fit new trees on pending feedback in the background and publish a version"""
+    if incremental_updater.pending_labels() == 0:
+        return jsonify({
+            'success': False,
+            'error': 'No new feedback since the last update'
+        }), 400
+    
+    incremental_updater.update_async()
+    return jsonify({
+        'success': True,
+        'message': f"Updating model in the background (publish: {incremental_updater.publish})"
+    }), 202
+
+
 if __name__ == '__main__':
+    if 'DOCTOR_RELOAD_INTERVAL' not in os.environ:
+        doctor_recommender.start_watcher(60)
     app.run(debug=True, host='0.0.0.0', port=5000)
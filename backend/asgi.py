@@ -0,0 +1,472 @@
+"""
+ASGI Backend API for SeizureGuard AI
+Async version of the Flask API: request I/O is awaited, model and file
+work runs on bounded thread pools, and full queues return 503
+
+Run with: uvicorn asgi:app --workers 1 --port 8000 (from the backend folder);
+set DOCTOR_RELOAD_INTERVAL=60 to pick up changes to the doctor CSV
+"""
+import asyncio
+import functools
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse as StarletteJSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route, WebSocketRoute
+from starlette.websockets import WebSocketDisconnect
+
+# Share module instances (model registry, batcher, checkers) with the Flask app
+sys.path.append(str(Path(__file__).parent))
+import api as flask_api
+from api import (
+    model_registry, predict_batcher, prediction_cache, symptom_checker, chatbot,
+    doctor_recommender, file_processor, create_stream_processor, stream_slots, SEARCH_FIELDS
+)
+from utils.metrics import metrics, timed
+
+
+CPU_WORKERS = int(os.environ.get('ASGI_CPU_WORKERS', os.cpu_count() or 1))
+IO_WORKERS = int(os.environ.get('ASGI_IO_WORKERS', 4 * (os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get('ASGI_MAX_PENDING', 64))
+
+
+class JSONResponse(StarletteJSONResponse):
+    """JSON response that also serializes numpy scalars and arrays from file features"""
+    
+    def render(self, content) -> bytes:
+        with timed('response_serialization'):
+            return json.dumps(content, default=self._default, separators=(',', ':')).encode('utf-8')
+    
+    @staticmethod
+    def _default(value):
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body generator is still reading the request
+    body; the stock StreamingResponse also listens on receive() for a
+    disconnect and would swallow request chunks
+    """
+    
+    def __init__(self, content, on_close=None, **kwargs):
+        """
+        Initialize response
+        
+        Args:
+            content: Async iterator of body chunks
+            on_close: Called once the response ends, however it ends (even if
+                the body generator never started because sending failed)
+        """
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            # request.stream() raises ClientDisconnect when the client goes away
+            await self.stream_response(send)
+        finally:
+            if self.on_close is not None:
+                self.on_close()
+
+
+class ServiceBusy(Exception):
+    """Raised when a work queue is full"""
+
+
+class BoundedPool:
+    """Thread pool that rejects new work once max_pending jobs are queued or running"""
+    
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+    
+    def _admit(self):
+        # Only ever touched from the event loop thread, so no lock is needed
+        if self.in_flight >= self.max_pending:
+            raise ServiceBusy(f"{self.name} queue is full")
+        self.in_flight += 1
+    
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking function on the pool"""
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+    
+    async def wait(self, submit, *args, **kwargs):
+        """
+        Await the concurrent.futures.Future that submit(*args, **kwargs)
+        returns (e.g. MicroBatcher.submit); submit is only called once the
+        job is admitted, so a rejected request never reaches the batcher
+        """
+        self._admit()
+        try:
+            return await asyncio.wrap_future(submit(*args, **kwargs))
+        finally:
+            self.in_flight -= 1
+
+
+# CPU-bound model/feature work and blocking file parsing get separate pools
+# so slow OCR jobs cannot starve predictions
+cpu_pool = BoundedPool('cpu', CPU_WORKERS, MAX_PENDING)
+io_pool = BoundedPool('io', IO_WORKERS, MAX_PENDING)
+
+
+def error_response(error: str, status_code: int = 500) -> JSONResponse:
+    return JSONResponse({'success': False, 'error': error}, status_code=status_code)
+
+
+def busy_response() -> JSONResponse:
+    response = error_response('Server busy, please retry', 503)
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+async def prometheus_metrics(request):
+    """Stage and request latency histograms in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type='text/plain; version=0.0.4')
+
+
+async def health_check(request):
+    """Health check endpoint"""
+    return JSONResponse({
+        'status': 'healthy',
+        'predictor_loaded': model_registry.is_ready(),
+        'model_version': model_registry.active_version,
+        'prediction_cache': prediction_cache.get_stats(),
+        'version': '1.0.0',
+        'queues': {pool.name: pool.in_flight for pool in (cpu_pool, io_pool)}
+    })
+
+
+async def predict(request):
+    """Predict seizure from features"""
+    try:
+        if not model_registry.is_ready():
+            return error_response('Model not loaded. Please train the model first.')
+        
+        data = await request.json()
+        features = data.get('features', {})
+        
+        result = model_registry.get_cached(features)
+        if result is None:
+            result = await cpu_pool.wait(predict_batcher.submit, features)
+        
+        return JSONResponse({'success': True, 'result': result})
+    
+    except ServiceBusy:
+        return busy_response()
+    except Exception as e:
+        return error_response(str(e))
+
+
+def _process_upload(filename: str, contents: bytes):
+    """Write upload to a temp file and extract features (runs on the io pool)"""
+    suffix = os.path.splitext(filename)[1]
+    fd, temp_path = tempfile.mkstemp(prefix='temp_', suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(contents)
+        return file_processor.process_file(temp_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+async def upload_file(request):
+    """Process uploaded file"""
+    try:
+        # Starlette reads and spools the whole multipart body here
+        with timed('upload_read'):
+            form = await request.form()
+        file = form.get('file')
+        
+        if file is None or not hasattr(file, 'filename'):
+            return error_response('No file provided', 400)
+        if file.filename == '':
+            return error_response('No file selected', 400)
+        
+        contents = await file.read()
+        result = await io_pool.run(_process_upload, file.filename, contents)
+        
+        if result['success']:
+            # Make prediction if model is loaded
+            if model_registry.is_ready():
+                result['prediction'] = await cpu_pool.run(model_registry.predict, result['features'])
+            
+            # Raw DataFrames are not JSON serializable
+            result.pop('raw_data', None)
+            
+            return JSONResponse({'success': True, 'result': result})
+        else:
+            return error_response(result.get('error', 'Unknown error'))
+    
+    except ServiceBusy:
+        return busy_response()
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def stream_eeg(request):
+    """Raw EEG over chunked HTTP in, NDJSON predictions out (see the Flask route)"""
+    try:
+        if not model_registry.is_ready():
+            return error_response('Model not loaded. Please train the model first.')
+        processor = create_stream_processor(request.query_params)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    
+    if not stream_slots.acquire(blocking=False):
+        return busy_response()
+    
+    async def generate():
+        try:
+            async for chunk in request.stream():
+                if chunk:
+                    for message in await cpu_pool.run(processor.process, chunk):
+                        yield json.dumps(message) + '\n'
+            yield json.dumps({'done': True, **processor.get_stats()}) + '\n'
+        except ServiceBusy:
+            yield json.dumps({'done': True, 'error': 'Server busy, please retry'}) + '\n'
+    
+    # The response releases the slot: the generator never runs if the client
+    # is gone before the response starts
+    return DuplexStreamingResponse(generate(), on_close=stream_slots.release, media_type='application/x-ndjson')
+
+
+async def stream_websocket(websocket):
+    """
+    Raw EEG over WebSocket: binary messages carry float32 frames, and one
+    JSON text message comes back per completed hop; a text message returns
+    the stream's counters
+    """
+    await websocket.accept()
+    try:
+        if not model_registry.is_ready():
+            raise ValueError('Model not loaded. Please train the model first.')
+        processor = create_stream_processor(websocket.query_params)
+    except ValueError as e:
+        await websocket.send_text(json.dumps({'error': str(e)}))
+        await websocket.close(code=1008)
+        return
+    
+    if not stream_slots.acquire(blocking=False):
+        await websocket.send_text(json.dumps({'error': 'Too many open streams, please retry'}))
+        await websocket.close(code=1013)
+        return
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+            if message.get('bytes') is None:
+                # Any text message asks for the stream's counters
+                await websocket.send_text(json.dumps(processor.get_stats()))
+                continue
+            for result in await cpu_pool.run(processor.process, message['bytes']):
+                await websocket.send_text(json.dumps(result))
+    except WebSocketDisconnect:
+        pass
+    except ServiceBusy:
+        await websocket.send_text(json.dumps({'error': 'Server busy, please retry'}))
+        await websocket.close(code=1013)
+    finally:
+        stream_slots.release()
+
+
+async def analyze_symptoms(request):
+    """Analyze symptoms"""
+    try:
+        data = await request.json()
+        symptom_text = data.get('symptoms', '')
+        
+        if not symptom_text:
+            return error_response('No symptoms provided', 400)
+        
+        result = await cpu_pool.run(symptom_checker.analyze_symptoms, symptom_text)
+        
+        return JSONResponse({'success': True, 'result': result})
+    
+    except ServiceBusy:
+        return busy_response()
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def chat(request):
+    """Chat with AI assistant"""
+    try:
+        data = await request.json()
+        message = data.get('message', '')
+        
+        if not message:
+            return error_response('No message provided', 400)
+        
+        response = await cpu_pool.run(chatbot.chat, message)
+        
+        return JSONResponse({'success': True, 'response': response})
+    
+    except ServiceBusy:
+        return busy_response()
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def get_doctors(request):
+    """Get doctor recommendations"""
+    try:
+        params = request.query_params
+        doctors = await cpu_pool.run(
+            doctor_recommender.recommend_doctors_json,
+            risk_level=params.get('risk_level'),
+            location=params.get('location'),
+            specialization=params.get('specialization'),
+            emergency=params.get('emergency', 'false').lower() == 'true',
+            top_n=int(params.get('top_n', 5))
+        )
+        
+        return Response(b'{"success":true,"doctors":' + doctors + b'}', media_type='application/json')
+    
+    except ServiceBusy:
+        return busy_response()
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def get_nearest_doctors(request):
+    """Get the doctors nearest to a latitude/longitude"""
+    try:
+        params = request.query_params
+        if 'latitude' not in params or 'longitude' not in params:
+            return error_response('latitude and longitude are required', 400)
+        radius_km = params.get('radius_km')
+        doctors = await cpu_pool.run(
+            doctor_recommender.nearest_doctors,
+            latitude=float(params['latitude']),
+            longitude=float(params['longitude']),
+            top_n=int(params.get('top_n', 5)),
+            radius_km=float(radius_km) if radius_km else None,
+            specialization=params.get('specialization'),
+            emergency=params.get('emergency', 'false').lower() == 'true',
+            rank_by=params.get('rank_by', 'score')
+        )
+        
+        return JSONResponse({'success': True, 'doctors': doctors})
+    
+    except ServiceBusy:
+        return busy_response()
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def search_doctors(request):
+    """Typo-tolerant search of doctor names, hospitals and locations"""
+    try:
+        params = request.query_params
+        fields = params.get('fields')
+        doctors = await cpu_pool.run(
+            doctor_recommender.search_doctors,
+            params.get('q', ''),
+            fields=fields.split(',') if fields else SEARCH_FIELDS,
+            top_n=int(params.get('top_n', 20))
+        )
+        
+        return JSONResponse({'success': True, 'doctors': doctors})
+    
+    except ServiceBusy:
+        return busy_response()
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def autocomplete_doctors(request):
+    """Search box suggestions for a prefix"""
+    try:
+        params = request.query_params
+        suggestions = await cpu_pool.run(
+            doctor_recommender.autocomplete,
+            params.get('q', ''),
+            limit=int(params.get('limit', 10))
+        )
+        return JSONResponse({'success': True, 'suggestions': suggestions})
+    except ServiceBusy:
+        return busy_response()
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def get_locations(request):
+    """Get all available locations"""
+    try:
+        return JSONResponse({'success': True, 'locations': doctor_recommender.get_all_locations()})
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def get_specializations(request):
+    """Get all specializations"""
+    try:
+        return JSONResponse({'success': True, 'specializations': doctor_recommender.get_all_specializations()})
+    except Exception as e:
+        return error_response(str(e))
+
+
+routes = [
+    Route('/metrics', prometheus_metrics, methods=['GET']),
+    Route('/api/health', health_check, methods=['GET']),
+    Route('/api/predict', predict, methods=['POST']),
+    Route('/api/upload', upload_file, methods=['POST']),
+    Route('/api/stream', stream_eeg, methods=['POST']),
+    WebSocketRoute('/api/stream/ws', stream_websocket),
+    Route('/api/symptoms/analyze', analyze_symptoms, methods=['POST']),
+    Route('/api/chat', chat, methods=['POST']),
+    Route('/api/doctors', get_doctors, methods=['GET']),
+    Route('/api/doctors/nearest', get_nearest_doctors, methods=['GET']),
+    Route('/api/doctors/search', search_doctors, methods=['GET']),
+    Route('/api/doctors/autocomplete', autocomplete_doctors, methods=['GET']),
+    Route('/api/doctors/locations', get_locations, methods=['GET']),
+    Route('/api/doctors/specializations', get_specializations, methods=['GET']),
+    
+    # Low-traffic admin routes (model registry management) are served by
+    # the Flask app itself so both modes behave identically
+    Mount('/', app=WSGIMiddleware(flask_api.app)),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])]
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    if 'DOCTOR_RELOAD_INTERVAL' not in os.environ:
+        doctor_recommender.start_watcher(60)
+    uvicorn.run(app, host='0.0.0.0', port=8000)
@@ -0,0 +1,198 @@
+"""
+Pre-fork Launcher for SeizureGuard AI
+Loads and warms every module once in a master process, then forks worker
+processes that share the loaded models copy-on-write
+
+Run with: python prefork.py --workers 8 --port 5000 (from the backend folder)
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+
+def warm_up(api):
+    """Run every module once so lazy imports, caches and first-call paths are built before forking"""
+    if api.model_registry.is_ready():
+        with api.model_registry.acquire() as (_, predictor):
+            features = {col: 0.0 for col in predictor.feature_columns}
+        api.model_registry.predict(features)
+        api.model_registry.predict_batch([features] * 8)
+    
+    api.symptom_checker.analyze_symptoms("I had jerking movements and felt confused afterwards")
+    api.chatbot.chat("What should I do during a seizure?")
+    api.chatbot.clear_history()
+    api.doctor_recommender.recommend_doctors(risk_level='HIGH', emergency=True, top_n=5)
+    
+    with api.app.test_client() as client:
+        client.get('/api/health')
+
+
+def serve_worker(app, sock: socket.socket, threaded: bool):
+    """Serve the Flask app on the inherited listening socket"""
+    from werkzeug.serving import make_server
+    
+    host, port = sock.getsockname()[:2]
+    server = make_server(host, port, app, threaded=threaded, fd=sock.fileno())
+    print(f"Worker {os.getpid()} ready", flush=True)
+    server.serve_forever()
+
+
+class PreforkServer:
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000, workers: int = 4,
+                 preload: bool = True, threaded: bool = True):
+        """
+        Initialize pre-fork server
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on
+            workers: Number of worker processes
+            preload: Load modules in the master and share them with the workers;
+                when False every worker imports the API on its own
+            threaded: Let each worker handle requests on multiple threads
+        """
+        self.host = host
+        self.port = port
+        self.num_workers = workers
+        self.preload = preload
+        self.threaded = threaded
+        self.app = None
+        self.socket = None
+        self.workers = {}
+        # Only one worker runs the incremental updater, otherwise every
+        # process would fit and publish its own model versions
+        self.updater_pid = None
+        self.running = False
+    
+    def load(self):
+        """Import and warm the API in the master, then freeze the heap for the children"""
+        # Collections in the master would leave freed holes across pages the
+        # children share, so keep GC off until everything is loaded
+        gc.disable()
+        start = time.perf_counter()
+        
+        import api
+        warm_up(api)
+        self.app = api.app
+        # Threads do not survive fork; the workers restart them after forking
+        api.doctor_recommender.stop_watcher()
+        api.incremental_updater.stop()
+        
+        gc.collect()
+        # Move every surviving object to the permanent generation so the
+        # children's collections never write to their headers
+        gc.freeze()
+        print(f"Loaded and warmed modules in {time.perf_counter() - start:.2f}s "
+              f"({gc.get_freeze_count()} objects frozen)", flush=True)
+    
+    def bind(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(1024)
+        sock.set_inheritable(True)
+        self.socket = sock
+        self.port = sock.getsockname()[1]
+    
+    def spawn_worker(self):
+        run_updater = self.updater_pid is None
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.time()
+            if run_updater:
+                self.updater_pid = pid
+            return
+        
+        # Child process
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        exit_code = 0
+        try:
+            import api
+            if self.app is None:
+                app = api.app
+            else:
+                gc.enable()
+                app = self.app
+                if api.doctor_reload_interval > 0:
+                    api.doctor_recommender.start_watcher(api.doctor_reload_interval)
+            if run_updater and api.update_interval > 0:
+                api.incremental_updater.start(api.update_interval)
+            else:
+                api.incremental_updater.stop()
+            serve_worker(app, self.socket, self.threaded)
+        except Exception as e:
+            print(f"Worker {os.getpid()} failed: {str(e)}", flush=True)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    
+    def stop(self, signum=None, frame=None):
+        self.running = False
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    def run(self):
+        """Load, fork the workers and restart any that exit until stopped"""
+        if self.preload:
+            self.load()
+        self.bind()
+        print(f"Listening on http://{self.host}:{self.port} with {self.num_workers} workers", flush=True)
+        
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        
+        for _ in range(self.num_workers):
+            self.spawn_worker()
+        
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            
+            started = self.workers.pop(pid, None)
+            if pid == self.updater_pid:
+                # The replacement worker takes over the incremental updates
+                self.updater_pid = None
+            if not self.running or started is None:
+                continue
+            
+            print(f"Worker {pid} exited with status {status}, restarting", flush=True)
+            # Avoid a tight crash loop if workers die right after starting
+            if time.time() - started < 1.0:
+                time.sleep(1.0)
+            self.spawn_worker()
+        
+        self.socket.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pre-fork launcher for the SeizureGuard API")
+    parser.add_argument('--host', default='0.0.0.0', help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=5000, help="Port to listen on (0 picks a free port)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--no-preload', action='store_true',
+                        help="Import the API separately in every worker (no memory sharing)")
+    parser.add_argument('--no-threads', action='store_true', help="Serve one request at a time per worker")
+    args = parser.parse_args()
+    
+    # The workers check the doctor CSV every minute unless DOCTOR_RELOAD_INTERVAL is set
+    os.environ.setdefault('DOCTOR_RELOAD_INTERVAL', '60')
+    PreforkServer(
+        host=args.host, port=args.port, workers=args.workers,
+        preload=not args.no_preload, threaded=not args.no_threads
+    ).run()
@@ -0,0 +1,152 @@
+"""
+CNN-LSTM Backend Benchmark
+Compares Keras and PyTorch CNN-LSTM training throughput and inference latency
+on the same synthetic data. Each backend runs in its own process so the two
+frameworks' thread pools and native libraries do not interfere
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from generate_sample_dataset import create_sample_data
+
+
+def time_training(train_fn, n_samples):
+    """Return training throughput in samples/sec"""
+    start = time.perf_counter()
+    train_fn()
+    return n_samples / (time.perf_counter() - start)
+
+
+def benchmark_keras(X, y, epochs, batch_sizes, runs):
+    """Train and time the Keras model"""
+    from modules.cnn_lstm_model import CNNLSTMSeizureModel
+    from bench_cnn_lstm_serving import measure_latency
+    
+    model = CNNLSTMSeizureModel(input_shape=(X.shape[1], 1), num_classes=3)
+    X_train, X_test, y_train, y_test = model.prepare_data(X, y)
+    model.build_model()
+    
+    # Call fit directly so the benchmark does not write checkpoints
+    throughput = time_training(
+        lambda: model.model.fit(X_train, y_train, epochs=epochs, batch_size=32, verbose=0),
+        len(X_train) * epochs
+    )
+    
+    latencies = {bs: measure_latency(model.predict, X[:bs], runs=runs) for bs in batch_sizes}
+    return {'keras': (throughput, latencies)}
+
+
+def benchmark_torch(X, y, epochs, batch_sizes, runs, num_threads, num_workers):
+    """Train and time the PyTorch model and its TorchScript exports"""
+    from modules.torch_cnn_lstm_model import TorchCNNLSTMSeizureModel, TorchScriptSeizurePredictor
+    from bench_cnn_lstm_serving import measure_latency
+    
+    model = TorchCNNLSTMSeizureModel(
+        input_shape=(X.shape[1], 1), num_classes=3,
+        num_threads=num_threads, num_workers=num_workers
+    )
+    X_train, X_test, y_train, y_test = model.prepare_data(X, y)
+    model.build_model()
+    
+    throughput = time_training(
+        lambda: model.train(X_train, y_train, X_test, y_test, epochs=epochs, batch_size=32),
+        len(X_train) * epochs
+    )
+    
+    results = {
+        'torch eager': (throughput, {bs: measure_latency(model.predict, X[:bs], runs=runs) for bs in batch_sizes})
+    }
+    
+    for name, quantize in (('torchscript', False), ('torchscript int8', True)):
+        with tempfile.TemporaryDirectory() as model_dir:
+            model.export_torchscript(model_dir, quantize=quantize)
+            predictor = TorchScriptSeizurePredictor(model_dir)
+            latencies = {bs: measure_latency(predictor.predict, X[:bs], runs=runs) for bs in batch_sizes}
+        results[name] = (None, latencies)
+    
+    return results
+
+
+def run_backend(backend, n_samples, n_features, epochs, batch_sizes, runs, num_threads, num_workers):
+    """Benchmark a single backend in the current process"""
+    X, y = create_sample_data(n_samples, n_features, random_state=42)
+    
+    if backend == 'keras':
+        return benchmark_keras(X, y, epochs, batch_sizes, runs)
+    return benchmark_torch(X, y, epochs, batch_sizes, runs, num_threads, num_workers)
+
+
+def run_benchmark(n_samples=3000, n_features=100, epochs=2, batch_sizes=(1, 32), runs=30,
+                  num_threads=None, num_workers=2):
+    """Run each backend in a subprocess and print a comparison report"""
+    results = {}
+    for backend in ('keras', 'torch'):
+        command = [
+            sys.executable, __file__, '--backend', backend,
+            '--samples', str(n_samples), '--features', str(n_features), '--epochs', str(epochs),
+            '--batch-sizes', *map(str, batch_sizes), '--runs', str(runs), '--workers', str(num_workers)
+        ]
+        if num_threads is not None:
+            command += ['--threads', str(num_threads)]
+        
+        completed = subprocess.run(command, capture_output=True, text=True)
+        output_lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not output_lines:
+            print(f"{backend} benchmark failed or backend not installed, skipping")
+            continue
+        
+        # The child prints its results as JSON on the last line
+        for name, (throughput, latencies) in json.loads(output_lines[-1]).items():
+            results[name] = (throughput, {int(bs): tuple(v) for bs, v in latencies.items()})
+    
+    header = f"{'Backend':<20}{'Train samples/s':>18}"
+    for bs in batch_sizes:
+        header += f"{f'p50 bs={bs} (ms)':>18}"
+    print("\n" + header)
+    print("-" * len(header))
+    
+    for name, (throughput, latencies) in results.items():
+        line = f"{name:<20}{(f'{throughput:.0f}' if throughput else '-'):>18}"
+        for bs in batch_sizes:
+            line += f"{latencies[bs][0]:>18.2f}"
+        print(line)
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keras vs PyTorch CNN-LSTM benchmark")
+    parser.add_argument('--backend', choices=['keras', 'torch'], default=None,
+                        help="Benchmark a single backend and print JSON (used internally)")
+    parser.add_argument('--samples', type=int, default=3000, help="Synthetic samples")
+    parser.add_argument('--features', type=int, default=100, help="Features per synthetic sample")
+    parser.add_argument('--epochs', type=int, default=2, help="Training epochs per backend")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32],
+                        help="Batch sizes to time inference at")
+    parser.add_argument('--runs', type=int, default=30, help="Timed inference runs per batch size")
+    parser.add_argument('--threads', type=int, default=None, help="torch.set_num_threads value")
+    parser.add_argument('--workers', type=int, default=2, help="DataLoader worker processes")
+    args = parser.parse_args()
+    
+    if args.backend:
+        backend_results = run_backend(
+            args.backend, args.samples, args.features, args.epochs, tuple(args.batch_sizes),
+            args.runs, args.threads, args.workers
+        )
+        print(json.dumps(backend_results))
+    else:
+        run_benchmark(
+            n_samples=args.samples, n_features=args.features, epochs=args.epochs,
+            batch_sizes=tuple(args.batch_sizes), runs=args.runs,
+            num_threads=args.threads, num_workers=args.workers
+        )
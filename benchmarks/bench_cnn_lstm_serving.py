@@ -0,0 +1,81 @@
+"""
+CNN-LSTM Serving Benchmark
+Compares Keras model.predict against the XLA-compiled serving path
+Reports p50/p99 latency for batch sizes 1, 32 and 512
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+def measure_latency(predict_fn, X, runs=50, warmup=5):
+    """Return (p50, p99) latency in milliseconds for predict_fn(X)"""
+    for _ in range(warmup):
+        predict_fn(X)
+    
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        predict_fn(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def build_benchmark_model(n_features=100, n_samples=2000, seed=42):
+    """Build an (untrained) CNN-LSTM with a fitted scaler on synthetic data"""
+    from modules.cnn_lstm_model import CNNLSTMSeizureModel
+    
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_samples, n_features))
+    
+    model = CNNLSTMSeizureModel(input_shape=(n_features, 1), num_classes=3)
+    model.build_model()
+    model.scaler.fit(X)
+    
+    return model, X
+
+
+def run_benchmark(batch_sizes=(1, 32, 512), precisions=('float32', 'bfloat16'), runs=50):
+    """Run latency comparison and print a report"""
+    model, X = build_benchmark_model()
+    
+    predictors = {'keras predict': model.predict}
+    for precision in precisions:
+        compiled = model.compile_for_serving(precision=precision)
+        compiled.warmup()
+        predictors[f'xla {compiled.precision}'] = compiled.predict
+    
+    print(f"\n{'Path':<20}{'Batch':>8}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    print("-" * 52)
+    
+    results = []
+    for name, predict_fn in predictors.items():
+        for batch_size in batch_sizes:
+            p50, p99 = measure_latency(predict_fn, X[:batch_size], runs=runs)
+            results.append({'path': name, 'batch_size': batch_size, 'p50_ms': p50, 'p99_ms': p99})
+            print(f"{name:<20}{batch_size:>8}{p50:>12.2f}{p99:>12.2f}")
+    
+    return results
+
+
+if __name__ == "__main__":
+    from modules.cnn_lstm_model import TENSORFLOW_AVAILABLE
+    
+    if not TENSORFLOW_AVAILABLE:
+        print("Please install TensorFlow to run this benchmark: pip install tensorflow")
+        sys.exit(1)
+    
+    parser = argparse.ArgumentParser(description="CNN-LSTM serving latency benchmark")
+    parser.add_argument('--runs', type=int, default=50, help="Timed runs per batch size")
+    parser.add_argument('--precisions', nargs='+', default=['float32', 'bfloat16'],
+                        help="Compiled precisions to benchmark")
+    args = parser.parse_args()
+    
+    run_benchmark(precisions=args.precisions, runs=args.runs)
@@ -0,0 +1,123 @@
+"""
+Startup Import Benchmark
+Measures cold start time of each subsystem in a fresh interpreter and
+lists the slowest imports reported by `python -X importtime`
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# Each scenario imports what a process serving that subsystem needs and
+# handles one request
+SCENARIOS = {
+    'chat+symptoms': (
+        "from modules import SeizureChatbot, SymptomChecker\n"
+        "SeizureChatbot().chat('What should I do during a seizure?')\n"
+        "SymptomChecker().analyze_symptoms('jerking movements and confusion')"
+    ),
+    'doctors': (
+        "from modules import DoctorRecommender\n"
+        "DoctorRecommender().recommend_doctors(risk_level='HIGH')"
+    ),
+    'predictor': (
+        "from modules import SeizurePredictor\n"
+        "SeizurePredictor()"
+    ),
+    'file processor': (
+        "from modules import FileProcessor\n"
+        "FileProcessor()"
+    ),
+    'full api': (
+        f"import sys\n"
+        f"sys.path.insert(0, {str(ROOT_DIR / 'backend')!r})\n"
+        f"import api"
+    ),
+}
+
+# Cold start budget (ms) for the lightweight chat/symptom path
+CHAT_TARGET_MS = 300
+
+
+def run_once(code: str, importtime: bool = False):
+    """Run code in a fresh interpreter; return (wall ms, stderr)"""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', code]
+    
+    env = dict(os.environ, PYTHONPATH=str(ROOT_DIR))
+    start = time.perf_counter()
+    completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return elapsed, completed.stderr
+
+
+def parse_importtime(stderr: str):
+    """Return [(cumulative us, self us, module)] for top-level imports from -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Top-level imports are the ones with no nesting indentation
+        if name.startswith(' ') and not name.startswith('  '):
+            entries.append((int(cumulative_us), int(self_us), name.strip()))
+    return entries
+
+
+def run_benchmark(scenarios, runs: int = 5, top: int = 5) -> dict:
+    """Time each scenario and print a report; return median wall times in ms"""
+    results = {}
+    
+    print(f"\n{'Scenario':<16}{'Median (ms)':>13}{'Min (ms)':>11}{'Imports (ms)':>14}")
+    print("-" * 54)
+    
+    for name in scenarios:
+        code = SCENARIOS[name]
+        try:
+            # The first run also warms the OS page cache so runs are comparable
+            run_once(code)
+            timings = [run_once(code)[0] for _ in range(runs)]
+            _, stderr = run_once(code, importtime=True)
+        except RuntimeError as e:
+            print(f"{name:<16}  failed: {str(e)}")
+            continue
+        
+        imports = parse_importtime(stderr)
+        import_ms = sum(cumulative for cumulative, _, _ in imports) / 1000
+        results[name] = float(np.median(timings))
+        print(f"{name:<16}{results[name]:>13.1f}{min(timings):>11.1f}{import_ms:>14.1f}")
+        
+        for cumulative, _, module in sorted(imports, reverse=True)[:top]:
+            print(f"    {module:<40}{cumulative / 1000:>9.1f} ms")
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold start import benchmark (run from the folder containing models/)")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), default=None,
+                        help="Scenarios to run (default: all)")
+    parser.add_argument('--runs', type=int, default=5, help="Timed cold starts per scenario")
+    parser.add_argument('--top', type=int, default=5, help="Slowest top-level imports to list")
+    parser.add_argument('--check', action='store_true',
+                        help=f"Exit non-zero if chat+symptoms exceeds {CHAT_TARGET_MS} ms")
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.scenario or list(SCENARIOS), runs=args.runs, top=args.top)
+    
+    if args.check and 'chat+symptoms' in results:
+        if results['chat+symptoms'] > CHAT_TARGET_MS:
+            print(f"\nchat+symptoms cold start {results['chat+symptoms']:.0f} ms exceeds {CHAT_TARGET_MS} ms target")
+            sys.exit(1)
+        print(f"\nchat+symptoms cold start within {CHAT_TARGET_MS} ms target")
@@ -0,0 +1,90 @@
+"""
+Micro-Batching Benchmark
+Compares sustained prediction QPS for concurrent clients calling
+SeizurePredictor.predict directly vs. through the MicroBatcher
+"""
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from generate_sample_dataset import generate_sample_dataset
+from modules.trainer import SeizureModelTrainer
+from modules.predictor import SeizurePredictor
+from modules.micro_batcher import MicroBatcher
+
+
+def train_benchmark_model(work_dir, n_samples=1000, n_features=20):
+    """Train the default RandomForest on synthetic data into work_dir/models"""
+    dataset_path = str(Path(work_dir) / 'datasets' / 'seizure_dataset.csv')
+    model_dir = str(Path(work_dir) / 'models')
+    
+    generate_sample_dataset(n_samples=n_samples, n_features=n_features, output_path=dataset_path)
+    
+    trainer = SeizureModelTrainer(dataset_path=dataset_path)
+    X, y = trainer.prepare_features(trainer.load_data())
+    trainer.train_model(X, y)
+    trainer.save_model(model_dir)
+    
+    return model_dir
+
+
+def measure_qps(predict_fn, requests, concurrency):
+    """Send every request from `concurrency` client threads; return (qps, p50 ms, p99 ms)"""
+    latencies = []
+    
+    def client(features):
+        start = time.perf_counter()
+        predict_fn(features)
+        latencies.append((time.perf_counter() - start) * 1000)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, requests))
+    elapsed = time.perf_counter() - start
+    
+    return len(requests) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def run_benchmark(n_requests=2000, concurrency_levels=(1, 8, 32, 64), max_batch_size=64, max_wait_ms=2.0):
+    """Run QPS comparison and print a report"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        predictor = SeizurePredictor(model_dir=train_benchmark_model(work_dir))
+    
+    rng = np.random.default_rng(42)
+    requests = [
+        {col: float(value) for col, value in zip(predictor.feature_columns, row)}
+        for row in rng.standard_normal((n_requests, len(predictor.feature_columns)))
+    ]
+    
+    batcher = MicroBatcher(predictor.predict_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    
+    print(f"\n{'Path':<12}{'Clients':>9}{'QPS':>10}{'p50 (ms)':>11}{'p99 (ms)':>11}{'Batch':>8}")
+    print("-" * 61)
+    
+    for concurrency in concurrency_levels:
+        qps, p50, p99 = measure_qps(predictor.predict, requests, concurrency)
+        print(f"{'direct':<12}{concurrency:>9}{qps:>10.0f}{p50:>11.2f}{p99:>11.2f}{1:>8}")
+        
+        before = batcher.get_stats()
+        qps, p50, p99 = measure_qps(batcher.predict, requests, concurrency)
+        after = batcher.get_stats()
+        mean_batch = (after['requests'] - before['requests']) / max(after['batches'] - before['batches'], 1)
+        print(f"{'batched':<12}{concurrency:>9}{qps:>10.0f}{p50:>11.2f}{p99:>11.2f}{mean_batch:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching QPS benchmark")
+    parser.add_argument('--requests', type=int, default=2000, help="Requests per run")
+    parser.add_argument('--max-batch-size', type=int, default=64, help="MicroBatcher max batch size")
+    parser.add_argument('--window-ms', type=float, default=2.0, help="MicroBatcher wait window")
+    args = parser.parse_args()
+    
+    run_benchmark(n_requests=args.requests, max_batch_size=args.max_batch_size, max_wait_ms=args.window_ms)
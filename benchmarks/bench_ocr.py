@@ -0,0 +1,161 @@
+"""
+OCR Benchmark
+Renders synthetic phone photos of EEG reports (12 MP, rotated, unevenly lit,
+JPEG noise) with known numbers, then compares the original full-image OCR
+with the preprocessed region pipeline in utils/ocr.py for wall time and
+numeric extraction accuracy.
+
+Usage:
+    python benchmarks/bench_ocr.py --images 5
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+CHANNELS = ['Fp1-F7', 'F7-T3', 'T3-T5', 'T5-O1', 'Fp2-F8', 'F8-T4', 'T4-T6', 'T6-O2',
+            'Fp1-F3', 'F3-C3', 'C3-P3', 'P3-O1', 'Fp2-F4', 'F4-C4', 'C4-P4', 'P4-O2']
+
+
+def render_report_photo(path, rng, width=3024, height=4032, angle=3.0, font_size=44):
+    """
+    Write a photographed report page and return the numbers printed on it
+    (as strings, in reading order)
+    """
+    from PIL import Image, ImageDraw, ImageFont
+    
+    page = Image.new('L', (width, height), color=245)
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=font_size)
+    margin, line_height = width // 10, int(font_size * 1.8)
+    
+    draw.text((margin, margin), "EEG SUMMARY REPORT", font=font, fill=20)
+    numbers = []
+    y = margin + 2 * line_height
+    for channel in CHANNELS:
+        values = [f"{rng.uniform(-50, 50):.2f}", f"{rng.uniform(1, 40):.2f}", f"{rng.uniform(10, 900):.1f}"]
+        numbers.extend(values)
+        draw.text((margin, y), f"{channel}   mean {values[0]}   std {values[1]}   power {values[2]}",
+                  font=font, fill=20)
+        y += line_height
+    
+    # Hand-held camera: slight rotation, light falling off across the page, sensor noise
+    page = page.rotate(angle, resample=Image.BICUBIC, fillcolor=90)
+    pixels = np.asarray(page, dtype=np.float32)
+    gradient = np.linspace(1.0, 0.55, width, dtype=np.float32)[None, :]
+    pixels = pixels * gradient + rng.normal(0, 6, pixels.shape).astype(np.float32)
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).convert('RGB').save(path, quality=90)
+    return numbers
+
+
+def numeric_accuracy(expected, text):
+    """Recall and precision of the printed numbers among those found in text"""
+    found = Counter(re.findall(r'-?\d+\.?\d*', text))
+    matched = sum((Counter(expected) & found).values())
+    return matched / len(expected), matched / max(sum(found.values()), 1)
+
+
+def ocr_full_image(path):
+    """The original FileProcessor.process_image OCR call"""
+    import pytesseract
+    from PIL import Image
+    
+    return pytesseract.image_to_string(Image.open(path))
+
+
+def ocr_full_image_tesserocr(path):
+    """
+    The original call's work (whole colour photo, automatic page segmentation)
+    in process, for machines with tesserocr but no tesseract binary
+    """
+    import tesserocr
+    from PIL import Image
+    
+    kwargs = {'path': os.environ['TESSDATA_PREFIX']} if os.environ.get('TESSDATA_PREFIX') else {}
+    return tesserocr.image_to_text(Image.open(path), **kwargs)
+
+
+def ocr_pipeline(path, numeric_only):
+    from utils.ocr import ocr_image
+    return ocr_image(path, numeric_only=numeric_only)['text']
+
+
+def time_preprocessing(paths):
+    from utils.ocr import load_grayscale, preprocess_for_ocr, find_text_regions
+    
+    timings, summaries = [], []
+    for path in paths:
+        start = time.perf_counter()
+        gray, shape = load_grayscale(path)
+        page, angle = preprocess_for_ocr(gray)
+        regions = find_text_regions(page)
+        timings.append(time.perf_counter() - start)
+        summaries.append((shape, page.shape, angle, len(regions)))
+    return timings, summaries
+
+
+def run_benchmark(n_images=5, seed=0):
+    rng = np.random.default_rng(seed)
+    work_dir = tempfile.mkdtemp(prefix='bench_ocr_')
+    
+    try:
+        paths, truths, angles = [], [], []
+        for i in range(n_images):
+            angle = float(rng.uniform(-5, 5))
+            path = str(Path(work_dir) / f'report_{i}.jpg')
+            truths.append(render_report_photo(path, rng, angle=angle))
+            paths.append(path)
+            angles.append(angle)
+        
+        timings, summaries = time_preprocessing(paths)
+        print(f"\nPreprocessing (decode, downscale, threshold, deskew, regions), {n_images} photos:")
+        for angle, seconds, (shape, page_shape, skew, n_regions) in zip(angles, timings, summaries):
+            print(f"  {shape[1]}x{shape[0]} -> {page_shape[1]}x{page_shape[0]}  rotated {angle:+.2f}  "
+                  f"corrected {skew:+.2f}  {n_regions} regions  {seconds * 1000:.0f} ms")
+        
+        from utils.ocr_pool import get_ocr_pool
+        if shutil.which('tesseract') is not None:
+            variants = [('full image (original)', ocr_full_image)]
+        elif get_ocr_pool().backend == 'tesserocr':
+            variants = [('full image (tesserocr)', ocr_full_image_tesserocr)]
+        else:
+            print("\nNeither the tesseract binary nor tesserocr found; OCR time and accuracy not measured")
+            return
+        
+        variants += [
+            ('regions', lambda path: ocr_pipeline(path, numeric_only=False)),
+            ('regions, numeric only', lambda path: ocr_pipeline(path, numeric_only=True)),
+        ]
+        print(f"\n{'Pipeline':<26}{'Mean s':>10}{'Recall':>10}{'Precision':>11}")
+        print("-" * 57)
+        for name, fn in variants:
+            seconds, recalls, precisions = [], [], []
+            for path, expected in zip(paths, truths):
+                start = time.perf_counter()
+                text = fn(path)
+                seconds.append(time.perf_counter() - start)
+                recall, precision = numeric_accuracy(expected, text)
+                recalls.append(recall)
+                precisions.append(precision)
+            print(f"{name:<26}{np.mean(seconds):>10.2f}{np.mean(recalls):>10.1%}{np.mean(precisions):>11.1%}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OCR preprocessing benchmark")
+    parser.add_argument('--images', type=int, default=5, help="Synthetic photos to render")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    run_benchmark(n_images=args.images, seed=args.seed)
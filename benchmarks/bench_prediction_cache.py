@@ -0,0 +1,82 @@
+"""
+Prediction Cache Benchmark
+Replays repetitive device traffic (steady-state windows with sensor jitter
+plus occasional novel windows) through ModelRegistry.predict with and
+without the prediction cache
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from modules.model_registry import ModelRegistry
+from modules.prediction_cache import PredictionCache
+from bench_micro_batching import train_benchmark_model
+
+
+def device_traffic(feature_columns, n_requests=5000, n_devices=20, novel_fraction=0.1,
+                   jitter=1e-4, random_state=42):
+    """Each device repeats its own baseline window with tiny jitter; some windows are novel"""
+    rng = np.random.default_rng(random_state)
+    baselines = rng.standard_normal((n_devices, len(feature_columns)))
+    
+    requests = []
+    for _ in range(n_requests):
+        if rng.random() < novel_fraction:
+            values = rng.standard_normal(len(feature_columns))
+        else:
+            values = baselines[rng.integers(n_devices)] + rng.normal(0, jitter, len(feature_columns))
+        requests.append({col: float(v) for col, v in zip(feature_columns, values)})
+    return requests
+
+
+def run_benchmark(n_requests=5000, capacity=10000, decimals_options=(None, 2), jitters=(0.0, 1e-4)):
+    """Compare uncached and cached predict throughput for exact and jittered repeats"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        model_dir = train_benchmark_model(work_dir)
+        
+        print(f"\n{'Traffic':<16}{'Config':<22}{'Req/s':>10}{'Hit rate':>10}{'Model calls':>13}")
+        print("-" * 71)
+        
+        for jitter in jitters:
+            traffic = 'exact repeats' if jitter == 0 else f'jitter {jitter:g}'
+            configs = [('no cache', None)]
+            configs += [(f'cache (decimals={d})', PredictionCache(capacity=capacity, decimals=d))
+                        for d in decimals_options]
+            
+            for name, cache in configs:
+                registry = ModelRegistry(prediction_cache=cache)
+                registry.register('default', 'random_forest', model_dir)
+                registry.load('default')
+                registry.activate('default')
+                
+                with registry.acquire() as (_, predictor):
+                    requests = device_traffic(predictor.feature_columns, n_requests, jitter=jitter)
+                
+                start = time.perf_counter()
+                for features in requests:
+                    registry.predict(features)
+                elapsed = time.perf_counter() - start
+                
+                if cache is None:
+                    hit_rate, model_calls = 0.0, len(requests)
+                else:
+                    stats = cache.get_stats()
+                    hit_rate, model_calls = stats['hit_rate'], stats['misses']
+                print(f"{traffic:<16}{name:<22}{len(requests) / elapsed:>10.0f}{hit_rate:>10.1%}{model_calls:>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prediction cache benchmark")
+    parser.add_argument('--requests', type=int, default=5000, help="Requests replayed per config")
+    parser.add_argument('--capacity', type=int, default=10000, help="Cache capacity")
+    args = parser.parse_args()
+    
+    run_benchmark(n_requests=args.requests, capacity=args.capacity)
@@ -0,0 +1,123 @@
+"""
+Pre-fork Memory Benchmark
+Starts backend/prefork.py with and without preloading and reports startup
+time and per-worker memory (RSS, PSS and unique set size from
+/proc/<pid>/smaps_rollup, Linux only)
+"""
+import re
+import sys
+import time
+import argparse
+import subprocess
+import http.client
+import threading
+from pathlib import Path
+
+import numpy as np
+
+PREFORK_SCRIPT = Path(__file__).parent.parent / 'backend' / 'prefork.py'
+
+
+def read_memory(pid: int) -> dict:
+    """RSS, PSS and USS of a process in MB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    
+    return {
+        'rss': values.get('Rss', 0.0),
+        'pss': values.get('Pss', 0.0),
+        'uss': values.get('Private_Clean', 0.0) + values.get('Private_Dirty', 0.0),
+    }
+
+
+def send_traffic(port: int, n_requests: int, concurrency: int = 16):
+    """Hit every route a few times so workers touch the shared pages as they would in production"""
+    routes = [
+        ('POST', '/api/predict', b'{"features": {"feature_1": 0.5}}'),
+        ('POST', '/api/chat', b'{"message": "What should I do during a seizure?"}'),
+        ('POST', '/api/symptoms/analyze', b'{"symptoms": "jerking movements and confusion"}'),
+        ('GET', '/api/doctors?risk_level=HIGH', None),
+    ]
+    
+    def client(index):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        for i in range(n_requests // concurrency):
+            method, path, body = routes[(index + i) % len(routes)]
+            conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+            conn.getresponse().read()
+        conn.close()
+    
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_mode(preload: bool, workers: int, n_requests: int) -> dict:
+    """Launch the server, wait for every worker, load it and sample memory"""
+    command = [sys.executable, str(PREFORK_SCRIPT), '--host', '127.0.0.1', '--port', '0',
+               '--workers', str(workers)]
+    if not preload:
+        command.append('--no-preload')
+    
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    
+    port = None
+    worker_pids = []
+    try:
+        for line in process.stdout:
+            if line.startswith('Listening on'):
+                port = int(line.split(':')[2].split()[0])
+                continue
+            # Workers start concurrently, so their output lines can interleave
+            worker_pids.extend(int(pid) for pid in re.findall(r'Worker (\d+) ready', line))
+            if len(worker_pids) >= workers:
+                break
+        startup = time.perf_counter() - start
+        
+        if port is None or len(worker_pids) < workers:
+            raise RuntimeError("Server exited before all workers were ready")
+        
+        # Drain the rest of stdout so the pipe never blocks the server
+        threading.Thread(target=process.stdout.read, daemon=True).start()
+        
+        send_traffic(port, n_requests)
+        memory = [read_memory(pid) for pid in worker_pids]
+        master = read_memory(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+    
+    return {
+        'startup': startup,
+        'rss': np.mean([m['rss'] for m in memory]),
+        'pss': np.mean([m['pss'] for m in memory]),
+        'uss': np.mean([m['uss'] for m in memory]),
+        'total_pss': sum(m['pss'] for m in memory) + master['pss'],
+    }
+
+
+def run_benchmark(workers: int = 8, n_requests: int = 800):
+    """Compare preloaded vs independent worker startup and print a report"""
+    print(f"\n{'Mode':<14}{'Startup (s)':>13}{'RSS/worker':>12}{'PSS/worker':>12}{'USS/worker':>12}{'Total PSS':>11}")
+    print("-" * 74)
+    
+    for name, preload in (('preload+fork', True), ('independent', False)):
+        result = run_mode(preload, workers, n_requests)
+        print(f"{name:<14}{result['startup']:>13.2f}{result['rss']:>10.1f}MB{result['pss']:>10.1f}MB"
+              f"{result['uss']:>10.1f}MB{result['total_pss']:>9.0f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-fork memory benchmark (run from the folder containing models/)")
+    parser.add_argument('--workers', type=int, default=8, help="Worker processes")
+    parser.add_argument('--requests', type=int, default=800, help="Requests sent before sampling memory")
+    args = parser.parse_args()
+    
+    run_benchmark(workers=args.workers, n_requests=args.requests)
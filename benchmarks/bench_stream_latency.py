@@ -0,0 +1,152 @@
+"""
+EEG Streaming Latency Benchmark
+Opens concurrent WebSocket streams against the ASGI server, each sending
+one hop of synthetic 19-channel EEG per hop interval, and reports the
+time from sending the hop that completes a window to receiving its
+prediction. Also times StreamProcessor.process in-process for reference.
+
+Usage:
+    python benchmarks/bench_stream_latency.py --spawn     (from a directory containing models/)
+    python benchmarks/bench_stream_latency.py --url ws://localhost:8000/api/stream/ws
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import subprocess
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+import websockets
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from generate_eeg_dataset import EEGSynthesizer, schedule_events
+from load_test_api import BACKEND_DIR, free_port, wait_until_healthy
+
+
+def synthetic_hops(n_hops, hop_samples, n_channels=19, sfreq=256, seed=0):
+    """Raw little-endian float32 frames, one bytes object per hop"""
+    rng = np.random.default_rng(seed)
+    duration = n_hops * hop_samples / sfreq
+    synth = EEGSynthesizer(rng, n_channels, sfreq, schedule_events(rng, duration, seizures_per_hour=60))
+    data, _ = synth.chunk(0, n_hops * hop_samples)
+    frames = data.T.astype('<f4')
+    return [frames[i * hop_samples:(i + 1) * hop_samples].tobytes() for i in range(n_hops)]
+
+
+def measure_in_process(hops, n_channels, sfreq, window, hop):
+    """Per-hop StreamProcessor.process time with the trained model, no network"""
+    from modules.model_registry import ModelRegistry
+    from modules.file_processor import FileProcessor
+    from modules.stream_processor import StreamProcessor
+    
+    with redirect_stdout(StringIO()):
+        registry = ModelRegistry()
+        registry.register('default', 'random_forest', 'models')
+        registry.load('default')
+        registry.activate('default')
+    
+    processor = StreamProcessor(registry.predict, FileProcessor().extract_features_from_eeg,
+                                n_channels, sfreq, window, hop)
+    latencies = []
+    for data in hops:
+        start = time.perf_counter()
+        if processor.process(data):
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def run_stream(url, hops, hop_seconds, sfreq, n_windows, latencies, errors, start_delay=0.0):
+    """Send hops in real time and match each prediction to the hop that completed its window"""
+    frame_bytes = 4 * 19
+    sent_at = {}
+    await asyncio.sleep(start_delay)
+    
+    async with websockets.connect(url, max_size=None) as ws:
+        async def receiver():
+            for _ in range(n_windows):
+                message = json.loads(await ws.recv())
+                if 'error' in message:
+                    errors.append(message['error'])
+                    return
+                end = int(round(message['end_time'] * sfreq))
+                latencies.append((time.perf_counter() - sent_at.pop(end)) * 1000)
+        
+        receive_task = asyncio.create_task(receiver())
+        samples = 0
+        for data in hops:
+            samples += len(data) // frame_bytes
+            sent_at[samples] = time.perf_counter()
+            await ws.send(data)
+            await asyncio.sleep(hop_seconds)
+        
+        await asyncio.wait_for(receive_task, timeout=30)
+
+
+async def run_concurrency(url, hops, hop_seconds, sfreq, n_windows, n_streams):
+    """Streams start at random offsets within one hop, like independent bedside devices"""
+    latencies, errors = [], []
+    delays = np.random.default_rng(0).uniform(0, hop_seconds, n_streams)
+    await asyncio.gather(*(run_stream(url, hops, hop_seconds, sfreq, n_windows, latencies, errors, delay)
+                           for delay in delays))
+    return latencies, errors
+
+
+def spawn_asgi():
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, '-m', 'uvicorn', 'asgi:app', '--app-dir', str(BACKEND_DIR),
+        '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_until_healthy(f'http://127.0.0.1:{port}')
+    return f'ws://127.0.0.1:{port}/api/stream/ws', process
+
+
+def run_benchmark(url=None, stream_counts=(1, 8, 32), n_hops=40, window=2.0, hop=0.5, sfreq=256):
+    hop_samples = int(hop * sfreq)
+    hops = synthetic_hops(n_hops, hop_samples, sfreq=sfreq)
+    n_windows = n_hops - int(round(window / hop)) + 1
+    
+    in_process = measure_in_process(hops, 19, sfreq, window, hop)
+    print(f"\nIn-process StreamProcessor: p50 {np.percentile(in_process, 50):.2f} ms, "
+          f"p99 {np.percentile(in_process, 99):.2f} ms per hop")
+    
+    process = None
+    if url is None:
+        url, process = spawn_asgi()
+    query = f"?channels=19&sfreq={sfreq}&window={window}&hop={hop}"
+    
+    try:
+        print(f"\n{'Streams':>8}{'Windows':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'Errors':>8}")
+        print("-" * 56)
+        for n_streams in stream_counts:
+            latencies, errors = asyncio.run(run_concurrency(url + query, hops, hop, sfreq, n_windows, n_streams))
+            if not latencies:
+                print(f"{n_streams:>8}{0:>10}{'-':>10}{'-':>10}{'-':>10}{len(errors):>8}")
+                continue
+            print(f"{n_streams:>8}{len(latencies):>10}{np.percentile(latencies, 50):>10.2f}"
+                  f"{np.percentile(latencies, 99):>10.2f}{max(latencies):>10.2f}{len(errors):>8}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EEG streaming latency benchmark")
+    parser.add_argument('--spawn', action='store_true', help="Start uvicorn locally (default when --url is not given)")
+    parser.add_argument('--url', help="WebSocket URL of a running server, e.g. ws://localhost:8000/api/stream/ws")
+    parser.add_argument('--streams', type=int, action='append', help="Concurrent streams (repeatable)")
+    parser.add_argument('--hops', type=int, default=40, help="Hops sent per stream")
+    parser.add_argument('--window', type=float, default=2.0, help="Window length in seconds")
+    parser.add_argument('--hop', type=float, default=0.5, help="Hop length in seconds")
+    args = parser.parse_args()
+    
+    run_benchmark(url=args.url, stream_counts=args.streams or (1, 8, 32), n_hops=args.hops,
+                  window=args.window, hop=args.hop)
@@ -0,0 +1,194 @@
+"""
+API Load Test
+Compares throughput and tail latency of the Flask API and the ASGI API
+under concurrent keep-alive clients
+
+Usage:
+    python benchmarks/load_test_api.py --spawn
+    python benchmarks/load_test_api.py --target flask=http://localhost:5000 --target asgi=http://localhost:8000
+"""
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import http.client
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).parent.parent / 'backend'
+
+# (method, path, body) for each scenario
+SCENARIOS = {
+    'predict': ('POST', '/api/predict', None),
+    'chat': ('POST', '/api/chat', {'message': 'What should I do during a seizure?'}),
+    'symptoms': ('POST', '/api/symptoms/analyze', {'symptoms': 'I had jerking movements and confusion'}),
+    'doctors': ('GET', '/api/doctors?risk_level=High&top_n=5', None),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(base_url: str, timeout: float = 60.0):
+    """Poll /api/health until the server answers"""
+    parts = urlsplit(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+def spawn_servers():
+    """Start the threaded Flask server and uvicorn on free ports (models/ is resolved from the cwd)"""
+    flask_port, asgi_port = free_port(), free_port()
+    flask_cmd = [
+        sys.executable, '-c',
+        f"import sys; sys.path.insert(0, {str(BACKEND_DIR)!r}); import api; "
+        f"api.app.run(host='127.0.0.1', port={flask_port}, debug=False, threaded=True)"
+    ]
+    asgi_cmd = [
+        sys.executable, '-m', 'uvicorn', 'asgi:app', '--app-dir', str(BACKEND_DIR),
+        '--host', '127.0.0.1', '--port', str(asgi_port), '--log-level', 'warning'
+    ]
+    
+    processes = [
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for cmd in (flask_cmd, asgi_cmd)
+    ]
+    targets = {
+        'flask': f'http://127.0.0.1:{flask_port}',
+        'asgi': f'http://127.0.0.1:{asgi_port}',
+    }
+    
+    try:
+        for base_url in targets.values():
+            wait_until_healthy(base_url)
+    except RuntimeError:
+        stop_servers(processes)
+        raise
+    
+    return targets, processes
+
+
+def stop_servers(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait()
+
+
+def predict_body(n_features: int = 20) -> dict:
+    """Build a predict payload; matches the sample dataset's feature_1..feature_N columns"""
+    rng = np.random.default_rng(42)
+    return {'features': {f'feature_{i}': float(v) for i, v in enumerate(rng.standard_normal(n_features), 1)}}
+
+
+def run_load(base_url: str, method: str, path: str, body, n_requests: int, concurrency: int):
+    """Send n_requests from `concurrency` keep-alive clients; return stats"""
+    parts = urlsplit(base_url)
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {'Content-Type': 'application/json'} if payload else {}
+    
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    per_client = n_requests // concurrency
+    
+    def client():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        local_latencies = []
+        local_statuses = {}
+        for _ in range(per_client):
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+                status = 'error'
+            local_latencies.append((time.perf_counter() - start) * 1000)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        conn.close()
+        
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+    
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': float(np.percentile(latencies, 50)),
+        'p99': float(np.percentile(latencies, 99)),
+        'ok': statuses.get(200, 0),
+        'busy': statuses.get(503, 0),
+        'errors': len(latencies) - statuses.get(200, 0) - statuses.get(503, 0),
+    }
+
+
+def run_benchmark(targets: dict, scenarios, n_requests: int = 2000, concurrency_levels=(1, 16, 64)):
+    """Run every scenario against every target and print a report"""
+    print(f"\n{'Scenario':<10}{'Server':<8}{'Clients':>8}{'Req/s':>9}{'p50 (ms)':>10}{'p99 (ms)':>10}"
+          f"{'200':>7}{'503':>6}{'Err':>6}")
+    print("-" * 74)
+    
+    for scenario in scenarios:
+        method, path, body = SCENARIOS[scenario]
+        if scenario == 'predict':
+            body = predict_body()
+        for concurrency in concurrency_levels:
+            for name, base_url in targets.items():
+                stats = run_load(base_url, method, path, body, n_requests, concurrency)
+                print(f"{scenario:<10}{name:<8}{concurrency:>8}{stats['rps']:>9.0f}{stats['p50']:>10.2f}"
+                      f"{stats['p99']:>10.2f}{stats['ok']:>7}{stats['busy']:>6}{stats['errors']:>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flask vs ASGI API load test")
+    parser.add_argument('--spawn', action='store_true',
+                        help="Start both servers locally (run from a directory containing models/)")
+    parser.add_argument('--target', action='append', default=[],
+                        help="name=base_url of an already running server (repeatable)")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), default=None,
+                        help="Scenarios to run (default: all)")
+    parser.add_argument('--requests', type=int, default=2000, help="Requests per run")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64], help="Client counts")
+    args = parser.parse_args()
+    
+    targets = dict(target.split('=', 1) for target in args.target)
+    processes = []
+    if args.spawn:
+        spawned, processes = spawn_servers()
+        targets.update(spawned)
+    
+    if not targets:
+        parser.error("Pass --spawn or at least one --target")
+    
+    try:
+        run_benchmark(targets, args.scenario or list(SCENARIOS), args.requests, args.concurrency)
+    finally:
+        stop_servers(processes)
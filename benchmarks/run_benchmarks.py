@@ -0,0 +1,820 @@
+"""
+Benchmark Suite
+asv-style registry of timed benchmarks over reproducible synthetic inputs
+from generate_sample_dataset.py. Results are written as JSON so runs from
+different commits can be compared with a regression threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results/base.json
+    python benchmarks/run_benchmarks.py --quick --filter doctor
+    python benchmarks/run_benchmarks.py --compare results/base.json results/new.json --threshold 0.10
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import itertools
+from contextlib import redirect_stdout
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'backend'))
+
+from generate_sample_dataset import create_sample_data, create_doctor_directory
+from generate_eeg_dataset import shard_bytes
+
+SEED = 0
+
+BENCHMARKS = []
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup function when an optional dependency is missing"""
+
+
+class Benchmark:
+    def __init__(self, name, setup, param=None, unit='calls', items=1,
+                 min_rounds=5, min_time=0.5, max_rounds=1000, warmup=True, quick=True):
+        """
+        Initialize benchmark
+        
+        Args:
+            name: Benchmark name; the parameter is appended as name[param]
+            setup: setup(ctx, param) -> zero-argument callable to time
+            param: Parameter passed to setup
+            unit: What one item is (rows, messages, requests...)
+            items: Items processed per call, used for the throughput figure
+            min_rounds: Minimum timed calls
+            min_time: Keep calling until this many seconds have been spent
+            max_rounds: Upper bound on timed calls
+            warmup: Make one untimed call first
+            quick: Whether the benchmark runs under --quick
+        """
+        self.name = name if param is None else f"{name}[{param}]"
+        self.setup = setup
+        self.param = param
+        self.unit = unit
+        self.items = items
+        self.min_rounds = min_rounds
+        self.min_time = min_time
+        self.max_rounds = max_rounds
+        self.warmup = warmup
+        self.quick = quick
+
+
+def benchmark(name, params=None, unit='calls', items=1, quick_params=None, **options):
+    """
+    Register a setup function as one benchmark per parameter
+    
+    items may be a number or a function of the parameter; quick_params
+    restricts the parameters used under --quick.
+    """
+    def decorator(setup):
+        for param in (params if params is not None else [None]):
+            BENCHMARKS.append(Benchmark(
+                name, setup, param, unit,
+                items=items(param) if callable(items) else items,
+                quick=quick_params is None or param in quick_params,
+                **options
+            ))
+        return setup
+    return decorator
+
+
+def measure(fn, min_rounds=5, min_time=0.5, max_rounds=1000, warmup=True):
+    """Optionally call fn once to warm up, then time calls until both minimums are met"""
+    if warmup:
+        fn()
+    
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_rounds:
+        call_start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - call_start)
+        if len(times) >= min_rounds and time.perf_counter() - start >= min_time:
+            break
+    
+    times = np.array(times)
+    return {
+        'median': float(np.median(times)),
+        'mean': float(times.mean()),
+        'min': float(times.min()),
+        'stddev': float(times.std()),
+        'p99': float(np.percentile(times, 99)),
+        'rounds': len(times)
+    }
+
+
+class BenchmarkContext:
+    """Shared, lazily built inputs; everything is seeded so runs are comparable"""
+    
+    def __init__(self, work_dir):
+        self.work_dir = Path(work_dir)
+    
+    @cached_property
+    def model_dir(self):
+        from modules.trainer import SeizureModelTrainer
+        
+        X, y = create_sample_data(n_samples=1000, n_features=20, random_state=SEED)
+        df = pd.DataFrame(X, columns=[f'feature_{i+1}' for i in range(X.shape[1])])
+        df['target'] = y
+        
+        trainer = SeizureModelTrainer()
+        X_train, y_train = trainer.prepare_features(df)
+        trainer.train_model(X_train, y_train)
+        model_dir = str(self.work_dir / 'models')
+        trainer.save_model(model_dir)
+        return model_dir
+    
+    @cached_property
+    def predictor(self):
+        from modules.predictor import SeizurePredictor
+        return SeizurePredictor(model_dir=self.model_dir)
+    
+    def feature_dicts(self, n):
+        columns = self.predictor.feature_columns
+        X, _ = create_sample_data(n_samples=max(n, 3), n_features=len(columns), random_state=SEED)
+        return [dict(zip(columns, row)) for row in X[:n]]
+    
+    def path(self, name):
+        return str(self.work_dir / name)
+
+
+def write_text_pdf(path, lines):
+    """Write a one-page PDF with one text line per entry (no PDF library needed)"""
+    stream = "BT /F1 10 Tf 50 780 Td 12 TL " + " ".join(
+        "(" + line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ") '"
+        for line in lines
+    ) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        "/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+    ]
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+# --- Predictor ---------------------------------------------------------------
+
+@benchmark('predictor.single', unit='predictions')
+def bench_predict_single(ctx, param):
+    features = ctx.feature_dicts(1)[0]
+    return lambda: ctx.predictor.predict(features)
+
+
+@benchmark('predictor.batch', params=[32, 512], unit='predictions', items=lambda n: n)
+def bench_predict_batch(ctx, batch_size):
+    features_list = ctx.feature_dicts(batch_size)
+    return lambda: ctx.predictor.predict_batch(features_list)
+
+
+# --- Trainer -----------------------------------------------------------------
+
+@benchmark('trainer.fit', params=[1000, 10000, 50000], quick_params=[1000, 10000],
+           unit='rows', items=lambda n: n, min_rounds=1, min_time=0, max_rounds=3, warmup=False)
+def bench_trainer_fit(ctx, n_rows):
+    from modules.trainer import SeizureModelTrainer
+    
+    X, y = create_sample_data(n_samples=n_rows, n_features=20, random_state=SEED)
+    trainer = SeizureModelTrainer()
+    return lambda: trainer.train_model(X, y)
+
+
+@benchmark('trainer.incremental_update', params=[500, 5000], unit='labels', items=lambda n: n, min_rounds=3)
+def bench_incremental_update(ctx, n_labels):
+    from modules.model_registry import ModelRegistry
+    from modules.incremental_updater import FeedbackStore, IncrementalUpdater
+    
+    registry = ModelRegistry()
+    registry.register('default', 'random_forest', ctx.model_dir)
+    registry.load('default')
+    registry.activate('default')
+    
+    store = FeedbackStore(ctx.path(f'feedback_{n_labels}.jsonl'))
+    X, y = create_sample_data(n_samples=n_labels, n_features=20, random_state=SEED + 1)
+    for row, label in zip(X, y):
+        store.add(dict(zip(ctx.predictor.feature_columns, row)), label)
+    
+    updater = IncrementalUpdater(registry, store, versions_root=ctx.path('versions'), publish='register')
+    
+    def run():
+        # Refit the same batch every round instead of consuming it
+        updater.offset, updater.replay = 0, []
+        updater.update(force=True)
+    return run
+
+
+# --- File feature extraction ---------------------------------------------------
+
+@benchmark('extract.csv', params=[1000, 100000], unit='rows', items=lambda n: n)
+def bench_extract_csv(ctx, n_rows):
+    from modules.file_processor import FileProcessor
+    
+    X, _ = create_sample_data(n_samples=n_rows, n_features=20, random_state=SEED)
+    path = ctx.path(f'eeg_{n_rows}.csv')
+    pd.DataFrame(X, columns=[f'ch{i}' for i in range(X.shape[1])]).to_csv(path, index=False)
+    
+    processor = FileProcessor()
+    return lambda: processor.process_file(path)
+
+
+@benchmark('extract.pdf', unit='files')
+def bench_extract_pdf(ctx, param):
+    try:
+        import pdfplumber  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("pdfplumber not installed")
+    from modules.file_processor import FileProcessor
+    
+    X, _ = create_sample_data(n_samples=40, n_features=8, random_state=SEED)
+    path = ctx.path('report.pdf')
+    write_text_pdf(path, ["EEG report"] + [" ".join(f"{v:.3f}" for v in row) for row in X])
+    
+    processor = FileProcessor()
+    return lambda: processor.process_file(path)
+
+
+@benchmark('extract.image', unit='files', min_rounds=3)
+def bench_extract_image(ctx, param):
+    from PIL import Image, ImageDraw
+    from modules.file_processor import FileProcessor
+    from utils.ocr_pool import get_ocr_pool
+    
+    if get_ocr_pool().backend == 'cli' and shutil.which('tesseract') is None:
+        raise SkipBenchmark("neither tesseract nor tesserocr found")
+    
+    X, _ = create_sample_data(n_samples=20, n_features=6, random_state=SEED)
+    image = Image.new('L', (800, 500), color=255)
+    draw = ImageDraw.Draw(image)
+    for i, row in enumerate(X):
+        draw.text((20, 20 + i * 22), "  ".join(f"{v:.2f}" for v in row), fill=0)
+    path = ctx.path('report.png')
+    image.save(path)
+    
+    processor = FileProcessor()
+    return lambda: processor.process_file(path)
+
+
+@benchmark('ocr.preprocess', params=['scan', 'photo'], unit='pages', min_rounds=3)
+def bench_ocr_preprocess(ctx, kind):
+    # Decode, downscale, threshold, deskew and text-block detection; no tesseract needed
+    from bench_ocr import render_report_photo
+    from utils.ocr import load_grayscale, preprocess_for_ocr, find_text_regions
+    
+    rng = np.random.default_rng(SEED)
+    path = ctx.path(f'{kind}.jpg')
+    if kind == 'scan':
+        render_report_photo(path, rng, width=1275, height=1650, angle=0.0, font_size=18)
+    else:
+        render_report_photo(path, rng, angle=3.0)
+    
+    def run():
+        gray, _ = load_grayscale(path)
+        page, _ = preprocess_for_ocr(gray)
+        return find_text_regions(page)
+    return run
+
+
+@benchmark('digitize.strip', params=['scan', 'photo'], unit='pages', min_rounds=3)
+def bench_digitize_strip(ctx, kind):
+    # 10 s of 19-channel EEG drawn on a 3300x2550 chart, from decode to signals
+    from generate_eeg_dataset import EEGSynthesizer, schedule_events, render_chart
+    from utils.ocr import load_grayscale
+    from utils.waveform_digitizer import digitize_strip
+    
+    rng = np.random.default_rng(SEED)
+    synth = EEGSynthesizer(rng, 19, 256, schedule_events(rng, 10, seizures_per_hour=0))
+    data, _ = synth.chunk(0, 2560)
+    path = ctx.path(f'chart_{kind}.' + ('jpg' if kind == 'photo' else 'png'))
+    render_chart(path, data, photo=(kind == 'photo'), rng=rng)
+    
+    def run():
+        gray, _ = load_grayscale(path)
+        return digitize_strip(gray)
+    return run
+
+
+OCR_SMALL_IMAGES = 32
+
+
+@benchmark('ocr.small_images', params=['cold', 'pool'], unit='images', items=OCR_SMALL_IMAGES, min_rounds=3)
+def bench_ocr_small_images(ctx, mode):
+    # Single-line crops, where engine start-up dominates; 'cold' starts an engine
+    # per image (a tesseract process, or a new tesserocr API without the binary)
+    from PIL import Image, ImageDraw, ImageFont
+    from utils.ocr_pool import OCRPool
+    
+    pool = OCRPool()
+    has_cli = shutil.which('tesseract') is not None
+    if pool.backend == 'cli' and not has_cli:
+        raise SkipBenchmark("neither tesseract nor tesserocr found")
+    
+    rng = np.random.default_rng(SEED)
+    font = ImageFont.load_default(size=28)
+    crops = []
+    for _ in range(OCR_SMALL_IMAGES):
+        image = Image.new('L', (640, 56), color=255)
+        ImageDraw.Draw(image).text((10, 10), "  ".join(f"{v:.2f}" for v in rng.normal(0, 30, 5)), font=font, fill=0)
+        crops.append(np.asarray(image))
+    
+    if mode == 'pool':
+        pool.recognize(crops[:1])
+        return lambda: pool.recognize(crops)
+    
+    if has_cli:
+        import pytesseract
+        return lambda: [pytesseract.image_to_string(Image.fromarray(crop), config='--psm 6') for crop in crops]
+    
+    import tesserocr
+    kwargs = {'path': os.environ['TESSDATA_PREFIX']} if os.environ.get('TESSDATA_PREFIX') else {}
+    return lambda: [tesserocr.image_to_text(Image.fromarray(crop), psm=tesserocr.PSM.SINGLE_BLOCK, **kwargs)
+                    for crop in crops]
+
+
+@benchmark('extract.edf', unit='files')
+def bench_extract_edf(ctx, param):
+    try:
+        import mne  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("mne not installed")
+    from generate_eeg_dataset import write_shard
+    from modules.file_processor import FileProcessor
+    
+    edf_dir = ctx.path('edf')
+    os.makedirs(edf_dir, exist_ok=True)
+    shard = write_shard(0, np.random.SeedSequence(SEED), edf_dir, fmt='edf', duration_s=300)
+    path = os.path.join(edf_dir, shard['files'][0])
+    
+    processor = FileProcessor()
+    return lambda: processor.process_file(path)
+
+
+RECORDING_HOURS = 6
+
+
+@benchmark('recording.view', params=['whole', 'minute', 'seconds'], unit='views', min_rounds=20)
+def bench_recording_view(ctx, span):
+    # One redraw of the Streamlit viewer: 23 channels of a 6-hour recording
+    # at 1000 points per channel, from the pyramid or from raw samples
+    from modules.recording_viewer import ArrayRecording, RecordingViewer
+    
+    rng = np.random.default_rng(SEED)
+    data = rng.normal(0, 30, (23, RECORDING_HOURS * 3600 * 256)).astype(np.float32)
+    viewer = RecordingViewer(ArrayRecording(data, 256))
+    seconds = {'whole': RECORDING_HOURS * 3600, 'minute': 60, 'seconds': 4}[span]
+    return lambda: viewer.view(3600, 3600 + seconds, max_points=1000)
+
+
+TEXT_CORPUS_MB = 50
+
+
+def report_text(megabytes, seed=SEED):
+    """OCR-like report lines with labelled values, dates and stray tokens, repeated to size"""
+    rng = np.random.default_rng(seed)
+    labels = ['Delta power', 'Theta power', 'Alpha power', 'Beta power', 'Heart rate', 'Spike count', 'Age']
+    lines = [
+        f"Channel Fp{i % 8}-F{i % 4}: {labels[i % 7]}: {rng.uniform(-50, 900):.2f} uV, "
+        f"ratio {rng.uniform(0, 1):.3f} on 2024-01-{i % 28 + 1:02d} page {i} v1.2.3 --"
+        for i in range(20000)
+    ]
+    block = '\n'.join(lines) + '\n'
+    return block * max(1, int(megabytes * 1e6 // len(block)))
+
+
+@benchmark('text.numbers', params=['regex', 'vectorized'], unit='MB', items=TEXT_CORPUS_MB,
+           min_rounds=3, min_time=0)
+def bench_text_numbers(ctx, method):
+    # 'regex' is the former extract_features_from_text parsing
+    import re
+    from utils.text_numbers import extract_numbers
+    
+    text = report_text(TEXT_CORPUS_MB)
+    if method == 'regex':
+        return lambda: np.array([float(n) for n in re.findall(r'-?\d+\.?\d*', text) if n])
+    return lambda: extract_numbers(text)
+
+
+EEG_GENERATE_SECONDS = 60
+
+
+@benchmark('generate.eeg', params=['npy', 'edf'], unit='MB', min_rounds=3,
+           items=lambda fmt: shard_bytes(fmt, EEG_GENERATE_SECONDS, 19, 256) / 1e6)
+def bench_generate_eeg(ctx, fmt):
+    from generate_eeg_dataset import write_shard
+    
+    output_dir = ctx.path(f'eeg_{fmt}')
+    os.makedirs(output_dir, exist_ok=True)
+    seed_sequence = np.random.SeedSequence(SEED)
+    return lambda: write_shard(0, seed_sequence, output_dir, fmt=fmt, duration_s=EEG_GENERATE_SECONDS)
+
+
+# --- Symptom checker and chatbot -------------------------------------------------
+
+SYMPTOM_TEXTS = [
+    "I had jerking movements and confusion",
+    "Staring spells and blank episodes at school",
+    "Lost consciousness, bit my tongue and was very tired afterwards",
+    "Strange smell and deja vu before my arm started twitching",
+    "Headache and dizziness after poor sleep"
+]
+
+CHAT_MESSAGES = [
+    "Hello",
+    "What is a seizure?",
+    "What should I do during a seizure?",
+    "What are the symptoms?",
+    "How is epilepsy treated?",
+    "What are the types of seizures?",
+    "Is it safe to drive?",
+    "Tell me about the weather"
+]
+
+
+@benchmark('symptoms.analyze', unit='messages', items=len(SYMPTOM_TEXTS))
+def bench_symptoms(ctx, param):
+    from modules.symptom_checker import SymptomChecker
+    checker = SymptomChecker()
+    
+    def run():
+        for text in SYMPTOM_TEXTS:
+            checker.analyze_symptoms(text)
+    return run
+
+
+@benchmark('chatbot.chat', unit='messages', items=len(CHAT_MESSAGES))
+def bench_chat(ctx, param):
+    from modules.chatbot import SeizureChatbot
+    chatbot = SeizureChatbot()
+    
+    def run():
+        for message in CHAT_MESSAGES:
+            chatbot.chat(message)
+        chatbot.clear_history()
+    return run
+
+
+@benchmark('alerts.update', params=[100, 10000], unit='windows', items=10000)
+def bench_alerts(ctx, n_streams):
+    from modules.alert_engine import AlertEngine
+    
+    rng = np.random.default_rng(SEED)
+    probabilities = [dict(zip(('NORMAL', 'PREICTAL', 'SEIZURE'), p * 100))
+                     for p in rng.dirichlet([4, 2, 1], 1000)]
+    engine = AlertEngine()
+    streams = [f'patient-{i}' for i in range(n_streams)]
+    clock = iter(range(10 ** 12))
+    
+    def run():
+        t = next(clock)
+        for i in range(10000):
+            engine.update_stream(streams[i % n_streams], probabilities[i % 1000], t)
+    return run
+
+
+# --- Doctor search -------------------------------------------------------------
+
+@benchmark('doctors.recommend', params=[1000, 100000, 1000000], quick_params=[1000, 100000],
+           unit='searches', min_rounds=3)
+def bench_doctor_search(ctx, n_doctors):
+    from modules.doctor_recommender import DoctorRecommender
+    
+    recommender = DoctorRecommender()
+    recommender.doctors_df = create_doctor_directory(n_doctors, random_state=SEED)
+    return lambda: recommender.recommend_doctors(risk_level='HIGH', location='Boston',
+                                                 specialization='Epilepsy', top_n=5)
+
+
+@benchmark('doctors.response', params=['dicts', 'bytes'], unit='responses', min_rounds=200)
+def bench_doctor_response(ctx, mode):
+    """1M doctors; the /api/doctors payload for 50 doctors, via jsonify-style json.dumps of dicts or the cached bytes"""
+    import json
+    from modules.doctor_recommender import DoctorRecommender
+    
+    recommender = DoctorRecommender()
+    recommender.doctors_df = create_doctor_directory(1_000_000, random_state=SEED)
+    kwargs = {'risk_level': 'HIGH', 'location': 'Boston', 'top_n': 50}
+    if mode == 'dicts':
+        return lambda: json.dumps(recommender.recommend_doctors(**kwargs), sort_keys=True, separators=(',', ':'))
+    return lambda: recommender.recommend_doctors_json(**kwargs)
+
+
+@benchmark('doctors.reload', params=['full', 'delta'], unit='reloads', min_rounds=3)
+def bench_doctor_reload(ctx, mode):
+    """
+    1M doctors in a CSV; 'full' reads and indexes it as a restart would,
+    'delta' reloads after 1% of the lines changed (alternating between two
+    versions of the file)
+    """
+    from modules.doctor_recommender import DoctorRecommender, DoctorSnapshot
+    
+    df = create_doctor_directory(1_000_000, random_state=SEED)
+    paths = [str(ctx.work_dir / 'neurologists_a.csv'), str(ctx.work_dir / 'neurologists_b.csv')]
+    df.to_csv(paths[0], index=False)
+    if mode == 'full':
+        return lambda: DoctorSnapshot.build(pd.read_csv(paths[0]))
+    
+    rng = np.random.default_rng(SEED)
+    df.loc[rng.choice(len(df), len(df) // 100, replace=False), 'rating'] = 2.5
+    df.to_csv(paths[1], index=False)
+    recommender = DoctorRecommender(csv_path=paths[0])
+    versions = itertools.cycle([1, 0])
+    
+    def run():
+        recommender.csv_path = paths[next(versions)]
+        assert recommender.reload()['incremental']
+    return run
+
+
+@benchmark('doctors.search_by_name', params=[1000, 100000, 1000000], quick_params=[1000, 100000],
+           unit='searches', min_rounds=3)
+def bench_doctor_name_search(ctx, n_doctors):
+    from modules.doctor_recommender import DoctorRecommender
+    
+    recommender = DoctorRecommender()
+    recommender.doctors_df = create_doctor_directory(n_doctors, random_state=SEED)
+    return lambda: recommender.search_by_name('Okafor')[:20]
+
+
+SYLLABLES = ['an', 'bel', 'cor', 'da', 'el', 'fan', 'gor', 'ha', 'is', 'jo', 'ka', 'lin', 'mar', 'nu', 'o',
+             'pet', 'qui', 'ros', 'sa', 'tan', 'u', 'vel', 'wen', 'xi', 'ya', 'zor', 'ber', 'chi', 'dor', 'ev']
+
+
+def distinct_doctor_directory(n_doctors):
+    """create_doctor_directory with (nearly) every name distinct, as in a real directory"""
+    rng = np.random.default_rng(SEED)
+    df = create_doctor_directory(n_doctors, random_state=SEED)
+    syllables = np.array(SYLLABLES)
+    first = [''.join(parts).title() for parts in syllables[rng.integers(len(SYLLABLES), size=(n_doctors, 2))]]
+    last = [''.join(parts).title() for parts in syllables[rng.integers(len(SYLLABLES), size=(n_doctors, 4))]]
+    df['name'] = [f'Dr. {f} {l}' for f, l in zip(first, last)]
+    return df
+
+
+def misspell(text, rng):
+    """Swap two adjacent letters or drop one"""
+    i = int(rng.integers(1, len(text) - 1))
+    if rng.random() < 0.5:
+        return text[:i - 1] + text[i] + text[i - 1] + text[i + 1:]
+    return text[:i] + text[i + 1:]
+
+
+def doctor_search_setup(n_doctors, names):
+    from modules.doctor_recommender import DoctorRecommender
+    
+    recommender = DoctorRecommender()
+    df = distinct_doctor_directory(n_doctors) if names == 'distinct' else create_doctor_directory(n_doctors, random_state=SEED)
+    recommender.doctors_df = df
+    rng = np.random.default_rng(SEED)
+    return recommender, df['name'].to_numpy()[rng.integers(len(df), size=200)], rng
+
+
+@benchmark('doctors.fuzzy_search', params=['synthetic', 'distinct'], unit='searches',
+           min_rounds=1000, min_time=1.0)
+def bench_doctor_fuzzy_search(ctx, names):
+    """500k doctors; a misspelled full name or last name per call (see p99 in the JSON)"""
+    recommender, sample, rng = doctor_search_setup(500_000, names)
+    queries = itertools.cycle([misspell(name.split(' ', 1)[1] if i % 2 else name.split()[-1], rng)
+                               for i, name in enumerate(sample)])
+    return lambda: recommender.search_doctors(next(queries), top_n=20)
+
+
+@benchmark('doctors.autocomplete', params=['synthetic', 'distinct'], unit='searches',
+           min_rounds=1000, min_time=1.0)
+def bench_doctor_autocomplete(ctx, names):
+    """500k doctors; a 2-6 letter prefix of a first or last name per call"""
+    recommender, sample, rng = doctor_search_setup(500_000, names)
+    queries = itertools.cycle([name.split()[1 + i % 2][:2 + i % 5] for i, name in enumerate(sample)])
+    return lambda: recommender.autocomplete(next(queries), limit=10)
+
+
+@benchmark('doctors.nearest', params=['distance', 'score', 'score+filters', 'remote'],
+           unit='searches', items=100, min_rounds=3)
+def bench_doctor_nearest(ctx, mode):
+    from modules.doctor_recommender import DoctorRecommender, CITY_COORDINATES
+    
+    recommender = DoctorRecommender()
+    recommender.doctors_df = create_doctor_directory(1_000_000, random_state=SEED)
+    rng = np.random.default_rng(SEED)
+    if mode == 'remote':
+        # Anywhere in the continental US, mostly hundreds of km from the
+        # directory's 20 cities: the worst case for the tree
+        points = np.column_stack([rng.uniform(26, 48, 100), rng.uniform(-122, -72, 100)])
+    else:
+        # Patients within about 100 km of a city
+        cities = np.array(list(CITY_COORDINATES.values()))
+        points = cities[rng.integers(len(cities), size=100)] + rng.uniform(-1, 1, size=(100, 2))
+    kwargs = {'rank_by': 'distance' if mode == 'distance' else 'score'}
+    if mode == 'score+filters':
+        kwargs.update(specialization='Epilepsy', emergency=True)
+    
+    def run():
+        for latitude, longitude in points:
+            recommender.nearest_doctors(latitude, longitude, top_n=5, **kwargs)
+    return run
+
+
+# --- API (Flask test client) ------------------------------------------------------
+
+API_REQUESTS_PER_CALL = 20
+
+
+@benchmark('api.flask', params=['predict', 'chat', 'symptoms', 'doctors'],
+           unit='requests', items=API_REQUESTS_PER_CALL)
+def bench_api(ctx, scenario):
+    # api.py loads models/ relative to the working directory at import time;
+    # every prediction here is a distinct vector, so the cache only adds its lookup
+    ctx.model_dir
+    os.chdir(ctx.work_dir)
+    import api
+    
+    client = api.app.test_client()
+    if scenario == 'predict':
+        bodies = [{'features': f} for f in ctx.feature_dicts(1000)]
+        counter = iter(range(10 ** 9))
+        
+        def send():
+            client.post('/api/predict', json=bodies[next(counter) % len(bodies)])
+    elif scenario == 'chat':
+        send = lambda: client.post('/api/chat', json={'message': 'What should I do during a seizure?'})
+    elif scenario == 'symptoms':
+        send = lambda: client.post('/api/symptoms/analyze', json={'symptoms': SYMPTOM_TEXTS[0]})
+    else:
+        send = lambda: client.get('/api/doctors?risk_level=HIGH&top_n=5')
+    
+    def run():
+        for _ in range(API_REQUESTS_PER_CALL):
+            send()
+    return run
+
+
+# --- Runner and comparison --------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(quick=False, name_filter=None, verbose=False):
+    """Run the selected benchmarks and return the JSON-serializable results"""
+    selected = [b for b in BENCHMARKS
+                if (not quick or b.quick) and (not name_filter or any(f in b.name for f in name_filter))]
+    
+    results = {}
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        ctx = BenchmarkContext(work_dir)
+        
+        print(f"\n{'Benchmark':<36}{'Median':>12}{'Throughput':>22}{'Rounds':>8}")
+        print("-" * 78)
+        
+        for bench in selected:
+            # Modules print progress; keep the report readable unless asked
+            sink = sys.stdout if verbose else io.StringIO()
+            try:
+                with redirect_stdout(sink):
+                    fn = bench.setup(ctx, bench.param)
+                    stats = measure(fn, bench.min_rounds, bench.min_time,
+                                    bench.max_rounds, bench.warmup)
+            except SkipBenchmark as e:
+                results[bench.name] = {'skipped': str(e)}
+                print(f"{bench.name:<36}{'skipped: ' + str(e):>42}")
+                continue
+            except Exception as e:
+                # One broken benchmark must not lose the results of the others
+                results[bench.name] = {'error': repr(e)}
+                print(f"{bench.name:<36}  error: {e!r}")
+                continue
+            finally:
+                os.chdir(original_cwd)
+            
+            stats['unit'] = bench.unit
+            stats['items_per_second'] = bench.items / stats['median'] if stats['median'] > 0 else None
+            results[bench.name] = stats
+            
+            rate = stats['items_per_second']
+            throughput = f"{rate:,.0f} {bench.unit}/s" if rate >= 100 else f"{rate:.2f} {bench.unit}/s"
+            print(f"{bench.name:<36}{stats['median'] * 1000:>10.3f}ms{throughput:>22}{stats['rounds']:>8}")
+    
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'quick': quick,
+            'seed': SEED
+        },
+        'benchmarks': results
+    }
+
+
+def compare(baseline, current, threshold=0.10, metric='median'):
+    """
+    Print a per-benchmark comparison of one timing statistic
+    
+    Returns:
+        Names of benchmarks that slowed down by more than threshold, or
+        that raised an error in the current run
+    """
+    base_results, new_results = baseline['benchmarks'], current['benchmarks']
+    print(f"\nBaseline: {baseline['meta'].get('commit')}  Current: {current['meta'].get('commit')}  "
+          f"Metric: {metric}  Threshold: {threshold:.0%}")
+    print(f"\n{'Benchmark':<36}{'Baseline':>12}{'Current':>12}{'Change':>10}  Status")
+    print("-" * 84)
+    
+    regressions, errors = [], []
+    for name in sorted(set(base_results) | set(new_results)):
+        old, new = base_results.get(name, {}), new_results.get(name, {})
+        if 'error' in old or 'error' in new:
+            if 'error' in new:
+                errors.append(name)
+            run, error = ('current', new['error']) if 'error' in new else ('baseline', old['error'])
+            print(f"{name:<36}{'-':>12}{'-':>12}{'-':>10}  ERROR in {run}: {error}")
+            continue
+        if metric not in old or metric not in new:
+            # Filtered runs and missing optional dependencies leave gaps
+            status = 'new' if metric in new else 'not in current' if metric in old else 'skipped'
+            print(f"{name:<36}{'-':>12}{'-':>12}{'-':>10}  {status}")
+            continue
+        
+        change = (new[metric] - old[metric]) / old[metric]
+        if change > threshold:
+            status = 'REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        print(f"{name:<36}{old[metric] * 1000:>10.3f}ms{new[metric] * 1000:>10.3f}ms{change:>+10.1%}  {status}")
+    
+    print(f"\n{len(regressions)} regression(s) above {threshold:.0%}, {len(errors)} error(s) in the current run")
+    return regressions + errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SeizureGuard benchmark suite")
+    parser.add_argument('--output', help="Write results JSON to this path")
+    parser.add_argument('--quick', action='store_true', help="Skip the largest inputs (1M doctors, 50k-row fit)")
+    parser.add_argument('--filter', action='append', help="Only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument('--list', action='store_true', help="List benchmark names and exit")
+    parser.add_argument('--verbose', action='store_true', help="Show module output while benchmarking")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Compare two results files instead of running")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default 0.10)")
+    parser.add_argument('--metric', choices=['median', 'min', 'mean'], default='median',
+                        help="Statistic compared (min is steadier on noisy machines)")
+    args = parser.parse_args()
+    
+    if args.list:
+        for bench in BENCHMARKS:
+            print(bench.name + ('' if bench.quick else '  (full only)'))
+        sys.exit(0)
+    
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        sys.exit(1 if compare(baseline, current, args.threshold, args.metric) else 0)
+    
+    results = run_suite(quick=args.quick, name_filter=args.filter, verbose=args.verbose)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
@@ -13,6 +13,8 @@ const Doctors = () => {
     specialization: '',
     emergency: false
   })
+  const [query, setQuery] = useState('')
+  const [suggestions, setSuggestions] = useState([])
   const [loading, setLoading] = useState(false)
   
   useEffect(() => {
@@ -43,6 +45,22 @@ const Doctors = () => {
     }
   }
   
+  const fetchSuggestions = async (text) => {
+    setQuery(text)
+    if (text.trim().length < 2) {
+      setSuggestions([])
+      return
+    }
+    try {
+      const response = await axios.get(`/api/doctors/autocomplete?${new URLSearchParams({ q: text })}`)
+      if (response.data.success) {
+        setSuggestions(response.data.suggestions)
+      }
+    } catch (error) {
+      console.error('Failed to fetch suggestions')
+    }
+  }
+  
   const fetchDoctors = async () => {
     setLoading(true)
     try {
@@ -51,7 +69,10 @@ const Doctors = () => {
       if (filters.specialization) params.append('specialization', filters.specialization)
       if (filters.emergency) params.append('emergency', 'true')
       
-      const response = await axios.get(`/api/doctors?${params}`)
+      // A typed name, hospital or city takes a typo-tolerant search instead of the filters
+      const response = query.trim()
+        ? await axios.get(`/api/doctors/search?${new URLSearchParams({ q: query })}`)
+        : await axios.get(`/api/doctors?${params}`)
       if (response.data.success) {
         setDoctors(response.data.doctors)
       }
@@ -81,6 +102,21 @@ const Doctors = () => {
         animate={{ opacity: 1, scale: 1 }}
         className="glass-card p-6 rounded-2xl"
       >
+        <input
+          type="text"
+          value={query}
+          onChange={(e) => fetchSuggestions(e.target.value)}
+          onKeyDown={(e) => e.key === 'Enter' && fetchDoctors()}
+          list="doctor-suggestions"
+          placeholder="Search by doctor, hospital or city"
+          className="input-field w-full mb-4"
+        />
+        <datalist id="doctor-suggestions">
+          {suggestions.map((suggestion, i) => (
+            <option key={i} value={suggestion.text}>{suggestion.field}</option>
+          ))}
+        </datalist>
+        
         <div className="grid md:grid-cols-3 gap-4 mb-4">
           <select
             value={filters.location}
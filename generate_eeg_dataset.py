@@ -0,0 +1,410 @@
+"""
+Generate Synthetic EEG Dataset
+Creates multichannel raw EEG recordings with preictal drift and spike-wave
+seizures, written as EDF, .npy or Parquet shards by parallel worker
+processes. Each shard is synthesized and written chunk by chunk, so corpus
+size is bounded by disk space rather than memory.
+"""
+import os
+import json
+import math
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.signal import lfilter
+
+from utils.edf_writer import EDFWriter
+
+# Standard 10-20 montage, used for channel names in order
+CHANNELS_10_20 = [
+    'Fp1', 'Fp2', 'F7', 'F3', 'Fz', 'F4', 'F8', 'T3', 'C3', 'Cz',
+    'C4', 'T4', 'T5', 'P3', 'Pz', 'P4', 'T6', 'O1', 'O2'
+]
+
+# Sample labels, matching the classes of generate_sample_dataset.py
+NORMAL, PREICTAL, SEIZURE = 0, 1, 2
+
+FORMATS = ('edf', 'npy', 'parquet')
+FILE_EXTENSIONS = {'edf': '.edf', 'npy': '.npy', 'parquet': '.parquet'}
+
+
+def channel_names(n_channels):
+    """10-20 names first, then numbered extras"""
+    return [CHANNELS_10_20[i] if i < len(CHANNELS_10_20) else f'EEG{i + 1:03d}' for i in range(n_channels)]
+
+
+def schedule_events(rng, duration_s, seizures_per_hour=2.0, seizure_s=(20.0, 90.0), preictal_s=300.0):
+    """
+    Draw non-overlapping seizures for one recording
+    
+    Returns:
+        List of dicts with onset, duration and preictal window start (seconds)
+    """
+    expected = seizures_per_hour * duration_s / 3600.0
+    n_seizures = rng.poisson(expected)
+    
+    events = []
+    cursor = 0.0
+    for onset in np.sort(rng.uniform(0, duration_s, n_seizures)):
+        duration = rng.uniform(*seizure_s)
+        if onset < cursor or onset + duration > duration_s:
+            continue
+        events.append({
+            'onset': float(onset),
+            'duration': float(duration),
+            'preictal_onset': float(max(cursor, onset - preictal_s))
+        })
+        cursor = onset + duration
+    return events
+
+
+class EEGSynthesizer:
+    def __init__(self, rng, n_channels=19, sfreq=256, events=None, amplitude_uv=30.0):
+        """
+        Initialize EEG synthesizer
+        
+        Args:
+            rng: numpy Generator owning all randomness for this recording
+            n_channels: Number of channels
+            sfreq: Sampling rate in Hz
+            events: Seizure schedule from schedule_events
+            amplitude_uv: Background amplitude in microvolts
+        """
+        self.rng = rng
+        self.n_channels = n_channels
+        self.sfreq = sfreq
+        self.events = events or []
+        self.amplitude_uv = amplitude_uv
+        
+        # Per-channel rhythm parameters are fixed for the recording
+        self.alpha_freq = rng.uniform(8.5, 11.5, (n_channels, 1))
+        self.alpha_gain = rng.uniform(0.3, 1.0, (n_channels, 1))
+        self.phases = rng.uniform(0, 2 * np.pi, (4, n_channels, 1))
+        self.seizure_gain = rng.uniform(0.6, 1.0, (n_channels, 1))
+        
+        # Volume conduction: neighbouring channels share part of their signal
+        mixing = np.eye(n_channels) + 0.3 * np.eye(n_channels, k=1) + 0.3 * np.eye(n_channels, k=-1)
+        self.mixing = mixing / mixing.sum(axis=1, keepdims=True)
+        
+        # AR(1) state carries the 1/f-like background across chunks
+        self.ar_coefficient = 0.97
+        self.ar_state = np.zeros((n_channels, 1))
+    
+    def labels(self, t):
+        """Per-sample class labels for sample times t"""
+        labels = np.full(t.shape, NORMAL, dtype=np.int8)
+        for event in self.events:
+            end = event['onset'] + event['duration']
+            labels[(t >= event['preictal_onset']) & (t < event['onset'])] = PREICTAL
+            labels[(t >= event['onset']) & (t < end)] = SEIZURE
+        return labels
+    
+    def chunk(self, start_sample, n_samples):
+        """
+        Synthesize samples [start_sample, start_sample + n_samples)
+        
+        Chunks must be requested in order; only the AR filter keeps state.
+        
+        Returns:
+            (data, labels): float32 (n_channels, n_samples) in microvolts, int8 (n_samples,)
+        """
+        t = (start_sample + np.arange(n_samples)) / self.sfreq
+        
+        # Background: AR(1) pink-ish noise plus an alpha rhythm with slow amplitude modulation
+        noise = self.rng.standard_normal((self.n_channels, n_samples))
+        background, self.ar_state = lfilter([1.0], [1.0, -self.ar_coefficient], noise, axis=1, zi=self.ar_state)
+        background *= np.sqrt(1 - self.ar_coefficient ** 2)
+        
+        alpha_envelope = 1 + 0.3 * np.sin(2 * np.pi * 0.1 * t + self.phases[0])
+        background += self.alpha_gain * alpha_envelope * np.sin(2 * np.pi * self.alpha_freq * t + self.phases[1])
+        signal = self.amplitude_uv * background
+        
+        for event in self.events:
+            end = event['onset'] + event['duration']
+            if t[-1] < event['preictal_onset'] or t[0] >= end:
+                continue
+            signal += self._preictal(t, event)
+            signal += self._spike_wave(t, event)
+        
+        return (self.mixing @ signal).astype(np.float32), self.labels(t)
+    
+    def _preictal(self, t, event):
+        """Rising theta power and slow baseline drift before onset"""
+        window = event['onset'] - event['preictal_onset']
+        if window <= 0:
+            return 0.0
+        
+        ramp = np.clip((t - event['preictal_onset']) / window, 0, 1)
+        ramp[t >= event['onset']] = 0
+        theta = np.sin(2 * np.pi * 5.5 * t + self.phases[2])
+        drift = np.sin(2 * np.pi * 0.15 * t + self.phases[3])
+        return self.amplitude_uv * ramp * (0.8 * theta + 1.5 * drift)
+    
+    def _spike_wave(self, t, event):
+        """Generalized spike-and-wave discharge slowing from 3.5 Hz to 2.5 Hz"""
+        tau = t - event['onset']
+        active = (tau >= 0) & (tau < event['duration'])
+        if not active.any():
+            return 0.0
+        
+        # Closed-form phase of a linear chirp, so chunks join without state
+        f0, f1 = 3.5, 2.5
+        cycles = f0 * tau + (f1 - f0) * tau ** 2 / (2 * event['duration'])
+        u = np.mod(cycles, 1.0)
+        waveform = 2.5 * np.exp(-0.5 * ((u - 0.1) / 0.025) ** 2) - 1.2 * np.sin(np.pi * u) ** 2
+        
+        # 2 s ramps at onset and offset
+        envelope = np.clip(np.minimum(tau, event['duration'] - tau) / 2.0, 0, 1) * active
+        return self.seizure_gain * (6 * self.amplitude_uv) * waveform * envelope
+
+
+class NpyStreamWriter:
+    """Write a .npy file of known shape chunk by chunk without holding it in memory"""
+    
+    def __init__(self, path, shape, dtype):
+        self._file = open(path, 'wb')
+        np.lib.format.write_array_header_2_0(self._file, {
+            'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            'fortran_order': False,
+            'shape': tuple(shape)
+        })
+    
+    def write(self, array):
+        self._file.write(np.ascontiguousarray(array).tobytes())
+    
+    def close(self):
+        self._file.close()
+
+
+def render_chart(path, data, names=None, width=3300, height=2550, lane_microvolts=100.0,
+                 margin=250, line_width=2, photo=False, rng=None):
+    """
+    Draw (channels, samples) microvolt data as a paper EEG chart: one lane
+    per channel on a light red grid, channel names in the left margin
+    
+    Args:
+        path: Image file to write (.png, .jpg)
+        lane_microvolts: Amplitude drawn as one lane spacing
+        margin: Left margin for channel names, in pixels
+        photo: Add uneven lighting and sensor noise, like a phone photo
+        rng: Generator for the photo noise
+    
+    Returns:
+        (lanes as (top, bottom) rows, (first, last) trace columns)
+    """
+    import cv2
+    
+    n_channels, n_samples = data.shape
+    names = names or channel_names(n_channels)
+    image = np.full((height, width, 3), 250, dtype=np.uint8)
+    
+    # 0.2 s minor and 1 s major grid for a 10 s page
+    x0, x1 = margin, width - 50
+    for i, x in enumerate(np.linspace(x0, x1, 51).astype(int)):
+        cv2.line(image, (x, 0), (x, height - 1), (190, 190, 240) if i % 5 else (140, 140, 230), 1)
+    for y in range(0, height, (x1 - x0) // 50):
+        cv2.line(image, (0, y), (width - 1, y), (210, 210, 245), 1)
+    
+    spacing = (height - 100) / n_channels
+    lanes = []
+    xs = np.linspace(x0, x1, n_samples)
+    for channel in range(n_channels):
+        baseline = 50 + spacing * (channel + 0.5)
+        ys = baseline - data[channel] * spacing / lane_microvolts
+        points = np.stack([xs, ys], axis=1).round().astype(np.int32)
+        cv2.polylines(image, [points], False, (20, 20, 20), line_width, cv2.LINE_AA)
+        cv2.putText(image, names[channel], (20, int(baseline) + 10), cv2.FONT_HERSHEY_SIMPLEX, 1.0,
+                    (20, 20, 20), 2, cv2.LINE_AA)
+        lanes.append((int(baseline - spacing / 2), int(baseline + spacing / 2)))
+    
+    if photo:
+        rng = rng or np.random.default_rng()
+        light = np.linspace(1.0, 0.6, width, dtype=np.float32)[None, :, None]
+        noisy = image.astype(np.float32) * light + rng.normal(0, 5, image.shape).astype(np.float32)
+        image = np.clip(noisy, 0, 255).astype(np.uint8)
+    
+    cv2.imwrite(path, image)
+    return lanes, (x0, x1)
+
+
+def write_shard(index, seed_sequence, output_dir, fmt='npy', duration_s=3600, n_channels=19, sfreq=256,
+                chunk_s=10, seizures_per_hour=2.0, preictal_s=300.0):
+    """
+    Synthesize one recording and stream it to output_dir
+    
+    The shard depends only on its SeedSequence, so output is identical for
+    any number of workers.
+    
+    Returns:
+        Manifest entry for the shard
+    """
+    rng = np.random.default_rng(seed_sequence)
+    events = schedule_events(rng, duration_s, seizures_per_hour, preictal_s=preictal_s)
+    synth = EEGSynthesizer(rng, n_channels, sfreq, events)
+    names = channel_names(n_channels)
+    
+    n_samples = int(duration_s * sfreq)
+    chunk_samples = int(chunk_s * sfreq)
+    stem = os.path.join(output_dir, f'shard_{index:05d}')
+    files = [stem + FILE_EXTENSIONS[fmt]]
+    
+    if fmt == 'edf':
+        writer = EDFWriter(files[0], names, sfreq, n_records=-(-n_samples // sfreq),
+                           recording_id=f'Startdate X synthetic shard {index}')
+    elif fmt == 'npy':
+        # Time-major, so each chunk is one contiguous write
+        writer = NpyStreamWriter(files[0], (n_samples, n_channels), np.float32)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([(name, pa.float32()) for name in names] + [('label', pa.int8())])
+        writer = pq.ParquetWriter(files[0], schema, compression='zstd')
+    
+    label_writer = None
+    if fmt != 'parquet':
+        files.append(stem + '_labels.npy')
+        label_writer = NpyStreamWriter(files[1], (n_samples,), np.int8)
+    
+    try:
+        for start in range(0, n_samples, chunk_samples):
+            data, labels = synth.chunk(start, min(chunk_samples, n_samples - start))
+            if fmt == 'edf':
+                writer.write(data)
+            elif fmt == 'npy':
+                writer.write(data.T)
+            else:
+                columns = [pa.array(channel) for channel in data] + [pa.array(labels)]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            if label_writer is not None:
+                label_writer.write(labels)
+    finally:
+        writer.close()
+        if label_writer is not None:
+            label_writer.close()
+    
+    return {
+        'index': index,
+        'files': [os.path.basename(f) for f in files],
+        'bytes': sum(os.path.getsize(f) for f in files),
+        'n_samples': n_samples,
+        'seed_spawn_key': list(seed_sequence.spawn_key),
+        'events': events
+    }
+
+
+def _write_shard_task(task):
+    index, seed_sequence, kwargs = task
+    return write_shard(index, seed_sequence, **kwargs)
+
+
+def shard_bytes(fmt, duration_s, n_channels, sfreq):
+    """Approximate on-disk size of one shard (Parquet is estimated uncompressed)"""
+    n_samples = duration_s * sfreq
+    sample_bytes = 2 if fmt == 'edf' else 4
+    return n_samples * (n_channels * sample_bytes + 1)
+
+
+def generate_eeg_dataset(output_dir='datasets/eeg', n_shards=4, fmt='npy', duration_s=3600, n_channels=19,
+                         sfreq=256, chunk_s=10, seizures_per_hour=2.0, preictal_s=300.0, seed=0, workers=None):
+    """
+    Generate a sharded synthetic EEG corpus
+    
+    Args:
+        output_dir: Directory for shards and manifest.json
+        n_shards: Number of recordings
+        fmt: 'edf', 'npy' (float32 samples x channels plus int8 labels) or 'parquet'
+        duration_s: Seconds per recording
+        n_channels: Channels per recording
+        sfreq: Sampling rate in Hz
+        chunk_s: Seconds synthesized and written per step (bounds worker memory)
+        seizures_per_hour: Mean seizure rate
+        preictal_s: Length of the labelled preictal window before each seizure
+        seed: Root seed; shard i always uses SeedSequence(seed).spawn(n_shards)[i]
+        workers: Worker processes (defaults to CPU count)
+    
+    Returns:
+        Manifest dict (also written to output_dir/manifest.json)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format. Supported: {FORMATS}")
+    if fmt == 'parquet':
+        import pyarrow  # noqa: F401  (fail before starting workers)
+    if int(sfreq) != sfreq or int(chunk_s) != chunk_s:
+        raise ValueError("sfreq and chunk_s must be whole numbers")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    config = {
+        'duration_s': duration_s, 'n_channels': n_channels, 'sfreq': sfreq, 'chunk_s': chunk_s,
+        'seizures_per_hour': seizures_per_hour, 'preictal_s': preictal_s
+    }
+    shard_kwargs = dict(config, output_dir=output_dir, fmt=fmt)
+    tasks = [(i, seq, shard_kwargs) for i, seq in enumerate(np.random.SeedSequence(seed).spawn(n_shards))]
+    
+    workers = workers or os.cpu_count() or 1
+    print(f"Generating {n_shards} {fmt.upper()} shards of {duration_s}s x {n_channels} channels "
+          f"at {sfreq} Hz with {workers} worker(s)...")
+    
+    shards = []
+    if workers == 1:
+        results = map(_write_shard_task, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_write_shard_task, tasks)
+    try:
+        for shard in results:
+            shards.append(shard)
+            print(f"  shard {shard['index']:05d}: {shard['bytes'] / 1e6:.1f} MB, {len(shard['events'])} seizure(s)")
+    finally:
+        if workers != 1:
+            pool.shutdown()
+    
+    manifest = {
+        'seed': seed,
+        'format': fmt,
+        'channels': channel_names(n_channels),
+        'labels': {'normal': NORMAL, 'preictal': PREICTAL, 'seizure': SEIZURE},
+        **config,
+        'total_bytes': sum(s['bytes'] for s in shards),
+        'shards': shards
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    print(f"✓ {manifest['total_bytes'] / 1e9:.2f} GB written to: {output_dir}")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic multichannel EEG corpus")
+    parser.add_argument('--output-dir', default='datasets/eeg', help="Output directory")
+    parser.add_argument('--format', choices=FORMATS, default='npy', help="Shard file format")
+    parser.add_argument('--shards', type=int, default=4, help="Number of recordings")
+    parser.add_argument('--target-gb', type=float, help="Pick the shard count to reach roughly this size")
+    parser.add_argument('--duration', type=int, default=3600, help="Seconds per recording")
+    parser.add_argument('--channels', type=int, default=19, help="Channels per recording")
+    parser.add_argument('--sfreq', type=int, default=256, help="Sampling rate in Hz")
+    parser.add_argument('--chunk', type=int, default=10, help="Seconds synthesized per write")
+    parser.add_argument('--seizures-per-hour', type=float, default=2.0, help="Mean seizure rate")
+    parser.add_argument('--preictal', type=float, default=300.0, help="Preictal window in seconds")
+    parser.add_argument('--seed', type=int, default=0, help="Root seed")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    
+    n_shards = args.shards
+    if args.target_gb:
+        n_shards = math.ceil(args.target_gb * 1e9 / shard_bytes(args.format, args.duration, args.channels, args.sfreq))
+    
+    generate_eeg_dataset(
+        output_dir=args.output_dir,
+        n_shards=n_shards,
+        fmt=args.format,
+        duration_s=args.duration,
+        n_channels=args.channels,
+        sfreq=args.sfreq,
+        chunk_s=args.chunk,
+        seizures_per_hour=args.seizures_per_hour,
+        preictal_s=args.preictal,
+        seed=args.seed,
+        workers=args.workers
+    )
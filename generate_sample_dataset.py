@@ -6,33 +6,33 @@ import pandas as pd
 import numpy as np
 import os
 
-def generate_sample_dataset(n_samples=1000, n_features=20, output_path='datasets/seizure_dataset.csv'):
+def create_sample_data(n_samples=1000, n_features=20, random_state=None):
     """
-    Generate synthetic seizure dataset
+    Create synthetic seizure features and labels in memory
     
     Args:
         n_samples: Number of samples to generate
         n_features: Number of features per sample
-        output_path: Path to save the dataset
-    """
-    print(f"Generating sample dataset with {n_samples} samples and {n_features} features...")
+        random_state: Seed for reproducible data (None uses global NumPy state)
     
-    # Create output directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    Returns:
+        (X, y) arrays of shape (n, n_features) and (n,)
+    """
+    rng = np.random.RandomState(random_state) if random_state is not None else np.random
     
     # Generate features for each class
     samples_per_class = n_samples // 3
     
     # Class 0: Normal (low variance, centered around 0)
-    normal_data = np.random.randn(samples_per_class, n_features) * 0.5
+    normal_data = rng.randn(samples_per_class, n_features) * 0.5
     normal_labels = np.zeros(samples_per_class)
     
     # Class 1: Preictal (medium variance, slightly elevated)
-    preictal_data = np.random.randn(samples_per_class, n_features) * 1.0 + 0.5
+    preictal_data = rng.randn(samples_per_class, n_features) * 1.0 + 0.5
     preictal_labels = np.ones(samples_per_class)
     
     # Class 2: Seizure (high variance, elevated)
-    seizure_data = np.random.randn(samples_per_class, n_features) * 1.5 + 1.0
+    seizure_data = rng.randn(samples_per_class, n_features) * 1.5 + 1.0
     seizure_labels = np.full(samples_per_class, 2)
     
     # Combine all data
@@ -40,9 +40,26 @@ def generate_sample_dataset(n_samples=1000, n_features=20, output_path='datasets
     y = np.concatenate([normal_labels, preictal_labels, seizure_labels])
     
     # Shuffle the data
-    indices = np.random.permutation(len(X))
-    X = X[indices]
-    y = y[indices]
+    indices = rng.permutation(len(X))
+    
+    return X[indices], y[indices].astype(int)
+
+
+def generate_sample_dataset(n_samples=1000, n_features=20, output_path='datasets/seizure_dataset.csv'):
+    """
+    Generate synthetic seizure dataset
+    
+    Args:
+        n_samples: Number of samples to generate
+        n_features: Number of features per sample
+        output_path: Path to save the dataset
+    """
+    print(f"Generating sample dataset with {n_samples} samples and {n_features} features...")
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    X, y = create_sample_data(n_samples, n_features)
     
     # Create DataFrame
     feature_names = [f'feature_{i+1}' for i in range(n_features)]
@@ -62,6 +79,67 @@ def generate_sample_dataset(n_samples=1000, n_features=20, output_path='datasets
     return df
 
 
+DOCTOR_LOCATIONS = [
+    'New York, NY', 'Los Angeles, CA', 'Chicago, IL', 'Houston, TX', 'Phoenix, AZ',
+    'Philadelphia, PA', 'San Antonio, TX', 'San Diego, CA', 'Dallas, TX', 'San Jose, CA',
+    'Austin, TX', 'Jacksonville, FL', 'Columbus, OH', 'Charlotte, NC', 'Seattle, WA',
+    'Denver, CO', 'Boston, MA', 'Nashville, TN', 'Portland, OR', 'Atlanta, GA'
+]
+
+DOCTOR_SPECIALIZATIONS = [
+    'Epilepsy & Seizure Disorders', 'Pediatric Neurology', 'Epilepsy Surgery', 'General Neurology',
+    'Epilepsy & EEG', 'Pediatric Epilepsy', 'Epilepsy & Sleep Disorders', 'Epilepsy & Neurostimulation'
+]
+
+DOCTOR_HOSPITALS = [
+    'City Medical Center', "Children's Hospital", 'University Medical Center', 'Metro Health Hospital',
+    'Regional Medical Center', 'Advanced Neurology Clinic', 'Community Hospital', 'Brain & Spine Institute'
+]
+
+FIRST_NAMES = ['Sarah', 'Michael', 'Emily', 'David', 'Lisa', 'James', 'Maria', 'Robert', 'Priya', 'Wei',
+               'Ahmed', 'Olivia', 'Daniel', 'Grace', 'Carlos', 'Hannah']
+LAST_NAMES = ['Johnson', 'Chen', 'Rodriguez', 'Kim', 'Anderson', 'Wilson', 'Garcia', 'Taylor', 'Patel',
+              'Nguyen', 'Hassan', 'Brown', 'Lee', 'Martinez', 'Cohen', 'Okafor']
+
+
+def create_doctor_directory(n_doctors=1000, random_state=None):
+    """
+    Create a synthetic neurologist directory with the DoctorRecommender columns
+    
+    Args:
+        n_doctors: Number of doctors to generate
+        random_state: Seed for reproducible data (None uses global NumPy state)
+    
+    Returns:
+        DataFrame with name, specialization, hospital, location, phone,
+        experience_years, rating, accepts_emergency, latitude and longitude
+        columns (the city's coordinates, scattered over about 30 km)
+    """
+    from modules.doctor_recommender import CITY_COORDINATES
+    
+    rng = np.random.RandomState(random_state) if random_state is not None else np.random
+    
+    first = np.array(FIRST_NAMES)[rng.randint(len(FIRST_NAMES), size=n_doctors)]
+    last = np.array(LAST_NAMES)[rng.randint(len(LAST_NAMES), size=n_doctors)]
+    phone_numbers = rng.randint(0, 10_000_000, size=n_doctors)
+    city = rng.randint(len(DOCTOR_LOCATIONS), size=n_doctors)
+    coordinates = np.array([CITY_COORDINATES[location] for location in DOCTOR_LOCATIONS])[city]
+    coordinates += rng.uniform(-0.3, 0.3, size=(n_doctors, 2))
+    
+    return pd.DataFrame({
+        'name': [f'Dr. {f} {l}' for f, l in zip(first, last)],
+        'specialization': np.array(DOCTOR_SPECIALIZATIONS)[rng.randint(len(DOCTOR_SPECIALIZATIONS), size=n_doctors)],
+        'hospital': np.array(DOCTOR_HOSPITALS)[rng.randint(len(DOCTOR_HOSPITALS), size=n_doctors)],
+        'location': np.array(DOCTOR_LOCATIONS)[city],
+        'phone': [f'(555) {n // 10000:03d}-{n % 10000:04d}' for n in phone_numbers],
+        'experience_years': rng.randint(3, 35, size=n_doctors),
+        'rating': np.round(rng.uniform(3.5, 5.0, size=n_doctors), 1),
+        'accepts_emergency': rng.rand(n_doctors) < 0.6,
+        'latitude': np.round(coordinates[:, 0], 5),
+        'longitude': np.round(coordinates[:, 1], 5)
+    })
+
+
 if __name__ == "__main__":
     # Generate dataset
     df = generate_sample_dataset(
@@ -1,18 +1,34 @@
 """
 SeizureGuard AI Modules
+
+Submodules are imported on first attribute access (PEP 562) so a process
+that only needs the chatbot or symptom checker does not load pandas,
+scikit-learn, OCR or deep learning libraries
 """
-from .trainer import SeizureModelTrainer
-from .predictor import SeizurePredictor
-from .file_processor import FileProcessor
-from .symptom_checker import SymptomChecker
-from .chatbot import SeizureChatbot
-from .doctor_recommender import DoctorRecommender
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'SeizureModelTrainer': '.trainer',
+    'SeizurePredictor': '.predictor',
+    'FileProcessor': '.file_processor',
+    'SymptomChecker': '.symptom_checker',
+    'SeizureChatbot': '.chatbot',
+    'DoctorRecommender': '.doctor_recommender',
+    'ModelRegistry': '.model_registry'
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    'SeizureModelTrainer',
-    'SeizurePredictor',
-    'FileProcessor',
-    'SymptomChecker',
-    'SeizureChatbot',
-    'DoctorRecommender'
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
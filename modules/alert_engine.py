@@ -0,0 +1,191 @@
+"""
+Module 12: Alert Engine
+Smooths per-window prediction probabilities over time and turns them into
+debounced PREICTAL/SEIZURE onset and offset events, with constant work and
+memory per window so one process can follow thousands of patient streams
+"""
+from typing import Dict, List, Optional
+
+
+# Alert levels in increasing severity; a level's score is the smoothed
+# probability of that class or any more severe one
+LEVELS = ('NORMAL', 'PREICTAL', 'SEIZURE')
+
+
+class AlertState:
+    """Smoothing and debounce state of one stream"""
+    __slots__ = ('stream_id', 'normal', 'preictal', 'seizure', 'level', 'candidate',
+                 'candidate_count', 'onset_time', 'windows')
+    
+    def __init__(self, stream_id: Optional[str] = None):
+        self.stream_id = stream_id
+        self.normal = 1.0
+        self.preictal = 0.0
+        self.seizure = 0.0
+        self.level = 0
+        self.candidate = 0
+        self.candidate_count = 0
+        self.onset_time = None
+        self.windows = 0
+
+
+class AlertEngine:
+    def __init__(self, alpha: float = 0.3, onset_threshold: float = 0.6, offset_threshold: float = 0.4,
+                 onset_windows: int = 2, offset_windows: int = 3):
+        """
+        Initialize alert engine
+        
+        Args:
+            alpha: Weight of the newest window in the exponential moving average
+                of class probabilities (1 disables smoothing)
+            onset_threshold: Smoothed score a level must reach to be entered
+            offset_threshold: Score below which an active level is left; the
+                gap to onset_threshold is the hysteresis band
+            onset_windows: Consecutive windows a higher level must hold before
+                its onset event is emitted
+            offset_windows: Consecutive windows a lower level must hold before
+                the active alert ends
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if offset_threshold > onset_threshold:
+            raise ValueError("offset_threshold must not exceed onset_threshold")
+        
+        self.alpha = alpha
+        self.onset_threshold = onset_threshold
+        self.offset_threshold = offset_threshold
+        self.onset_windows = max(1, onset_windows)
+        self.offset_windows = max(1, offset_windows)
+        self.states = {}
+    
+    def create_state(self, stream_id: Optional[str] = None) -> AlertState:
+        """State for a stream the caller keeps itself (see update())"""
+        return AlertState(stream_id)
+    
+    def _target(self, state: AlertState) -> int:
+        """Level the smoothed scores point to, with hysteresis around the active level"""
+        scores = (1.0, state.preictal + state.seizure, state.seizure)
+        level = 0
+        for candidate in (2, 1):
+            # Staying at (or below) the active level needs only the offset threshold
+            threshold = self.offset_threshold if candidate <= state.level else self.onset_threshold
+            if scores[candidate] >= threshold:
+                level = candidate
+                break
+        return level
+    
+    def update(self, state: AlertState, probabilities: Dict, timestamp: float) -> List[Dict]:
+        """
+        Add one window's class probabilities (percent or fractions, as
+        returned by the predictor) and return the events it triggers
+        
+        Returns:
+            Events with stream_id, event ('onset' or 'offset'), level, time and
+            score; an offset carries the duration of the alert it ends
+        """
+        normal = float(probabilities.get('NORMAL', 0.0))
+        preictal = float(probabilities.get('PREICTAL', 0.0))
+        seizure = float(probabilities.get('SEIZURE', 0.0))
+        total = normal + preictal + seizure
+        if total <= 0:
+            return []
+        
+        alpha = self.alpha if state.windows else 1.0
+        state.normal += alpha * (normal / total - state.normal)
+        state.preictal += alpha * (preictal / total - state.preictal)
+        state.seizure += alpha * (seizure / total - state.seizure)
+        state.windows += 1
+        
+        target = self._target(state)
+        if target == state.level:
+            state.candidate_count = 0
+            return []
+        
+        if target == state.candidate:
+            state.candidate_count += 1
+        else:
+            state.candidate = target
+            state.candidate_count = 1
+        
+        required = self.onset_windows if target > state.level else self.offset_windows
+        if state.candidate_count < required:
+            return []
+        
+        events = []
+        if state.level:
+            events.append(self._event(state, 'offset', state.level, timestamp))
+        state.level = target
+        state.candidate_count = 0
+        state.onset_time = timestamp if target else None
+        if target:
+            events.append(self._event(state, 'onset', target, timestamp))
+        return events
+    
+    def _event(self, state: AlertState, kind: str, level: int, timestamp: float) -> Dict:
+        event = {
+            'stream_id': state.stream_id,
+            'event': kind,
+            'level': LEVELS[level],
+            'time': timestamp,
+            'score': round((state.seizure if level == 2 else state.preictal + state.seizure) * 100, 2)
+        }
+        if kind == 'offset' and state.onset_time is not None:
+            event['duration'] = timestamp - state.onset_time
+        return event
+    
+    def update_stream(self, stream_id: str, probabilities: Dict, timestamp: float) -> List[Dict]:
+        """update() with state kept by the engine under stream_id"""
+        state = self.states.get(stream_id)
+        if state is None:
+            state = self.states[stream_id] = AlertState(stream_id)
+        return self.update(state, probabilities, timestamp)
+    
+    def close_stream(self, stream_id: str, timestamp: Optional[float] = None) -> List[Dict]:
+        """Forget a stream, ending its active alert (if any) at timestamp"""
+        state = self.states.pop(stream_id, None)
+        if state is None or not state.level or timestamp is None:
+            return []
+        return [self._event(state, 'offset', state.level, timestamp)]
+    
+    def evaluate(self, predictions: List[Dict], stream_id: Optional[str] = None) -> Dict:
+        """
+        Run a fresh state over a recorded timeline
+        
+        Args:
+            predictions: Dicts with probabilities and time (seconds), in time order
+            stream_id: Identifier echoed in the events
+        
+        Returns:
+            Dictionary with events and the final alert level
+        """
+        state = AlertState(stream_id)
+        events = []
+        for prediction in predictions:
+            events.extend(self.update(state, prediction['probabilities'], float(prediction['time'])))
+        return {'events': events, 'level': LEVELS[state.level]}
+    
+    def level(self, state: AlertState) -> str:
+        return LEVELS[state.level]
+    
+    def get_status(self) -> Dict:
+        active = {}
+        for state in self.states.values():
+            if state.level:
+                active[LEVELS[state.level]] = active.get(LEVELS[state.level], 0) + 1
+        return {'streams': len(self.states), 'active_alerts': active}
+
+
+if __name__ == "__main__":
+    # Test alert engine on a noisy timeline with one seizure
+    import numpy as np
+    
+    rng = np.random.default_rng(0)
+    engine = AlertEngine()
+    state = engine.create_state('demo')
+    
+    for i in range(120):
+        t = i * 0.5
+        base = [0.05, 0.15, 0.80] if 30 <= t < 45 else [0.25, 0.65, 0.10] if 20 <= t < 30 else [0.8, 0.15, 0.05]
+        probs = rng.dirichlet(np.array(base) * 10)
+        for event in engine.update(state, dict(zip(LEVELS, probs * 100)), t):
+            print(event)
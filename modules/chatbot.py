@@ -3,9 +3,16 @@ Module 5: Chatbot
 Intelligent chatbot for seizure-related queries and support
 """
 import re
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List
 
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.metrics import timed_stage
+
 
 class SeizureChatbot:
     def __init__(self):
@@ -75,6 +82,7 @@ class SeizureChatbot:
             ]
         }
     
+    @timed_stage('chat_response')
     def chat(self, user_message: str) -> Dict:
         """Main chat method"""
         # Store message in history
@@ -47,7 +47,21 @@ class CNNLSTMSeizureModel:
     
     def build_model(self):
         """Build CNN + LSTM architecture"""
-        model = models.Sequential([
+        model = self.create_network()
+        
+        # Compile model
+        model.compile(
+            optimizer='adam',
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        
+        self.model = model
+        return model
+    
+    def create_network(self):
+        """Create the (uncompiled) CNN + LSTM layer stack"""
+        return models.Sequential([
             # CNN layers for feature extraction
             layers.Conv1D(64, kernel_size=3, activation='relu', input_shape=self.input_shape),
             layers.BatchNormalization(),
@@ -80,16 +94,6 @@ class CNNLSTMSeizureModel:
             
             layers.Dense(self.num_classes, activation='softmax')
         ])
-        
-        # Compile model
-        model.compile(
-            optimizer='adam',
-            loss='sparse_categorical_crossentropy',
-            metrics=['accuracy']
-        )
-        
-        self.model = model
-        return model
     
     def prepare_data(self, X, y, test_size=0.2):
         """Prepare and reshape data for CNN-LSTM"""
@@ -162,6 +166,10 @@ class CNNLSTMSeizureModel:
         
         return predicted_classes, predictions
     
+    def compile_for_serving(self, precision='float32', batch_buckets=(1, 8, 32, 128, 512)):
+        """Create an XLA-compiled predictor for low-latency serving"""
+        return CompiledCNNLSTMPredictor(self, precision=precision, batch_buckets=batch_buckets)
+    
     def save_model(self, model_dir='models'):
         """Save model and scaler"""
         os.makedirs(model_dir, exist_ok=True)
@@ -177,6 +185,68 @@ class CNNLSTMSeizureModel:
         print(f"\nModel saved to: {model_path}")
         print(f"Scaler saved to: {scaler_path}")
     
+    def export_tflite(self, model_dir='models', quantize=None, calibration_data=None,
+                      num_calibration_samples=200, batch_size=1):
+        """
+        Export model to TensorFlow Lite for serving without TensorFlow
+        
+        Args:
+            model_dir: Directory to write the .tflite file and scaler to
+            quantize: None (float32), 'dynamic' (int8 weights) or 'int8'
+                (int8 weights and activations calibrated on calibration_data)
+            calibration_data: Scaled and reshaped training windows, required for 'int8'
+            num_calibration_samples: Number of windows sampled for calibration
+            batch_size: Fixed batch size of the exported graph
+        """
+        from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+        
+        if quantize not in (None, 'dynamic', 'int8'):
+            raise ValueError("quantize must be None, 'dynamic' or 'int8'")
+        if quantize == 'int8' and calibration_data is None:
+            raise ValueError("calibration_data is required for int8 quantization")
+        
+        os.makedirs(model_dir, exist_ok=True)
+        model = self.model
+        timesteps = model.input_shape[1:]
+        
+        # The LSTM loop only lowers to TFLite builtins with a static batch
+        # size and frozen weights
+        @tf.function(input_signature=[tf.TensorSpec((batch_size,) + tuple(timesteps), tf.float32)])
+        def serve(inputs):
+            return model(inputs, training=False)
+        
+        frozen = convert_variables_to_constants_v2(serve.get_concrete_function())
+        converter = tf.lite.TFLiteConverter.from_concrete_functions([frozen])
+        
+        if quantize is not None:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        
+        if quantize == 'int8':
+            calibration_data = np.asarray(calibration_data, dtype=np.float32)
+            rng = np.random.default_rng(42)
+            n_samples = min(num_calibration_samples, len(calibration_data))
+            sample = calibration_data[rng.choice(len(calibration_data), n_samples, replace=False)]
+            
+            def representative_dataset():
+                for start in range(0, len(sample) - batch_size + 1, batch_size):
+                    yield [sample[start:start + batch_size]]
+            
+            converter.representative_dataset = representative_dataset
+        
+        tflite_model = converter.convert()
+        
+        tflite_path = os.path.join(model_dir, 'cnn_lstm_model.tflite')
+        with open(tflite_path, 'wb') as f:
+            f.write(tflite_model)
+        
+        scaler_path = os.path.join(model_dir, 'cnn_lstm_scaler.pkl')
+        joblib.dump(self.scaler, scaler_path)
+        
+        print(f"\nTFLite model saved to: {tflite_path} ({len(tflite_model) / 1024:.1f} KB)")
+        print(f"Scaler saved to: {scaler_path}")
+        
+        return tflite_path
+    
     def load_model(self, model_dir='models'):
         """Load saved model and scaler"""
         model_path = os.path.join(model_dir, 'cnn_lstm_model.h5')
@@ -188,6 +258,127 @@ class CNNLSTMSeizureModel:
         print("Model and scaler loaded successfully!")
 
 
+class CompiledCNNLSTMPredictor:
+    """
+    XLA-compiled inference path for a trained CNNLSTMSeizureModel
+    Requests are padded up to a fixed set of batch buckets so every call
+    hits an already-traced graph instead of Keras' eager predict loop
+    """
+    
+    SUPPORTED_PRECISIONS = ('float32', 'bfloat16', 'float16')
+    
+    def __init__(self, seizure_model, precision='float32', batch_buckets=(1, 8, 32, 128, 512)):
+        """
+        Initialize compiled predictor
+        
+        Args:
+            seizure_model: Trained CNNLSTMSeizureModel (model and scaler fitted)
+            precision: Compute precision ('float32', 'bfloat16' or 'float16')
+            batch_buckets: Batch sizes requests are padded up to
+        """
+        if not TENSORFLOW_AVAILABLE:
+            raise ImportError("TensorFlow is required for CNN-LSTM model")
+        if seizure_model.model is None:
+            raise ValueError("Model must be trained or loaded before compiling for serving")
+        if precision not in self.SUPPORTED_PRECISIONS:
+            raise ValueError(f"Unsupported precision. Supported: {self.SUPPORTED_PRECISIONS}")
+        
+        self.seizure_model = seizure_model
+        self.scaler = seizure_model.scaler
+        self.input_shape = tuple(seizure_model.model.input_shape[1:])
+        self.batch_buckets = tuple(sorted(set(batch_buckets)))
+        self.precision = precision
+        self.serving_model = None
+        self._functions = {}
+        
+        try:
+            self._build(precision)
+        except Exception as e:
+            if precision == 'float32':
+                raise
+            # Reduced precision kernels are not available on every CPU
+            print(f"{precision} inference not available ({str(e)}), falling back to float32")
+            self._build('float32')
+    
+    def _build(self, precision):
+        """Create the serving network and trace one function per bucket"""
+        self.precision = precision
+        self.serving_model = self._create_serving_model(precision)
+        self._functions = {}
+        for bucket in self.batch_buckets:
+            self._functions[bucket] = self._make_function(bucket)
+        
+        # Trace and compile the smallest bucket eagerly so unsupported
+        # precisions fail here rather than on the first request
+        smallest = self.batch_buckets[0]
+        self._functions[smallest](tf.zeros((smallest,) + self.input_shape, dtype=tf.float32))
+    
+    def _create_serving_model(self, precision):
+        """Copy trained weights into a network built under the requested dtype policy"""
+        if precision == 'float32':
+            return self.seizure_model.model
+        
+        previous_policy = keras.mixed_precision.global_policy()
+        keras.mixed_precision.set_global_policy(f'mixed_{precision}')
+        try:
+            network = self.seizure_model.create_network()
+        finally:
+            keras.mixed_precision.set_global_policy(previous_policy)
+        
+        network.set_weights(self.seizure_model.model.get_weights())
+        return network
+    
+    def _make_function(self, bucket):
+        """Wrap the forward pass in a jit-compiled function with a fixed signature"""
+        serving_model = self.serving_model
+        
+        @tf.function(
+            jit_compile=True,
+            input_signature=[tf.TensorSpec((bucket,) + self.input_shape, tf.float32)]
+        )
+        def forward(inputs):
+            return tf.cast(serving_model(inputs, training=False), tf.float32)
+        
+        return forward
+    
+    def warmup(self):
+        """Compile every bucket ahead of the first request"""
+        for bucket, function in self._functions.items():
+            function(tf.zeros((bucket,) + self.input_shape, dtype=tf.float32))
+    
+    def predict_scaled(self, X_reshaped):
+        """Run already scaled and reshaped inputs through the compiled buckets"""
+        X_reshaped = np.asarray(X_reshaped, dtype=np.float32)
+        n_samples = X_reshaped.shape[0]
+        largest = self.batch_buckets[-1]
+        outputs = []
+        
+        for start in range(0, n_samples, largest):
+            chunk = X_reshaped[start:start + largest]
+            size = chunk.shape[0]
+            bucket = next(b for b in self.batch_buckets if b >= size)
+            
+            if bucket > size:
+                padding = np.zeros((bucket - size,) + self.input_shape, dtype=np.float32)
+                chunk = np.concatenate([chunk, padding])
+            
+            outputs.append(self._functions[bucket](chunk).numpy()[:size])
+        
+        if not outputs:
+            return np.zeros((0, self.seizure_model.num_classes), dtype=np.float32)
+        return np.concatenate(outputs)
+    
+    def predict(self, X):
+        """Make predictions (same contract as CNNLSTMSeizureModel.predict)"""
+        X_scaled = self.scaler.transform(X)
+        X_reshaped = X_scaled.reshape(X_scaled.shape[0], -1, 1)
+        
+        predictions = self.predict_scaled(X_reshaped)
+        predicted_classes = np.argmax(predictions, axis=1)
+        
+        return predicted_classes, predictions
+
+
 def train_cnn_lstm_model(dataset_path='datasets/seizure_dataset.csv'):
     """
     Complete training pipeline for CNN-LSTM model
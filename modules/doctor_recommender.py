@@ -1,22 +1,542 @@
 """
 Module 6: Doctor Recommender
-Recommends neurologists based on location and specialization
+Recommends neurologists based on location and specialization, and finds
+the nearest ones to a point with a KD-tree built when the database loads.
+The directory is kept in compact columns with pre-serialized JSON, and
+changed rows of its CSV are reloaded in the background.
 """
 import pandas as pd
+import numpy as np
+import copy
+import hashlib
+import io
+import json
 import os
-from typing import List, Dict
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Sequence, Tuple
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.trigram_index import TrigramIndex
+
+# Fields of each doctor in results
+DOCTOR_COLUMNS = ('name', 'specialization', 'hospital', 'location', 'phone',
+                  'experience_years', 'rating', 'accepts_emergency')
+
+# Fields the fuzzy search and autocomplete look in
+SEARCH_FIELDS = ('name', 'hospital', 'location')
+
+# Bytes of the doctor CSV split into lines per step while reloading
+SPLIT_BLOCK_BYTES = 1 << 20
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distance over which a doctor's score falls by a factor of e (score = rating * exp(-km / scale))
+DISTANCE_SCALE_KM = 50.0
+
+# Coordinates for location strings in databases without latitude/longitude columns
+CITY_COORDINATES = {
+    'New York, NY': (40.7128, -74.0060), 'Los Angeles, CA': (34.0522, -118.2437),
+    'Chicago, IL': (41.8781, -87.6298), 'Houston, TX': (29.7604, -95.3698),
+    'Phoenix, AZ': (33.4484, -112.0740), 'Philadelphia, PA': (39.9526, -75.1652),
+    'San Antonio, TX': (29.4241, -98.4936), 'San Diego, CA': (32.7157, -117.1611),
+    'Dallas, TX': (32.7767, -96.7970), 'San Jose, CA': (37.3382, -121.8863),
+    'Austin, TX': (30.2672, -97.7431), 'Jacksonville, FL': (30.3322, -81.6557),
+    'Columbus, OH': (39.9612, -82.9988), 'Charlotte, NC': (35.2271, -80.8431),
+    'Seattle, WA': (47.6062, -122.3321), 'Denver, CO': (39.7392, -104.9903),
+    'Boston, MA': (42.3601, -71.0589), 'Nashville, TN': (36.1627, -86.7816),
+    'Portland, OR': (45.5152, -122.6784), 'Atlanta, GA': (33.7490, -84.3880)
+}
+
+
+def unit_vectors(latitude, longitude) -> np.ndarray:
+    """
+    Points on the unit sphere, (n, 3); straight-line (chord) distance between
+    them orders pairs exactly as great-circle distance does, so a Euclidean
+    KD-tree over them answers haversine nearest-neighbour queries
+    """
+    latitude, longitude = np.radians(latitude), np.radians(longitude)
+    return np.column_stack([np.cos(latitude) * np.cos(longitude),
+                            np.cos(latitude) * np.sin(longitude),
+                            np.sin(latitude)])
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+
+
+def km_to_chord(km):
+    return 2 * np.sin(np.minimum(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+class DoctorStore:
+    """
+    The directory in compact columns: categorical codes for specialization,
+    hospital and location, fixed-width rating and experience arrays, an
+    emergency bitmask, and the name and phone of every doctor pre-serialized
+    as JSON in one ASCII buffer. A JSON response is put together from
+    these cached bytes without building a dict per doctor.
+    """
+    
+    CATEGORIES = ('specialization', 'hospital', 'location')
+    
+    def __init__(self, df: pd.DataFrame):
+        self.n = len(df)
+        self.rating = df['rating'].to_numpy(float)
+        # Missing years count as none rather than failing the load
+        experience = pd.to_numeric(df['experience_years'], errors='coerce').fillna(0).to_numpy(np.int64)
+        self.experience = experience.astype(np.int16 if np.abs(experience).max(initial=0) < 2 ** 15 else np.int32)
+        self.emergency_bits = np.packbits(df['accepts_emergency'].eq(True).to_numpy())
+        
+        # Per field: codes, values and values as JSON; code -1 (missing) indexes the trailing None
+        self.codes, self.values, self.values_json = {}, {}, {}
+        for field in self.CATEGORIES:
+            categorical = pd.Categorical(df[field])
+            self.codes[field] = categorical.codes
+            self.values[field] = list(categorical.categories) + [None]
+            self.values_json[field] = [json.dumps(value).encode() for value in self.values[field]]
+        self._masks = {}
+        
+        # '"name":...,"phone":...' per doctor; json.dumps escapes to ASCII,
+        # so character and byte offsets agree
+        fragments = ['"name":' + name + ',"phone":' + phone
+                     for name, phone in zip(self._json_strings(df['name']), self._json_strings(df['phone']))]
+        self.fragments = ''.join(fragments).encode('ascii')
+        lengths = np.fromiter(map(len, fragments), dtype=np.int64, count=self.n)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(
+            np.uint32 if len(self.fragments) < 2 ** 32 else np.int64)
+        
+        # Best rated, then most experienced, first (ties keep file order, as a stable sort would)
+        self.ranking = np.lexsort((-self.experience, -self.rating)).astype(np.int32)
+    
+    @staticmethod
+    def _json_strings(column: pd.Series) -> np.ndarray:
+        """JSON for each value, serializing every distinct value once"""
+        codes, uniques = pd.factorize(column)
+        encoded = np.array(list(map(json.dumps, uniques.to_numpy(object).tolist())) + ['null'], dtype=object)
+        return encoded[codes]
+    
+    def nbytes(self) -> int:
+        return (self.rating.nbytes + self.experience.nbytes + self.emergency_bits.nbytes + self.ranking.nbytes
+                + sum(codes.nbytes for codes in self.codes.values()) + len(self.fragments) + self.offsets.nbytes)
+    
+    def emergency(self, rows: np.ndarray) -> np.ndarray:
+        return ((self.emergency_bits[rows >> 3] >> (7 - (rows & 7))) & 1).astype(bool)
+    
+    def category_mask(self, field: str, pattern: Optional[str]) -> Optional[np.ndarray]:
+        """
+        Per-code match of a case-insensitive str.contains search, evaluated
+        once per distinct value and cached (None: no filter)
+        """
+        if not pattern:
+            return None
+        key = (field, pattern)
+        mask = self._masks.get(key)
+        if mask is None:
+            if len(self._masks) >= 256:
+                self._masks.clear()
+            values = pd.Series(self.values[field][:-1], dtype=object)
+            matches = values.str.contains(pattern, case=False, na=False).to_numpy(bool)
+            # Another thread may clear the cache before this one reads it back
+            mask = self._masks[key] = np.append(matches, False)
+        return mask
+    
+    def select(self, emergency: bool = False, masks: Sequence = (), top_n: int = 5) -> np.ndarray:
+        """
+        Rows of the top_n best-ranked doctors passing the filters
+        
+        Args:
+            emergency: Only doctors accepting emergencies
+            masks: (field, category_mask) pairs
+            top_n: Number of rows to return
+        """
+        masks = [(field, mask) for field, mask in masks if mask is not None]
+        if not emergency and not masks:
+            return self.ranking[:max(top_n, 0)]
+        
+        # Scan the ranking in growing blocks; a common filter stops in the first
+        found, count, start, size = [], 0, 0, max(64 * top_n, 4096)
+        while start < self.n and count < top_n:
+            rows = self.ranking[start:start + size]
+            keep = self.emergency(rows) if emergency else np.ones(len(rows), dtype=bool)
+            for field, mask in masks:
+                keep &= mask[self.codes[field][rows]]
+            hits = rows[keep][:top_n - count]
+            found.append(hits)
+            count += len(hits)
+            start, size = start + size, size * 4
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int32)
+    
+    def doctor(self, row: int) -> Dict:
+        """Result dictionary for one row"""
+        doctor = json.loads(b'{' + self.fragments[self.offsets[row]:self.offsets[row + 1]] + b'}')
+        doctor.update({field: self.values[field][self.codes[field][row]] for field in self.CATEGORIES})
+        doctor.update({
+            'experience_years': int(self.experience[row]),
+            'rating': float(self.rating[row]),
+            'accepts_emergency': bool(self.emergency(np.array([row]))[0])
+        })
+        return {column: doctor[column] for column in DOCTOR_COLUMNS}
+    
+    def to_json(self, rows: np.ndarray) -> bytes:
+        """
+        JSON array of the doctors at rows, as jsonify would write their
+        dicts (keys sorted, compact), joined from the cached bytes
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return b'[]'
+        emergency = self.emergency(rows).tolist()
+        experience = self.experience[rows].tolist()
+        rating = self.rating[rows].tolist()
+        hospital, location, specialization = (
+            [self.values_json[field][code] for code in self.codes[field][rows].tolist()]
+            for field in ('hospital', 'location', 'specialization'))
+        starts, ends = self.offsets[rows].tolist(), self.offsets[rows + 1].tolist()
+        
+        parts = []
+        for i in range(len(rows)):
+            parts.append(b'{"accepts_emergency":%s,"experience_years":%d,"hospital":%s,"location":%s,%s,'
+                         b'"rating":%s,"specialization":%s}' % (
+                             b'true' if emergency[i] else b'false', experience[i], hospital[i], location[i],
+                             self.fragments[starts[i]:ends[i]],
+                             repr(rating[i]).encode() if np.isfinite(rating[i]) else b'null',
+                             specialization[i]))
+        return b'[' + b','.join(parts) + b']'
+    
+    def to_frame(self) -> pd.DataFrame:
+        """The stored columns as a DataFrame, in file order"""
+        doctors = json.loads(b'[{' + b'},{'.join(
+            self.fragments[start:end] for start, end in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())
+        ) + b'}]') if self.n else []
+        df = pd.DataFrame(doctors, columns=['name', 'phone'])
+        for field in self.CATEGORIES:
+            df[field] = pd.Categorical.from_codes(self.codes[field], self.values[field][:-1])
+        df['experience_years'] = self.experience
+        df['rating'] = self.rating
+        df['accepts_emergency'] = self.emergency(np.arange(self.n))
+        return df[list(DOCTOR_COLUMNS)]
+    
+    @classmethod
+    def merge(cls, old: 'DoctorStore', old_rows: np.ndarray, delta: 'DoctorStore') -> 'DoctorStore':
+        """
+        Store whose row i is old's row old_rows[i], or the next row of delta
+        where old_rows is -1. Unchanged doctors keep their serialized bytes,
+        so only the delta is encoded.
+        """
+        store = cls.__new__(cls)
+        store.n = len(old_rows)
+        kept = old_rows >= 0
+        old_rows = old_rows[kept]
+        
+        def combine(old_values, delta_values, dtype=None):
+            values = np.empty(store.n, dtype=dtype or np.result_type(old_values, delta_values))
+            values[kept], values[~kept] = old_values[old_rows], delta_values
+            return values
+        
+        store.rating = combine(old.rating, delta.rating)
+        store.experience = combine(old.experience, delta.experience)
+        store.emergency_bits = np.packbits(combine(old.emergency(np.arange(old.n)),
+                                                   delta.emergency(np.arange(delta.n))))
+        
+        store.codes, store.values, store.values_json = {}, {}, {}
+        for field in cls.CATEGORIES:
+            # Delta values join the old ones, then values no doctor has any more are dropped
+            values, values_json = old.values[field][:-1], old.values_json[field][:-1]
+            position = {value: code for code, value in enumerate(values)}
+            added = []
+            for value in delta.values[field][:-1]:
+                if value not in position:
+                    position[value] = len(values) + len(added)
+                    added.append(value)
+            delta_map = np.array([position[value] for value in delta.values[field][:-1]] + [-1], dtype=np.int64)
+            values = values + added
+            values_json = values_json + [json.dumps(value).encode() for value in added]
+            codes = combine(old.codes[field].astype(np.int64), delta_map[delta.codes[field]])
+            
+            used = np.bincount(codes[codes >= 0], minlength=len(values)) > 0
+            if not used.all():
+                renumber = np.cumsum(used) - 1
+                codes = np.where(codes >= 0, renumber[np.maximum(codes, 0)], -1)
+                values = [value for value, keep in zip(values, used) if keep]
+                values_json = [value for value, keep in zip(values_json, used) if keep]
+            store.codes[field] = codes.astype(np.int8 if len(values) < 2 ** 7 else
+                                              np.int16 if len(values) < 2 ** 15 else np.int32)
+            store.values[field] = values + [None]
+            store.values_json[field] = values_json + [b'null']
+        store._masks = {}
+        
+        # Runs of consecutive old rows (or delta rows) copy as one slice
+        starts = combine(old.offsets[:-1].astype(np.int64), delta.offsets[:-1].astype(np.int64))
+        ends = combine(old.offsets[1:].astype(np.int64), delta.offsets[1:].astype(np.int64))
+        source = combine(np.zeros(old.n, dtype=np.int8), np.ones(delta.n, dtype=np.int8))
+        breaks = np.flatnonzero((source[1:] != source[:-1]) | (starts[1:] != ends[:-1])) + 1
+        run_starts, run_ends = np.concatenate([[0], breaks]), np.concatenate([breaks, [store.n]])
+        buffers = (old.fragments, delta.fragments)
+        store.fragments = b''.join(buffers[source[first]][starts[first]:ends[last - 1]]
+                                   for first, last in zip(run_starts.tolist(), run_ends.tolist()) if last > first)
+        store.offsets = np.concatenate([[0], np.cumsum(ends - starts)]).astype(
+            np.uint32 if len(store.fragments) < 2 ** 32 else np.int64)
+        
+        store.ranking = np.lexsort((-store.experience, -store.rating)).astype(np.int32)
+        return store
+
+
+def coordinates(df: pd.DataFrame):
+    """(latitude, longitude) of each row; rows without them fall back to their city's, if it is known"""
+    latitude = df['latitude'].to_numpy(float) if 'latitude' in df.columns else np.full(len(df), np.nan)
+    longitude = df['longitude'].to_numpy(float) if 'longitude' in df.columns else np.full(len(df), np.nan)
+    missing = np.isnan(latitude) | np.isnan(longitude)
+    if missing.any():
+        city = df['location'].to_numpy()[missing]
+        latitude, longitude = latitude.copy(), longitude.copy()
+        latitude[missing] = [CITY_COORDINATES.get(c, (np.nan, np.nan))[0] for c in city]
+        longitude[missing] = [CITY_COORDINATES.get(c, (np.nan, np.nan))[1] for c in city]
+    return latitude, longitude
+
+
+class GeoIndex:
+    """KD-trees over doctors with coordinates: all of them, and the emergency-capable ones"""
+    
+    def __init__(self, latitude: np.ndarray, longitude: np.ndarray, store: DoctorStore):
+        from scipy.spatial import cKDTree
+        
+        points = unit_vectors(latitude, longitude)
+        located = ~(np.isnan(latitude) | np.isnan(longitude))
+        emergency = store.emergency(np.arange(store.n))
+        
+        self.store = store
+        self.latitude, self.longitude = latitude, longitude
+        self.rating = store.rating
+        self.max_rating = float(np.nanmax(self.rating)) if store.n else 0.0
+        self.specialization_codes = store.codes['specialization']
+        n_specializations = len(store.values['specialization']) - 1
+        
+        self.trees = {}
+        for key, rows in (('all', np.flatnonzero(located)), ('emergency', np.flatnonzero(located & emergency))):
+            tree = cKDTree(points[rows]) if len(rows) else None
+            # Share of each specialization among the tree's doctors, to size the first search
+            share = np.bincount(self.specialization_codes[rows] + 1, minlength=n_specializations + 1)
+            self.trees[key] = (tree, rows, share[1:] / max(len(rows), 1))
+    
+    def specialization_mask(self, specialization: Optional[str]) -> Optional[np.ndarray]:
+        """Per-category match of the same case-insensitive search recommend_doctors uses (None: no filter)"""
+        return self.store.category_mask('specialization', specialization)
+
+
+class TextIndex:
+    """Trigram indexes over the distinct values of the search fields, with the doctors holding each value"""
+    
+    def __init__(self, df: pd.DataFrame, ranking: np.ndarray, fields: Sequence[str] = SEARCH_FIELDS):
+        """
+        Initialize text index
+        
+        Args:
+            df: Doctor database
+            ranking: Rows best first (DoctorStore.ranking); each value's
+                doctors are listed in this order
+            fields: Fields to index
+        """
+        self.fields = {}
+        for field in fields:
+            codes, values = pd.factorize(df[field])
+            self._set_field(field, TrigramIndex(values), codes, ranking)
+    
+    def _set_field(self, field: str, index: TrigramIndex, codes: np.ndarray, ranking: np.ndarray):
+        """Index a field whose rows hold index.terms[codes] (-1: no value)"""
+        counts = np.bincount(codes[codes >= 0], minlength=len(index))
+        index.weights = counts.astype(float)
+        ranked = ranking[codes[ranking] >= 0]
+        rows = ranked[np.argsort(codes[ranked], kind='stable')]
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.fields[field] = (index, rows, offsets)
+    
+    def codes(self, field: str, n_rows: int) -> np.ndarray:
+        """Term of each row (-1: no value)"""
+        index, rows, offsets = self.fields[field]
+        codes = np.full(n_rows, -1, dtype=np.int64)
+        codes[rows] = np.repeat(np.arange(len(index)), np.diff(offsets))
+        return codes
+    
+    def merge(self, n_old: int, old_rows: np.ndarray, delta: pd.DataFrame, ranking: np.ndarray) -> 'TextIndex':
+        """
+        Index for the rows of DoctorStore.merge. A field's trigram index is
+        reused when its set of values is unchanged (only the counts are
+        updated), and rebuilt otherwise; rebuilt lists the rebuilt fields.
+        """
+        text = TextIndex.__new__(TextIndex)
+        text.fields, text.rebuilt = {}, []
+        kept = old_rows >= 0
+        for field, (index, _, _) in self.fields.items():
+            position = {term: code for code, term in enumerate(index.terms)}
+            delta_codes, delta_values = pd.factorize(delta[field])
+            added = [value for value in delta_values if value not in position]
+            position.update((value, len(index) + i) for i, value in enumerate(added))
+            delta_map = np.array([position[value] for value in delta_values] + [-1], dtype=np.int64)
+            
+            codes = np.empty(len(old_rows), dtype=np.int64)
+            codes[kept] = self.codes(field, n_old)[old_rows[kept]]
+            codes[~kept] = delta_map[delta_codes]
+            
+            used = np.bincount(codes[codes >= 0], minlength=len(index) + len(added)) > 0
+            if added or not used.all():
+                terms = [term for term, keep in zip(index.terms + added, used) if keep]
+                renumber = np.cumsum(used) - 1
+                codes = np.where(codes >= 0, renumber[np.maximum(codes, 0)], -1)
+                index = TrigramIndex(terms)
+                text.rebuilt.append(field)
+            else:
+                # Shares the trigram postings with the old snapshot; only weights differ
+                index = copy.copy(index)
+            text._set_field(field, index, codes, ranking)
+        return text
+    
+    def index(self, field: str) -> TrigramIndex:
+        if field not in self.fields:
+            raise ValueError(f"Unknown search field: {field} (expected one of {', '.join(self.fields)})")
+        return self.fields[field][0]
+    
+    def rows(self, field: str, term: int) -> np.ndarray:
+        _, rows, offsets = self.fields[field]
+        return rows[offsets[term]:offsets[term + 1]]
+
+
+def split_csv_lines(data: bytes) -> Optional[Tuple[bytes, List[bytes], np.ndarray]]:
+    """
+    (header, data lines, 64-bit hash of each line) of a CSV file, or None
+    when a quoted field spans lines, so lines are not rows
+    """
+    if b'"' in data:
+        # A newline after an odd number of quotes is inside a field
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        quotes_before = np.searchsorted(np.flatnonzero(buffer == ord('"')), np.flatnonzero(buffer == ord('\n')))
+        if (quotes_before & 1).any():
+            return None
+    # Split and hash in blocks: each call holds the GIL, and queries on
+    # other threads should not wait for a whole file's worth
+    lines, start = [], 0
+    while start < len(data):
+        end = data.find(b'\n', start + SPLIT_BLOCK_BYTES)
+        end = len(data) if end < 0 else end + 1
+        lines.extend(filter(None, data[start:end].replace(b'\r\n', b'\n').split(b'\n')))
+        start = end
+    if not lines:
+        return None
+    rows = lines[1:]
+    # Python's bytes hash is salted per process, which is fine: hashes are
+    # only compared with ones this process computed
+    block = SPLIT_BLOCK_BYTES // 128
+    hashes = [np.fromiter(map(hash, rows[i:i + block]), dtype=np.int64) for i in range(0, len(rows), block)]
+    return lines[0], rows, np.concatenate(hashes) if hashes else np.empty(0, dtype=np.int64)
+
+
+class DoctorSnapshot:
+    """
+    One version of the directory: the store and the indexes over its rows.
+    Queries read a snapshot as a whole, so a reload can build the next one
+    in the background and swap it in with one assignment.
+    """
+    
+    def __init__(self, store: DoctorStore, geo_index: GeoIndex, text_index: TextIndex,
+                 header: Optional[bytes] = None, line_hashes: Optional[np.ndarray] = None,
+                 text_columns: Sequence[str] = ()):
+        """
+        Initialize snapshot
+        
+        Args:
+            store: Doctor columns
+            geo_index: Spatial index over the store's rows
+            text_index: Search index over the store's rows
+            header: CSV header the rows were read with
+            line_hashes: Hash of each row's CSV line, to find the rows a
+                changed file touches (None: the next reload reads it whole)
+            text_columns: Columns the whole file was read as text, so the
+                changed rows are parsed with the same types
+        """
+        self.store = store
+        self.geo_index = geo_index
+        self.text_index = text_index
+        self.header = header
+        self.line_hashes = line_hashes
+        self.text_columns = tuple(text_columns)
+    
+    @classmethod
+    def build(cls, df: pd.DataFrame, header: Optional[bytes] = None,
+              line_hashes: Optional[np.ndarray] = None) -> 'DoctorSnapshot':
+        store = DoctorStore(df)
+        text_columns = [column for column in df.columns if not pd.api.types.is_numeric_dtype(df[column])]
+        return cls(store, GeoIndex(*coordinates(df), store), TextIndex(df, store.ranking),
+                   header, line_hashes, text_columns)
+    
+    def merge(self, old_rows: np.ndarray, delta: pd.DataFrame, line_hashes: np.ndarray) -> 'DoctorSnapshot':
+        """
+        Snapshot whose row i is this one's row old_rows[i], or the next row
+        of delta where old_rows is -1; only the delta rows are parsed and
+        serialized, and unchanged search fields keep their trigram index
+        """
+        store = DoctorStore.merge(self.store, old_rows, DoctorStore(delta))
+        kept = old_rows >= 0
+        latitude, longitude = np.empty(store.n), np.empty(store.n)
+        latitude[kept] = self.geo_index.latitude[old_rows[kept]]
+        longitude[kept] = self.geo_index.longitude[old_rows[kept]]
+        latitude[~kept], longitude[~kept] = coordinates(delta)
+        text_index = self.text_index.merge(self.store.n, old_rows, delta, store.ranking)
+        return DoctorSnapshot(store, GeoIndex(latitude, longitude, store), text_index,
+                              self.header, line_hashes, self.text_columns)
 
 
 class DoctorRecommender:
-    def __init__(self, data_source='local'):
+    def __init__(self, data_source='local', csv_path: str = 'datasets/neurologists.csv'):
         """
         Initialize doctor recommender
         data_source: 'local' for CSV file, 'web' for web scraping (future)
+        csv_path: Doctor database; reload() and the watcher pick up changes to it
         """
         self.data_source = data_source
-        self.doctors_df = None
+        self.csv_path = csv_path
+        self.snapshot = None
+        self.last_reload = None
+        self._file_signature = None
+        self._file_digest = None
+        self._reload_lock = threading.Lock()
+        self._watcher_stop = threading.Event()
+        self._watcher = None
         self.load_doctors()
     
+    @property
+    def store(self) -> Optional[DoctorStore]:
+        return self.snapshot.store if self.snapshot is not None else None
+    
+    @property
+    def geo_index(self) -> Optional[GeoIndex]:
+        return self.snapshot.geo_index if self.snapshot is not None else None
+    
+    @property
+    def text_index(self) -> Optional[TextIndex]:
+        return self.snapshot.text_index if self.snapshot is not None else None
+    
+    @property
+    def doctors_df(self) -> Optional[pd.DataFrame]:
+        """
+        The database as a DataFrame, rebuilt from the store on each access
+        (the loaded frame is not kept; see DoctorStore)
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        df = snapshot.store.to_frame()
+        df['latitude'], df['longitude'] = snapshot.geo_index.latitude, snapshot.geo_index.longitude
+        return df
+    
+    @doctors_df.setter
+    def doctors_df(self, df: pd.DataFrame):
+        """Replacing the database rebuilds the store and the spatial and text indexes once, here, instead of per query"""
+        self.snapshot = DoctorSnapshot.build(df) if df is not None else None
+    
     def load_doctors(self):
         """Load doctor database"""
         if self.data_source == 'local':
@@ -27,16 +547,129 @@ class DoctorRecommender:
     
     def load_local_database(self):
         """Load doctors from local CSV or create sample data"""
-        csv_path = 'datasets/neurologists.csv'
-        
-        if os.path.exists(csv_path):
-            self.doctors_df = pd.read_csv(csv_path)
-            print(f"Loaded {len(self.doctors_df)} doctors from database")
+        if os.path.exists(self.csv_path):
+            self.reload(force=True)
+            print(f"Loaded {self.store.n} doctors from database")
         else:
             # Create sample database
             self.doctors_df = self.create_sample_database()
             print("Using sample doctor database")
     
+    def reload(self, force: bool = False) -> Dict:
+        """
+        Pick up changes to the CSV without interrupting queries
+        
+        The file is read again when its modification time or size changed
+        (or with force) and its content hash differs. Its lines are matched
+        to the current rows by hash, so only new or edited lines are parsed.
+        The next snapshot reuses the unchanged doctors' serialized columns
+        and the search indexes of fields whose values did not change, and
+        replaces the current one with one assignment: a query that already
+        started finishes on the old snapshot.
+        
+        Returns:
+            Dictionary with changed, and for a change: doctors, added
+            (rows parsed), removed, incremental, rebuilt (search fields
+            whose trigram index was rebuilt) and seconds
+        """
+        with self._reload_lock:
+            try:
+                stat = os.stat(self.csv_path)
+            except FileNotFoundError:
+                return {'changed': False}
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._file_signature and not force:
+                return {'changed': False}
+            
+            start = time.perf_counter()
+            with open(self.csv_path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._file_digest and not force:
+                self._file_signature = signature
+                return {'changed': False}
+            
+            previous = self.snapshot
+            snapshot, result = self._next_snapshot(previous, data)
+            self.snapshot = snapshot
+            self._file_signature, self._file_digest = signature, digest
+            result.update(changed=True, doctors=snapshot.store.n,
+                          seconds=round(time.perf_counter() - start, 3), time=time.time())
+            self.last_reload = result
+            return result
+    
+    def _next_snapshot(self, previous: Optional[DoctorSnapshot], data: bytes) -> Tuple[DoctorSnapshot, Dict]:
+        """Snapshot for the file content, merged into previous when only some lines changed"""
+        lines = split_csv_lines(data)
+        if (lines is not None and previous is not None and previous.line_hashes is not None
+                and lines[0] == previous.header):
+            header, rows, hashes = lines
+            # Old row of each line with the same hash, or -1 (repeated lines share the first)
+            first = np.flatnonzero(~pd.Index(previous.line_hashes).duplicated())
+            position = pd.Index(previous.line_hashes[first]).get_indexer(hashes)
+            found = position >= 0
+            old_rows = np.full(len(hashes), -1, dtype=np.int64)
+            old_rows[found] = first[position[found]]
+            
+            changed = np.flatnonzero(~found)
+            if len(changed) < len(rows):
+                # Types are inferred from a few lines here, so text columns
+                # stay text (a phone of only digits is not a number); a
+                # column that no longer parses as numbers needs the whole file
+                delta = pd.read_csv(io.BytesIO(b'\n'.join([header] + [rows[i] for i in changed.tolist()])),
+                                    dtype=dict.fromkeys(previous.text_columns, str))
+                widened = [column for column in delta.columns if column not in previous.text_columns
+                           and not pd.api.types.is_numeric_dtype(delta[column])]
+                if len(delta) == len(changed) and not widened:
+                    snapshot = previous.merge(old_rows, delta, hashes)
+                    removed = previous.store.n - np.count_nonzero(np.bincount(old_rows[found], minlength=previous.store.n))
+                    return snapshot, {'added': len(changed), 'removed': int(removed), 'incremental': True,
+                                      'rebuilt': snapshot.text_index.rebuilt}
+        
+        df = pd.read_csv(io.BytesIO(data))
+        header, hashes = None, None
+        if lines is not None and len(lines[1]) == len(df):
+            header, hashes = lines[0], lines[2]
+        snapshot = DoctorSnapshot.build(df, header, hashes)
+        removed = previous.store.n if previous is not None else 0
+        return snapshot, {'added': len(df), 'removed': removed, 'incremental': False,
+                          'rebuilt': list(snapshot.text_index.fields)}
+    
+    def start_watcher(self, interval_seconds: float = 60.0):
+        """Check the CSV for changes every interval and reload it on a background thread"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self
+        
+        def loop():
+            while not self._watcher_stop.wait(interval_seconds):
+                try:
+                    result = self.reload()
+                    if result['changed']:
+                        print(f"Reloaded doctor database: {result['doctors']} doctors, "
+                              f"{result['added']} added, {result['removed']} removed in {result['seconds']}s")
+                except Exception as e:
+                    # The current snapshot stays in use; a fixed file is picked up on a later check
+                    print(f"Error reloading doctor database: {str(e)}")
+        
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(target=loop, name='doctor-reloader', daemon=True)
+        self._watcher.start()
+        return self
+    
+    def stop_watcher(self):
+        self._watcher_stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+    
+    def get_status(self) -> Dict:
+        return {
+            'doctors': self.store.n if self.store is not None else 0,
+            'csv_path': self.csv_path,
+            'watching': self._watcher is not None and self._watcher.is_alive(),
+            'last_reload': self.last_reload
+        }
+    
     def create_sample_database(self) -> pd.DataFrame:
         """Create sample neurologist database"""
         doctors = [
@@ -160,73 +793,196 @@ class DoctorRecommender:
             emergency: Whether emergency care is needed
             top_n: Number of recommendations to return
         """
-        df = self.doctors_df.copy()
-        
-        # Filter by emergency availability
-        if emergency or risk_level == 'HIGH':
-            df = df[df['accepts_emergency'] == True]
-        
-        # Filter by location if specified
-        if location:
-            df = df[df['location'].str.contains(location, case=False, na=False)]
-        
-        # Filter by specialization if specified
-        if specialization:
-            df = df[df['specialization'].str.contains(specialization, case=False, na=False)]
-        
-        # Sort by rating and experience
-        df = df.sort_values(['rating', 'experience_years'], ascending=[False, False])
-        
-        # Get top N
-        top_doctors = df.head(top_n)
-        
-        # Convert to list of dictionaries
-        recommendations = []
-        for _, doctor in top_doctors.iterrows():
-            recommendations.append({
-                'name': doctor['name'],
-                'specialization': doctor['specialization'],
-                'hospital': doctor['hospital'],
-                'location': doctor['location'],
-                'phone': doctor['phone'],
-                'experience_years': int(doctor['experience_years']),
-                'rating': float(doctor['rating']),
-                'accepts_emergency': bool(doctor['accepts_emergency'])
+        store = self.store
+        rows = self._recommended_rows(store, risk_level, location, specialization, emergency, top_n)
+        return [store.doctor(row) for row in rows.tolist()]
+    
+    def recommend_doctors_json(self,
+                               risk_level: str = None,
+                               location: str = None,
+                               specialization: str = None,
+                               emergency: bool = False,
+                               top_n: int = 5) -> bytes:
+        """recommend_doctors as a JSON array, joined from pre-serialized bytes (for API responses)"""
+        store = self.store
+        rows = self._recommended_rows(store, risk_level, location, specialization, emergency, top_n)
+        return store.to_json(rows)
+    
+    @staticmethod
+    def _recommended_rows(store, risk_level, location, specialization, emergency, top_n) -> np.ndarray:
+        """Best rated, then most experienced, doctors passing the filters"""
+        return store.select(
+            emergency=emergency or risk_level == 'HIGH',
+            masks=[('location', store.category_mask('location', location)),
+                   ('specialization', store.category_mask('specialization', specialization))],
+            top_n=top_n
+        )
+    
+    def nearest_doctors(self,
+                        latitude: float,
+                        longitude: float,
+                        top_n: int = 5,
+                        radius_km: float = None,
+                        specialization: str = None,
+                        emergency: bool = False,
+                        rank_by: str = 'score',
+                        distance_scale_km: float = DISTANCE_SCALE_KM) -> List[Dict]:
+        """
+        Doctors near a point, using the spatial index
+        
+        Args:
+            latitude: Patient latitude in degrees
+            longitude: Patient longitude in degrees
+            top_n: Number of doctors to return
+            radius_km: Only doctors within this distance (None: any distance)
+            specialization: Required specialization (case-insensitive search)
+            emergency: Only doctors accepting emergencies
+            rank_by: 'distance' for the nearest, or 'score' for
+                rating * exp(-distance_km / distance_scale_km)
+            distance_scale_km: How quickly the score falls with distance
+        
+        Returns:
+            Doctors as in recommend_doctors, plus distance_km and score
+        """
+        if rank_by not in ('score', 'distance'):
+            raise ValueError("rank_by must be 'score' or 'distance'")
+        # One snapshot for the whole query, even if a reload swaps in the next
+        snapshot = self.snapshot
+        index = snapshot.geo_index
+        tree, rows, share = index.trees['emergency' if emergency else 'all']
+        if tree is None or top_n <= 0:
+            return []
+        
+        point = unit_vectors(latitude, longitude)[0]
+        max_chord = np.inf if radius_km is None else km_to_chord(radius_km)
+        allowed = index.specialization_mask(specialization)
+        # Enough neighbours for about 4 * top_n matches of the filter
+        selectivity = 1.0 if allowed is None else share[allowed[:-1]].sum()
+        if selectivity == 0:
+            return []
+        k = min(int(max(4 * top_n, 32) / selectivity), len(rows))
+        
+        # Search the k nearest, filter, and widen k until no doctor further
+        # out could still make the top_n (for 'score', a maximum rating at
+        # the k-th distance would have to beat the current top_n-th score)
+        while True:
+            chord, position = tree.query(point, k=k, distance_upper_bound=max_chord)
+            # Neighbours beyond the radius come back as inf
+            found = np.isfinite(np.atleast_1d(chord))
+            distance_km = chord_to_km(np.atleast_1d(chord)[found])
+            candidates = rows[np.atleast_1d(position)[found]]
+            keep = np.ones(len(candidates), dtype=bool)
+            if allowed is not None:
+                keep &= allowed[index.specialization_codes[candidates]]
+            
+            candidates, candidate_km = candidates[keep], distance_km[keep]
+            scores = index.rating[candidates] * np.exp(-candidate_km / distance_scale_km)
+            exhausted = k == len(rows) or not found.all()
+            if len(candidates) >= top_n:
+                if rank_by == 'distance':
+                    break
+                threshold = np.sort(scores)[-top_n]
+                if index.max_rating * np.exp(-distance_km[-1] / distance_scale_km) < threshold:
+                    break
+            if exhausted:
+                break
+            k = min(k * 4, len(rows))
+        
+        order = np.argsort(candidate_km if rank_by == 'distance' else -scores, kind='stable')[:top_n]
+        results = []
+        for i in order:
+            row = candidates[i]
+            doctor = snapshot.store.doctor(row)
+            doctor.update({
+                'latitude': float(index.latitude[row]),
+                'longitude': float(index.longitude[row]),
+                'distance_km': round(float(candidate_km[i]), 2),
+                'score': round(float(scores[i]), 4)
             })
+            results.append(doctor)
         
-        return recommendations
+        return results
     
     def get_emergency_contacts(self) -> List[Dict]:
         """Get emergency neurologist contacts"""
         return self.recommend_doctors(emergency=True, top_n=3)
     
-    def search_by_name(self, name: str) -> List[Dict]:
-        """Search doctors by name"""
-        df = self.doctors_df[
-            self.doctors_df['name'].str.contains(name, case=False, na=False)
-        ]
+    def search_doctors(self, query: str, fields: Sequence[str] = SEARCH_FIELDS, top_n: int = 20) -> List[Dict]:
+        """
+        Typo-tolerant search of names, hospitals and locations
         
-        results = []
-        for _, doctor in df.iterrows():
-            results.append({
-                'name': doctor['name'],
-                'specialization': doctor['specialization'],
-                'hospital': doctor['hospital'],
-                'location': doctor['location'],
-                'phone': doctor['phone'],
-                'experience_years': int(doctor['experience_years']),
-                'rating': float(doctor['rating'])
-            })
+        Values are ranked by edit distance to the query (a query matching one
+        word of a value, such as a last name, counts only its typos), then by
+        trigram similarity; the doctors holding each value follow in order of
+        rating and experience.
+        
+        Args:
+            query: Text to look for, e.g. "jonh smiht" or "bostn"
+            fields: Fields to search
+            top_n: Number of doctors to return
+        
+        Returns:
+            Doctors as in recommend_doctors, plus match_field, match (the
+            matched value) and edit_distance
+        """
+        snapshot = self.snapshot
+        text_index = snapshot.text_index
+        matches = []
+        for field in fields:
+            index = text_index.index(field)
+            for term, distance, similarity in index.search(query, limit=top_n):
+                matches.append((distance, -similarity, -index.weights[term], field, term))
+        matches.sort()
+        
+        results, seen = [], set()
+        for distance, _, _, field, term in matches:
+            for row in text_index.rows(field, term):
+                if len(results) == top_n:
+                    return results
+                if row in seen:
+                    continue
+                seen.add(row)
+                doctor = snapshot.store.doctor(row)
+                doctor.update({
+                    'match_field': field,
+                    'match': text_index.index(field).terms[term],
+                    'edit_distance': distance
+                })
+                results.append(doctor)
         
         return results
     
+    def search_by_name(self, name: str, top_n: int = 20) -> List[Dict]:
+        """Search doctors by name, tolerating typos (see search_doctors)"""
+        return self.search_doctors(name, fields=('name',), top_n=top_n)
+    
+    def autocomplete(self, prefix: str, limit: int = 10, fields: Sequence[str] = SEARCH_FIELDS) -> List[Dict]:
+        """
+        Suggestions for a search box: names, hospitals and locations with a
+        word starting with prefix, those starting with it first, then by
+        number of doctors
+        
+        Returns:
+            List of dictionaries with text, field and doctors (count)
+        """
+        text_index = self.text_index
+        suggestions = []
+        for field in fields:
+            index = text_index.index(field)
+            for term, at_start in index.complete(prefix, limit=limit):
+                suggestions.append((not at_start, -index.weights[term], index.terms[term], field))
+        suggestions.sort()
+        
+        return [{'text': text, 'field': field, 'doctors': int(-weight)}
+                for _, weight, text, field in suggestions[:limit]]
+    
     def get_all_locations(self) -> List[str]:
         """Get all available locations"""
-        return sorted(self.doctors_df['location'].unique().tolist())
+        return sorted(self.store.values['location'][:-1])
     
     def get_all_specializations(self) -> List[str]:
         """Get all specializations"""
-        return sorted(self.doctors_df['specialization'].unique().tolist())
+        return sorted(self.store.values['specialization'][:-1])
     
     def format_recommendation(self, doctor: Dict) -> str:
         """Format doctor recommendation as readable text"""
@@ -275,3 +1031,14 @@ if __name__ == "__main__":
     print("\n3. Location-based (California):")
     ca_doctors = recommender.recommend_doctors(location='CA', top_n=2)
     print(recommender.get_recommendations_text(ca_doctors))
+    
+    # Test 4: Misspelled search and autocomplete
+    print("\n4. Search 'jonson' and autocomplete 'ch':")
+    for doctor in recommender.search_doctors('jonson', top_n=2):
+        print(f"{doctor['name']} - matched {doctor['match_field']} '{doctor['match']}'")
+    print([suggestion['text'] for suggestion in recommender.autocomplete('ch')])
+    
+    # Test 5: Nearest emergency neurologists to Fort Worth, TX
+    print("\n5. Nearest emergency care (Fort Worth, TX):")
+    for doctor in recommender.nearest_doctors(32.7555, -97.3308, top_n=3, emergency=True):
+        print(f"{doctor['name']} - {doctor['location']} - {doctor['distance_km']} km - score {doctor['score']}")
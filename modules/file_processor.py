@@ -4,12 +4,19 @@ Processes different file types (CSV, PDF, Image, EDF) and extracts features
 """
 import pandas as pd
 import numpy as np
-import pdfplumber
-import pytesseract
-from PIL import Image
-import cv2
 import os
-import re
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.metrics import timed, timed_stage
+from utils.text_numbers import extract_numbers, summarize
+
+# pdfplumber, pytesseract, cv2, PIL and mne are imported inside the parsers that
+# use them, so importing this module stays cheap for processes that never
+# see those file types
 
 
 class FileProcessor:
@@ -21,6 +28,7 @@ class FileProcessor:
         ext = os.path.splitext(file_path)[1].lower().replace('.', '')
         return ext if ext in self.supported_formats else None
     
+    @timed_stage('file_parse')
     def process_file(self, file_path):
         """Main method to process any supported file type"""
         file_type = self.detect_file_type(file_path)
@@ -56,7 +64,7 @@ class FileProcessor:
                 'raw_data': df,
                 'message': f"Successfully processed CSV with {len(df)} rows"
             }
-            
+        
         except Exception as e:
             return {
                 'success': False,
@@ -67,6 +75,8 @@ class FileProcessor:
     def process_pdf(self, file_path):
         """Process PDF file and extract text"""
         try:
+            import pdfplumber
+            
             text = ""
             with pdfplumber.open(file_path) as pdf:
                 for page in pdf.pages:
@@ -84,7 +94,7 @@ class FileProcessor:
                 'text': text,
                 'message': f"Successfully extracted text from PDF ({len(text)} chars)"
             }
-            
+        
         except Exception as e:
             return {
                 'success': False,
@@ -92,18 +102,51 @@ class FileProcessor:
                 'error': str(e)
             }
     
-    def process_image(self, file_path):
-        """Process image file using OCR"""
+    def process_image(self, file_path, numeric_only=True, mode='auto'):
+        """
+        Process image file: digitize an EEG chart, or OCR a report
+        
+        In 'auto' mode an image whose traces fill most of the page width in
+        every lane, each as one unbroken stroke, is digitized and its signals
+        go through the EEG feature extractor; anything else is OCRed. 'waveform' and 'text' force a path.
+        
+        For OCR the page is downscaled, thresholded and deskewed with OpenCV
+        and only detected text blocks are passed to tesseract. Recognition
+        is restricted to digits by default, since only numbers become features.
+        The whitelist also drops every letter, so labelled values ("Delta
+        power: 12.3") only become named features with numeric_only=False.
+        """
         try:
-            # Read image
-            image = Image.open(file_path)
+            from utils.ocr import load_grayscale, ocr_gray
+            from utils.waveform_digitizer import digitize_strip
+            
+            gray, image_shape = load_grayscale(file_path)
             
-            # Extract text using OCR
-            text = pytesseract.image_to_string(image)
-            print(f"Image OCR extracted: {len(text)} characters")
+            if mode != 'text':
+                with timed('waveform_digitization'):
+                    strip = digitize_strip(gray)
+                if strip['is_waveform'] or (mode == 'waveform' and strip['data'] is not None):
+                    # Volts, like the EDF reader
+                    data = strip['data'] * 1e-6
+                    print(f"Image digitized: {data.shape[0]} traces at {strip['sfreq']} Hz")
+                    
+                    return {
+                        'success': True,
+                        'file_type': 'image',
+                        'source': 'waveform',
+                        'features': self.extract_features_from_eeg(data, strip['sfreq']),
+                        'n_channels': data.shape[0],
+                        'sampling_rate': strip['sfreq'],
+                        'trace_coverage': float(np.min(strip['coverage'])),
+                        'image_shape': image_shape,
+                        'message': f"Successfully digitized {data.shape[0]} EEG traces from image"
+                    }
+                if mode == 'waveform':
+                    raise ValueError("No EEG traces found in image")
             
-            # Also analyze image properties
-            img_array = np.array(image)
+            result = ocr_gray(gray, numeric_only=numeric_only)
+            text = result['text']
+            print(f"Image OCR extracted: {len(text)} characters from {result['regions']} regions")
             
             # Extract features
             features = self.extract_features_from_text(text)
@@ -111,12 +154,14 @@ class FileProcessor:
             return {
                 'success': True,
                 'file_type': 'image',
+                'source': 'text',
                 'features': features,
                 'text': text,
-                'image_shape': img_array.shape,
+                'image_shape': image_shape,
+                'skew_angle': result['skew_angle'],
                 'message': f"Successfully processed image and extracted text"
             }
-            
+        
         except Exception as e:
             return {
                 'success': False,
@@ -149,7 +194,7 @@ class FileProcessor:
                 'sampling_rate': sfreq,
                 'message': f"Successfully processed EDF with {len(raw.ch_names)} channels"
             }
-            
+        
         except Exception as e:
             return {
                 'success': False,
@@ -157,6 +202,7 @@ class FileProcessor:
                 'error': str(e)
             }
     
+    @timed_stage('feature_extraction')
     def extract_features_from_dataframe(self, df):
         """Extract statistical features from DataFrame"""
         features = {}
@@ -177,30 +223,34 @@ class FileProcessor:
         
         return features
     
+    @timed_stage('feature_extraction')
     def extract_features_from_text(self, text):
-        """Extract features from text (PDF/Image OCR)"""
-        # Extract numbers from text
-        numbers = re.findall(r'-?\d+\.?\d*', text)
-        numbers = [float(n) for n in numbers if n]
+        """
+        Extract features from text (PDF/Image OCR)
+        
+        Numbers are parsed straight into a float array (utils/text_numbers.py).
+        Labelled values such as "Delta power: 12.3" also become named
+        features (delta_power) that a model trained on those columns can use;
+        image OCR keeps the labels only when run with numeric_only=False.
+        """
+        numbers, labelled = extract_numbers(text)
         
         if len(numbers) == 0:
             return self.create_dummy_features()
         
         # Create statistical features
-        features = {
-            'text_mean': np.mean(numbers),
-            'text_std': np.std(numbers),
-            'text_max': np.max(numbers),
-            'text_min': np.min(numbers),
-            'text_count': len(numbers)
-        }
+        features = summarize(numbers)
         
         # Pad with additional features
-        for i in range(min(len(numbers), 15)):
-            features[f'value_{i}'] = numbers[i]
+        for i, value in enumerate(numbers[:15].tolist()):
+            features[f'value_{i}'] = value
+        
+        for name, value in labelled.items():
+            features.setdefault(name, value)
         
         return features
     
+    @timed_stage('feature_extraction')
     def extract_features_from_eeg(self, data, sfreq):
         """Extract features from EEG signal data"""
         features = {}
@@ -0,0 +1,346 @@
+"""
+Module 10: Incremental Updater
+Stores clinician-confirmed labels for scored windows and grows the active
+RandomForest with new trees fitted on recent feedback, publishing each
+update to the model registry as a new version without a full retrain
+"""
+import os
+import copy
+import json
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+
+class FeedbackStore:
+    def __init__(self, path: str = 'datasets/feedback/feedback.jsonl'):
+        """
+        Initialize feedback store
+        
+        Args:
+            path: Append-only JSON lines file, one confirmed window per line
+        """
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def add(self, features: Dict, label: int, model_version: Optional[str] = None,
+            prediction: Optional[str] = None, source: Optional[str] = None) -> Dict:
+        """Append a confirmed label for one scored feature window"""
+        record = {
+            'features': {key: float(value) for key, value in features.items()},
+            'label': int(label),
+            'model_version': model_version,
+            'prediction': prediction,
+            'source': source,
+            'timestamp': datetime.now().isoformat()
+        }
+        line = json.dumps(record) + '\n'
+        
+        # One write per line in append mode, so concurrent workers do not interleave records
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(line)
+        return record
+    
+    def read_since(self, offset: int = 0, end: Optional[int] = None) -> Tuple[List[Dict], int]:
+        """Records appended after byte offset (up to byte end), and the offset to resume from"""
+        if not os.path.exists(self.path):
+            return [], offset
+        
+        records = []
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if end is not None and offset + len(line) > end:
+                    break
+                if not line.endswith(b'\n'):
+                    # A record still being written; pick it up next time
+                    break
+                offset += len(line)
+                records.append(json.loads(line))
+        return records, offset
+    
+    def count_since(self, offset: int = 0) -> int:
+        """Number of complete records after byte offset"""
+        if not os.path.exists(self.path):
+            return 0
+        
+        count = 0
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for block in iter(lambda: f.read(1 << 20), b''):
+                count += block.count(b'\n')
+        return count
+
+
+class IncrementalUpdater:
+    def __init__(self, registry, store: FeedbackStore, versions_root: str = 'models/versions',
+                 trees_per_update: int = 20, max_trees: int = 500, min_new_labels: int = 50,
+                 replay_size: int = 5000, holdout_fraction: float = 0.2, publish: str = 'shadow',
+                 random_state: int = 42):
+        """
+        Initialize incremental updater
+        
+        Args:
+            registry: ModelRegistry whose active random_forest version is extended
+            store: FeedbackStore with confirmed labels
+            versions_root: Directory new versions are written to
+            trees_per_update: Trees fitted on each batch of feedback
+            max_trees: Oldest trees are dropped beyond this, so the forest
+                tracks recent data and inference cost stays bounded
+            min_new_labels: Feedback needed before the background loop updates
+            replay_size: Older feedback kept (reservoir sample) and mixed into
+                every update so new trees do not only see the latest batch
+            holdout_fraction: Share of new feedback held out to compare the
+                parent and updated models (recorded in update.json)
+            publish: 'shadow' loads the new version as the shadow candidate,
+                'activate' swaps it in, 'register' only registers it
+            random_state: Seed for tree fitting, holdout split and replay sampling
+        """
+        if publish not in ('shadow', 'activate', 'register'):
+            raise ValueError("publish must be 'shadow', 'activate' or 'register'")
+        
+        self.registry = registry
+        self.store = store
+        self.versions_root = versions_root
+        self.trees_per_update = trees_per_update
+        self.max_trees = max_trees
+        self.min_new_labels = min_new_labels
+        self.replay_size = replay_size
+        self.holdout_fraction = holdout_fraction
+        self.publish = publish
+        self.rng = np.random.default_rng(random_state)
+        
+        self.offset = None
+        self.replay = []
+        self.replay_seen = 0
+        self.last_update = None
+        self._update_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _resume(self):
+        """
+        Continue from the feedback offset recorded by the active version, so
+        a restarted server does not refit trees on labels it already used
+        """
+        self.offset = 0
+        entry = self.registry.versions.get(self.registry.active_version)
+        metadata_path = os.path.join(entry.model_dir, 'update.json') if entry is not None else None
+        if metadata_path is None or not os.path.exists(metadata_path):
+            return
+        
+        with open(metadata_path) as f:
+            resume_offset = json.load(f).get('feedback_offset', 0)
+        consumed, self.offset = self.store.read_since(0, end=resume_offset)
+        self._add_to_replay(consumed)
+    
+    def pending_labels(self) -> int:
+        """Feedback received since the last update"""
+        if self.offset is None:
+            self._resume()
+        return self.store.count_since(self.offset)
+    
+    def _add_to_replay(self, records: List[Dict]):
+        """Reservoir sampling keeps a uniform sample of all consumed feedback"""
+        for record in records:
+            self.replay_seen += 1
+            if len(self.replay) < self.replay_size:
+                self.replay.append(record)
+            else:
+                slot = self.rng.integers(self.replay_seen)
+                if slot < self.replay_size:
+                    self.replay[slot] = record
+    
+    def _matrix(self, predictor, records: List[Dict]):
+        """Scaled feature matrix and labels in the predictor's column order"""
+        df = predictor.prepare_input([record['features'] for record in records])
+        X = predictor.scaler.transform(df)
+        y = np.array([record['label'] for record in records])
+        return X, y
+    
+    def _extend_forest(self, model, X, y):
+        """Copy the forest and warm-start trees_per_update new trees on (X, y)"""
+        model = copy.deepcopy(model)
+        
+        keep = max(self.max_trees - self.trees_per_update, 0)
+        if len(model.estimators_) > keep:
+            model.estimators_ = model.estimators_[len(model.estimators_) - keep:]
+        
+        # fit() re-derives classes_ from y; zero-weight rows for absent classes
+        # keep the new trees' output aligned with the existing ones
+        weights = np.ones(len(y))
+        missing = np.setdiff1d(model.classes_, y)
+        if len(missing):
+            X = np.vstack([X, np.repeat(X.mean(axis=0, keepdims=True), len(missing), axis=0)])
+            y = np.concatenate([y, missing])
+            weights = np.concatenate([weights, np.zeros(len(missing))])
+        
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + self.trees_per_update)
+        model.fit(X, y, sample_weight=weights)
+        model.set_params(warm_start=False)
+        return model
+    
+    def update(self, force: bool = False) -> Optional[Dict]:
+        """
+        Fit new trees on feedback received since the last update and publish a version
+        
+        Returns:
+            The new version's update summary, or None when there was nothing to learn
+        """
+        with self._update_lock:
+            if self.offset is None:
+                self._resume()
+            records, offset = self.store.read_since(self.offset)
+            if not records or (len(records) < self.min_new_labels and not force):
+                return None
+            
+            start = time.perf_counter()
+            with self.registry.acquire() as (parent_version, predictor):
+                entry = self.registry.versions[parent_version]
+                if entry.kind != 'random_forest':
+                    raise RuntimeError(f"Incremental updates need a random_forest model, "
+                                       f"active version '{parent_version}' is {entry.kind}")
+                
+                unknown = {r['label'] for r in records} - set(int(c) for c in predictor.model.classes_)
+                if unknown:
+                    raise ValueError(f"Feedback labels {sorted(unknown)} are not classes of the model")
+                
+                order = self.rng.permutation(len(records))
+                n_holdout = int(len(records) * self.holdout_fraction)
+                holdout = [records[i] for i in order[:n_holdout]]
+                train = [records[i] for i in order[n_holdout:]] + self.replay
+                
+                X, y = self._matrix(predictor, train)
+                model = self._extend_forest(predictor.model, X, y)
+                scaler, feature_columns = predictor.scaler, predictor.feature_columns
+                
+                evaluation = {'holdout_size': len(holdout)}
+                if holdout:
+                    X_holdout, y_holdout = self._matrix(predictor, holdout)
+                    evaluation['parent_accuracy'] = float((predictor.model.predict(X_holdout) == y_holdout).mean())
+                    evaluation['updated_accuracy'] = float((model.predict(X_holdout) == y_holdout).mean())
+            
+            version = f"inc-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+            summary = {
+                'version': version,
+                'parent_version': parent_version,
+                'new_labels': len(records),
+                'replayed_labels': len(self.replay),
+                'trees': len(model.estimators_),
+                'feedback_offset': offset,
+                'fit_seconds': time.perf_counter() - start,
+                **evaluation
+            }
+            model_dir = self._save_version(version, model, scaler, feature_columns, summary)
+            
+            # Publish before advancing the offset, so a failed publish is retried with the same feedback
+            self.registry.register(version, 'random_forest', model_dir)
+            if self.publish != 'register':
+                self.registry.load(version)
+                if self.publish == 'activate':
+                    self.registry.activate(version)
+                else:
+                    self.registry.set_shadow(version)
+            
+            self.offset = offset
+            self._add_to_replay(records)
+            self.last_update = summary
+            print(f"Published model version '{version}' ({summary['trees']} trees, "
+                  f"{len(records)} new labels, {summary['fit_seconds']:.2f}s)")
+            return summary
+    
+    def _save_version(self, version, model, scaler, feature_columns, summary) -> str:
+        """Write the version to a temporary directory and rename it into place"""
+        model_dir = os.path.join(self.versions_root, version)
+        tmp_dir = model_dir + '.tmp'
+        os.makedirs(tmp_dir, exist_ok=True)
+        
+        try:
+            joblib.dump(model, os.path.join(tmp_dir, 'seizure_model.pkl'))
+            joblib.dump(scaler, os.path.join(tmp_dir, 'scaler.pkl'))
+            joblib.dump(feature_columns, os.path.join(tmp_dir, 'feature_columns.pkl'))
+            with open(os.path.join(tmp_dir, 'update.json'), 'w') as f:
+                json.dump(summary, f, indent=2)
+            os.rename(tmp_dir, model_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        
+        return model_dir
+    
+    def update_async(self, force: bool = True) -> threading.Thread:
+        """Run update() on a background thread"""
+        def worker():
+            try:
+                self.update(force=force)
+            except Exception as e:
+                print(f"Error during incremental update: {str(e)}")
+        
+        thread = threading.Thread(target=worker, name='incremental-update', daemon=True)
+        thread.start()
+        return thread
+    
+    def start(self, interval_seconds: float = 60.0):
+        """Check for new feedback every interval and update once min_new_labels have arrived"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        
+        def loop():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    if self.pending_labels() >= self.min_new_labels:
+                        self.update()
+                except Exception as e:
+                    print(f"Error during incremental update: {str(e)}")
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name='incremental-updater', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def get_status(self) -> Dict:
+        return {
+            'pending_labels': self.pending_labels(),
+            'replay_size': len(self.replay),
+            'publish': self.publish,
+            'last_update': self.last_update
+        }
+
+
+if __name__ == "__main__":
+    # Test incremental updater
+    import sys
+    import tempfile
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).parent.parent))
+    from modules.model_registry import ModelRegistry
+    
+    registry = ModelRegistry()
+    registry.register('default', 'random_forest', 'models')
+    registry.load('default')
+    registry.activate('default')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeedbackStore(os.path.join(tmp, 'feedback.jsonl'))
+        with registry.acquire() as (_, predictor):
+            columns = predictor.feature_columns
+        for _ in range(200):
+            label = int(np.random.randint(3))
+            store.add({col: np.random.randn() + label for col in columns}, label)
+        
+        updater = IncrementalUpdater(registry, store, versions_root=os.path.join(tmp, 'versions'),
+                                     publish='activate')
+        print(updater.update())
@@ -0,0 +1,142 @@
+"""
+Lightweight CNN-LSTM Runtime
+Runs a CNN-LSTM model exported with CNNLSTMSeizureModel.export_tflite
+using a small TFLite interpreter, so serving does not need TensorFlow
+"""
+import numpy as np
+import joblib
+import os
+
+# Note: Any one of these interpreters works, checked from smallest to largest
+# Install with: pip install ai-edge-litert (or tflite-runtime)
+try:
+    from ai_edge_litert.interpreter import Interpreter
+    LITE_RUNTIME_AVAILABLE = True
+except ImportError:
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        LITE_RUNTIME_AVAILABLE = True
+    except ImportError:
+        Interpreter = None
+        LITE_RUNTIME_AVAILABLE = False
+
+
+class CNNLSTMLitePredictor:
+    """
+    TFLite-backed CNN-LSTM predictor
+    Exposes the same predict(X) contract as CNNLSTMSeizureModel
+    """
+    
+    def __init__(self, model_dir='models', num_threads=None):
+        """
+        Initialize lite predictor
+        
+        Args:
+            model_dir: Directory containing cnn_lstm_model.tflite and cnn_lstm_scaler.pkl
+            num_threads: Interpreter threads (None lets the runtime decide)
+        """
+        self.model_dir = model_dir
+        self.num_threads = num_threads
+        self.interpreter = None
+        self.scaler = None
+        self.input_details = None
+        self.output_details = None
+        self.load_model()
+    
+    def load_model(self):
+        """Load exported TFLite model and fitted scaler"""
+        model_path = os.path.join(self.model_dir, 'cnn_lstm_model.tflite')
+        scaler_path = os.path.join(self.model_dir, 'cnn_lstm_scaler.pkl')
+        
+        if Interpreter is not None:
+            self.interpreter = Interpreter(model_path=model_path, num_threads=self.num_threads)
+        else:
+            # Fall back to the interpreter bundled with full TensorFlow
+            try:
+                import tensorflow as tf
+            except ImportError:
+                raise ImportError("A TFLite interpreter is required. Install with: pip install ai-edge-litert")
+            self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=self.num_threads)
+        
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()[0]
+        self.scaler = joblib.load(scaler_path)
+        
+        print("Lite model and scaler loaded successfully!")
+    
+    @property
+    def batch_size(self):
+        """Fixed batch size the model was exported with"""
+        return int(self.input_details['shape'][0])
+    
+    @property
+    def num_classes(self):
+        """Number of output classes"""
+        return int(self.output_details['shape'][-1])
+    
+    def _quantize_input(self, batch):
+        """Convert a float batch to the model's input dtype"""
+        dtype = self.input_details['dtype']
+        if dtype == np.float32:
+            return batch
+        
+        scale, zero_point = self.input_details['quantization']
+        info = np.iinfo(dtype)
+        return np.clip(np.round(batch / scale + zero_point), info.min, info.max).astype(dtype)
+    
+    def _dequantize_output(self, output):
+        """Convert model output back to float probabilities"""
+        if self.output_details['dtype'] == np.float32:
+            return output
+        
+        scale, zero_point = self.output_details['quantization']
+        return (output.astype(np.float32) - zero_point) * scale
+    
+    def predict_scaled(self, X_reshaped):
+        """Run already scaled and reshaped inputs through the interpreter"""
+        X_reshaped = np.asarray(X_reshaped, dtype=np.float32)
+        n_samples = X_reshaped.shape[0]
+        batch_size = self.batch_size
+        input_shape = tuple(self.input_details['shape'][1:])
+        predictions = np.empty((n_samples, self.num_classes), dtype=np.float32)
+        
+        for start in range(0, n_samples, batch_size):
+            batch = X_reshaped[start:start + batch_size]
+            size = batch.shape[0]
+            
+            # Pad the final partial batch up to the exported batch size
+            if size < batch_size:
+                padding = np.zeros((batch_size - size,) + input_shape, dtype=np.float32)
+                batch = np.concatenate([batch, padding])
+            
+            self.interpreter.set_tensor(self.input_details['index'], self._quantize_input(batch))
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self.output_details['index'])
+            predictions[start:start + size] = self._dequantize_output(output)[:size]
+        
+        return predictions
+    
+    def predict(self, X):
+        """Make predictions"""
+        # Scale and reshape
+        X_scaled = self.scaler.transform(X)
+        X_reshaped = X_scaled.reshape(X_scaled.shape[0], -1, 1)
+        
+        # Predict
+        predictions = self.predict_scaled(X_reshaped)
+        predicted_classes = np.argmax(predictions, axis=1)
+        
+        return predicted_classes, predictions
+
+
+if __name__ == "__main__":
+    # Test lite predictor
+    predictor = CNNLSTMLitePredictor()
+    
+    n_features = int(predictor.input_details['shape'][1])
+    dummy_X = np.random.randn(4, n_features)
+    
+    classes, probabilities = predictor.predict(dummy_X)
+    print(f"\nPredicted classes: {classes}")
+    print(f"Probabilities:\n{probabilities}")
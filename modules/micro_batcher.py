@@ -0,0 +1,137 @@
+"""
+Module 8: Micro Batcher
+Coalesces concurrent prediction requests into one batched model call
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+
+class MicroBatcher:
+    def __init__(self,
+                 predict_batch_fn: Callable[[List], List],
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0,
+                 timeout_s: float = 30.0):
+        """
+        Initialize micro batcher
+        
+        Args:
+            predict_batch_fn: Function mapping a list of inputs to a list of results
+            max_batch_size: Largest number of requests scored together
+            max_wait_ms: How long the first request of a batch waits for company
+            timeout_s: How long predict() waits for a result before raising TimeoutError
+        """
+        self.predict_batch_fn = predict_batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout_s
+        self.stats = {'requests': 0, 'batches': 0}
+        self._queue = None
+        self._worker = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+    
+    def _ensure_worker(self):
+        """Start the batching thread lazily, and again in a forked child"""
+        if self._worker is not None and self._pid == os.getpid():
+            return
+        
+        with self._start_lock:
+            if self._worker is not None and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._worker.start()
+    
+    def submit(self, item) -> Future:
+        """Queue one input and return a future for its result"""
+        future = Future()
+        
+        # Batching disabled: score inline
+        if self.max_batch_size <= 1:
+            self._score([(item, future)])
+            return future
+        
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+    
+    def predict(self, item, timeout: float = None):
+        """Score one input, waiting for the batch it lands in (at most timeout_s by default)"""
+        return self.submit(item).result(timeout=self.timeout if timeout is None else timeout)
+    
+    def _collect(self) -> List:
+        """Block for the first request, then gather more until the window or batch is full"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def _score(self, batch: List):
+        """Run one batched call and fan results back to the waiting futures"""
+        items = [item for item, _ in batch]
+        with self._stats_lock:
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+        
+        try:
+            results = self.predict_batch_fn(items)
+        except Exception as e:
+            if len(batch) == 1:
+                _, future = batch[0]
+                future.set_exception(e)
+                return
+            # One bad request must not fail its neighbours, so retry individually
+            for entry in batch:
+                self._score([entry])
+            return
+        
+        # A short result list would leave some futures waiting forever
+        if len(results) != len(batch):
+            error = RuntimeError(f"predict_batch_fn returned {len(results)} results for {len(batch)} inputs")
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+    
+    def _run(self):
+        while True:
+            self._score(self._collect())
+    
+    def get_stats(self) -> dict:
+        """Requests, batches and mean batch size so far"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['mean_batch_size'] = stats['requests'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+
+if __name__ == "__main__":
+    # Test micro batcher
+    from concurrent.futures import ThreadPoolExecutor
+    
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_batch_size=16, max_wait_ms=5)
+    
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(batcher.predict, range(100)))
+    
+    print(f"Results correct: {results == [i * 2 for i in range(100)]}")
+    print(f"Stats: {batcher.get_stats()}")
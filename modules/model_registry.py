@@ -0,0 +1,403 @@
+"""
+Module 7: Model Registry
+Holds versioned predictors, loads new versions in the background and
+hot-swaps the active one without dropping in-flight requests
+"""
+import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .predictor import SeizurePredictor, DeepModelPredictor
+from .prediction_cache import PredictionCache
+
+
+# Files that identify each kind of exported model inside a version directory
+MODEL_KIND_FILES = {
+    'random_forest': 'seizure_model.pkl',
+    'tflite': 'cnn_lstm_model.tflite',
+    'torchscript': 'torch_cnn_lstm_model.ts',
+    'cnn_lstm': 'cnn_lstm_model.h5',
+}
+
+
+class ModelVersion:
+    """A registered model version and its in-flight reference count"""
+    
+    def __init__(self, version: str, kind: str, model_dir: str):
+        self.version = version
+        self.kind = kind
+        self.model_dir = model_dir
+        self.predictor = None
+        self.status = 'registered'
+        self.error = None
+        self.loaded_at = None
+        self.refcount = 0
+        # Set when the current load finishes, so concurrent loads can wait on it
+        self.load_done = threading.Event()
+    
+    def to_dict(self) -> Dict:
+        """Serializable summary of this version"""
+        return {
+            'version': self.version,
+            'kind': self.kind,
+            'model_dir': self.model_dir,
+            'status': self.status,
+            'error': self.error,
+            'loaded_at': self.loaded_at,
+            'in_flight': self.refcount
+        }
+
+
+class ModelRegistry:
+    def __init__(self, max_pending_shadow: int = 100, prediction_cache: Optional[PredictionCache] = None):
+        """
+        Initialize model registry
+        
+        Args:
+            max_pending_shadow: Shadow scoring jobs allowed to queue before
+                new ones are dropped (shadow work never slows live traffic)
+            prediction_cache: Optional cache of results for repeated feature
+                vectors; cleared whenever the active version changes
+        """
+        self.prediction_cache = prediction_cache
+        self.versions = {}
+        self.active_version = None
+        self.shadow_version = None
+        self.max_pending_shadow = max_pending_shadow
+        self.shadow_stats = self._empty_shadow_stats()
+        self._lock = threading.Lock()
+        self._swap_listeners = []
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow-scoring')
+        self._pending_shadow = 0
+    
+    def _empty_shadow_stats(self) -> Dict:
+        return {'scored': 0, 'agreements': 0, 'errors': 0, 'dropped': 0, 'confidence_delta_sum': 0.0}
+    
+    def register(self, version: str, kind: str = 'random_forest', model_dir: str = 'models') -> ModelVersion:
+        """Register a model version without loading it"""
+        if kind not in MODEL_KIND_FILES:
+            raise ValueError(f"Unsupported model kind. Supported: {list(MODEL_KIND_FILES)}")
+        
+        with self._lock:
+            if version in self.versions:
+                raise ValueError(f"Model version '{version}' is already registered")
+            entry = ModelVersion(version, kind, model_dir)
+            self.versions[version] = entry
+        
+        return entry
+    
+    def discover(self, root: str = 'models/versions') -> List[str]:
+        """Register every unregistered version directory found under root"""
+        discovered = []
+        if not os.path.isdir(root):
+            return discovered
+        
+        for version in sorted(os.listdir(root)):
+            model_dir = os.path.join(root, version)
+            if version in self.versions or not os.path.isdir(model_dir):
+                continue
+            
+            for kind, filename in MODEL_KIND_FILES.items():
+                if os.path.exists(os.path.join(model_dir, filename)):
+                    self.register(version, kind, model_dir)
+                    discovered.append(version)
+                    break
+        
+        return discovered
+    
+    def _get(self, version: str) -> ModelVersion:
+        entry = self.versions.get(version)
+        if entry is None:
+            raise KeyError(f"Unknown model version '{version}'")
+        return entry
+    
+    def _create_predictor(self, entry: ModelVersion):
+        """Instantiate the predictor class for a version"""
+        if entry.kind == 'random_forest':
+            return SeizurePredictor(model_dir=entry.model_dir)
+        return DeepModelPredictor(model_dir=entry.model_dir, backend=entry.kind)
+    
+    def load(self, version: str) -> ModelVersion:
+        """
+        Load a version synchronously (the active model keeps serving meanwhile);
+        if another thread is already loading it, wait for that load instead
+        """
+        entry = self._get(version)
+        
+        with self._lock:
+            if entry.status == 'ready':
+                return entry
+            if entry.status == 'loading':
+                load_done = entry.load_done
+            else:
+                load_done = None
+                entry.status = 'loading'
+                entry.error = None
+                entry.load_done = threading.Event()
+        
+        if load_done is not None:
+            load_done.wait()
+            with self._lock:
+                if entry.status != 'ready':
+                    raise RuntimeError(f"Model version '{version}' failed to load: {entry.error}")
+            return entry
+        
+        try:
+            predictor = self._create_predictor(entry)
+        except Exception as e:
+            with self._lock:
+                entry.status = 'failed'
+                entry.error = str(e)
+                entry.load_done.set()
+            raise
+        
+        with self._lock:
+            entry.predictor = predictor
+            entry.status = 'ready'
+            entry.loaded_at = datetime.now().isoformat()
+            entry.load_done.set()
+        
+        return entry
+    
+    def load_async(self, version: str, activate: bool = False) -> threading.Thread:
+        """Load a version on a background thread, optionally activating it when ready"""
+        self._get(version)
+        
+        def worker():
+            try:
+                self.load(version)
+                if activate:
+                    self.activate(version)
+            except Exception as e:
+                print(f"Error loading model version '{version}': {str(e)}")
+        
+        thread = threading.Thread(target=worker, name=f'load-model-{version}', daemon=True)
+        thread.start()
+        return thread
+    
+    def activate(self, version: str) -> ModelVersion:
+        """Atomically make a loaded version the one serving requests"""
+        entry = self._get(version)
+        
+        with self._lock:
+            if entry.status != 'ready':
+                raise RuntimeError(f"Model version '{version}' is not loaded (status: {entry.status})")
+            
+            previous = self.versions.get(self.active_version)
+            self.active_version = version
+            if self.shadow_version == version:
+                self.shadow_version = None
+            if previous is not None and previous is not entry:
+                self._release_if_idle(previous)
+            
+            listeners = list(self._swap_listeners)
+        
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+        
+        for listener in listeners:
+            listener(version)
+        
+        return entry
+    
+    def on_swap(self, listener):
+        """Register a callback invoked with the new version after every activation"""
+        self._swap_listeners.append(listener)
+    
+    def _release_if_idle(self, entry: ModelVersion):
+        """Drop a retired version's predictor once no request holds it (lock held)"""
+        if entry.version in (self.active_version, self.shadow_version):
+            return
+        if entry.refcount == 0 and entry.predictor is not None:
+            entry.predictor = None
+            entry.status = 'registered'
+    
+    @contextmanager
+    def acquire(self, version: Optional[str] = None):
+        """
+        Borrow a predictor for the duration of a request
+        
+        The reference count keeps a swapped-out version alive until every
+        request that started on it has finished
+        """
+        with self._lock:
+            entry = self.versions.get(version or self.active_version)
+            if entry is None or entry.predictor is None:
+                raise RuntimeError("Model not loaded. Please train the model first.")
+            entry.refcount += 1
+            predictor = entry.predictor
+        
+        try:
+            yield entry.version, predictor
+        finally:
+            with self._lock:
+                entry.refcount -= 1
+                self._release_if_idle(entry)
+    
+    def is_ready(self) -> bool:
+        """Whether a model is active and able to serve"""
+        entry = self.versions.get(self.active_version)
+        return entry is not None and entry.predictor is not None
+    
+    def _cache_key(self, version: str, predictor, features):
+        if self.prediction_cache is None or not isinstance(features, dict):
+            return None
+        return self.prediction_cache.make_key(version, features, predictor.feature_columns)
+    
+    def _cache_get(self, key) -> Optional[Dict]:
+        if self.prediction_cache is None:
+            return None
+        return self.prediction_cache.get(key)
+    
+    def _cache_put(self, key, result: Dict):
+        if self.prediction_cache is not None:
+            self.prediction_cache.put(key, result)
+    
+    def get_cached(self, features) -> Optional[Dict]:
+        """Cached result of the active version for these features, or None"""
+        if self.prediction_cache is None or not self.is_ready():
+            return None
+        
+        with self.acquire() as (version, predictor):
+            result = self._cache_get(self._cache_key(version, predictor, features))
+        
+        if result is not None:
+            self._submit_shadow(features, result)
+        return result
+    
+    def predict(self, features):
+        """Predict with the active version and shadow-score the candidate if one is set"""
+        with self.acquire() as (version, predictor):
+            key = self._cache_key(version, predictor, features)
+            result = self._cache_get(key)
+            if result is None:
+                result = predictor.predict(features)
+                self._cache_put(key, result)
+        
+        self._submit_shadow(features, result)
+        return result
+    
+    def predict_batch(self, features_list: List, check_cache: bool = True) -> List[Dict]:
+        """
+        Batched predict on the active version; every row is shadow-scored individually
+        
+        Only rows missing from the prediction cache reach the model. Pass
+        check_cache=False when the caller already looked the rows up
+        (results are still cached)
+        """
+        with self.acquire() as (version, predictor):
+            keys = [self._cache_key(version, predictor, features) for features in features_list]
+            results = [self._cache_get(key) if check_cache else None for key in keys]
+            
+            missing = [i for i, result in enumerate(results) if result is None]
+            if missing:
+                computed = predictor.predict_batch([features_list[i] for i in missing])
+                for i, result in zip(missing, computed):
+                    results[i] = result
+                    self._cache_put(keys[i], result)
+        
+        for features, result in zip(features_list, results):
+            self._submit_shadow(features, result)
+        return results
+    
+    def set_shadow(self, version: Optional[str]):
+        """Shadow-score live traffic with a loaded candidate (None disables)"""
+        with self._lock:
+            if version is not None:
+                entry = self._get(version)
+                if entry.status != 'ready':
+                    raise RuntimeError(f"Model version '{version}' is not loaded (status: {entry.status})")
+                if version == self.active_version:
+                    raise ValueError("The active version cannot shadow itself")
+            
+            previous = self.versions.get(self.shadow_version)
+            self.shadow_version = version
+            self.shadow_stats = self._empty_shadow_stats()
+            if previous is not None:
+                self._release_if_idle(previous)
+    
+    def _submit_shadow(self, features, primary_result: Dict):
+        """Queue shadow scoring without blocking the live request"""
+        # Unlocked check so requests skip the lock when no shadow is set
+        if self.shadow_version is None:
+            return
+        
+        with self._lock:
+            # The shadow can be cleared or replaced since the check above
+            version = self.shadow_version
+            if version is None:
+                return
+            if self._pending_shadow >= self.max_pending_shadow:
+                self.shadow_stats['dropped'] += 1
+                return
+            self._pending_shadow += 1
+        
+        self._shadow_executor.submit(self._score_shadow, version, features, primary_result)
+    
+    def _score_shadow(self, version: str, features, primary_result: Dict):
+        """Score a request with the shadow version and record agreement with the primary"""
+        try:
+            with self.acquire(version) as (_, predictor):
+                shadow_result = predictor.predict(features)
+            
+            with self._lock:
+                if version != self.shadow_version:
+                    return
+                stats = self.shadow_stats
+                stats['scored'] += 1
+                if shadow_result['prediction'] == primary_result['prediction']:
+                    stats['agreements'] += 1
+                stats['confidence_delta_sum'] += abs(shadow_result['confidence'] - primary_result['confidence'])
+        except Exception:
+            with self._lock:
+                self.shadow_stats['errors'] += 1
+        finally:
+            with self._lock:
+                self._pending_shadow -= 1
+    
+    def get_shadow_report(self) -> Dict:
+        """Agreement between the shadow candidate and the active model"""
+        with self._lock:
+            stats = dict(self.shadow_stats)
+        
+        scored = stats.pop('scored')
+        delta_sum = stats.pop('confidence_delta_sum')
+        return {
+            'version': self.shadow_version,
+            'scored': scored,
+            'agreement_rate': stats['agreements'] / scored if scored else None,
+            'mean_confidence_delta': delta_sum / scored if scored else None,
+            'errors': stats['errors'],
+            'dropped': stats['dropped']
+        }
+    
+    def list_versions(self) -> List[Dict]:
+        """Summaries of every registered version"""
+        with self._lock:
+            versions = []
+            for entry in self.versions.values():
+                info = entry.to_dict()
+                info['active'] = entry.version == self.active_version
+                info['shadow'] = entry.version == self.shadow_version
+                versions.append(info)
+        return versions
+
+
+if __name__ == "__main__":
+    # Test model registry
+    import numpy as np
+    
+    registry = ModelRegistry()
+    registry.register('default', 'random_forest', 'models')
+    registry.load('default')
+    registry.activate('default')
+    
+    with registry.acquire() as (version, predictor):
+        dummy_features = {col: np.random.randn() for col in predictor.feature_columns}
+    
+    result = registry.predict(dummy_features)
+    print(f"\nActive version: {registry.active_version}")
+    print(f"Prediction: {result['prediction']} ({result['confidence']:.2f}%)")
@@ -0,0 +1,119 @@
+"""
+Module 9: Prediction Cache
+LRU cache with expiry for prediction results, keyed by model version and
+the ordered (optionally rounded) feature vector
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class PredictionCache:
+    def __init__(self, capacity: int = 10000, ttl_seconds: float = 300.0, decimals: Optional[int] = None):
+        """
+        Initialize prediction cache
+        
+        Args:
+            capacity: Maximum number of cached results (0 disables the cache)
+            ttl_seconds: How long a result stays valid (0 or None never expires)
+            decimals: Round feature values to this many decimals before keying,
+                so nearly identical windows share an entry (None keys exact values)
+        """
+        self.capacity = capacity
+        self.ttl = ttl_seconds or None
+        self.decimals = decimals
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+    
+    def make_key(self, version: str, features: Dict, feature_columns: List[str]):
+        """
+        Build a cache key in model feature order (missing features count as 0,
+        as in SeizurePredictor.prepare_input)
+        
+        Returns None when a value is not numeric; such requests bypass the cache
+        """
+        try:
+            values = [float(features.get(col, 0)) for col in feature_columns]
+        except (TypeError, ValueError, AttributeError):
+            return None
+        
+        if self.decimals is not None:
+            # + 0.0 folds -0.0 into 0.0 so both round to the same key
+            values = [round(value, self.decimals) + 0.0 for value in values]
+        return (version, tuple(values))
+    
+    def get(self, key) -> Optional[Dict]:
+        """Return a deep copy of the cached result (probabilities included), or None"""
+        if key is None or not self.enabled:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            
+            result, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+        
+        return copy.deepcopy(result)
+    
+    def put(self, key, result: Dict):
+        """Store a result, evicting the least recently used entry when full"""
+        if key is None or not self.enabled:
+            return
+        
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        # Callers go on to modify their result, nested dicts included
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def clear(self):
+        """Drop every entry (called when the serving model changes)"""
+        with self._lock:
+            self._entries.clear()
+            self.stats['invalidations'] += 1
+    
+    def get_stats(self) -> Dict:
+        """Hit/miss counters, hit rate and current size"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+        
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['capacity'] = self.capacity
+        return stats
+
+
+if __name__ == "__main__":
+    # Test prediction cache
+    cache = PredictionCache(capacity=2, ttl_seconds=60, decimals=2)
+    columns = ['feature_1', 'feature_2']
+    
+    key = cache.make_key('default', {'feature_1': 0.1234, 'feature_2': 1.0}, columns)
+    cache.put(key, {'prediction': 'NORMAL', 'confidence': 97.0})
+    
+    near_key = cache.make_key('default', {'feature_1': 0.1229, 'feature_2': 1.0}, columns)
+    print(f"Near-identical request hit: {cache.get(near_key)}")
+    print(f"Other version hit: {cache.get(cache.make_key('v2', {'feature_1': 0.1234}, columns))}")
+    print(f"Stats: {cache.get_stats()}")
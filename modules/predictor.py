@@ -6,6 +6,13 @@ import joblib
 import numpy as np
 import pandas as pd
 import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.metrics import timed, timed_stage
 
 
 class SeizurePredictor:
@@ -41,6 +48,7 @@ class SeizurePredictor:
             print(f"Error loading model: {str(e)}")
             raise
     
+    @timed_stage('feature_preparation')
     def prepare_input(self, features):
         """Prepare input features for prediction"""
         if isinstance(features, dict):
@@ -50,8 +58,14 @@ class SeizurePredictor:
             df = features
         elif isinstance(features, np.ndarray):
             df = pd.DataFrame(features, columns=self.feature_columns)
+        elif isinstance(features, list):
+            # Batch of feature dicts, missing features are filled with 0 per row
+            df = pd.DataFrame(
+                [[row.get(col, 0) for col in self.feature_columns] for row in features],
+                columns=self.feature_columns
+            )
         else:
-            raise ValueError("Features must be dict, DataFrame, or numpy array")
+            raise ValueError("Features must be dict, list of dicts, DataFrame, or numpy array")
         
         # Ensure all required features are present
         missing_features = set(self.feature_columns) - set(df.columns)
@@ -70,40 +84,49 @@ class SeizurePredictor:
             # Prepare input
             df = self.prepare_input(features)
             
-            # Scale features
-            features_scaled = self.scaler.transform(df)
-            
-            # Get prediction
-            prediction = self.model.predict(features_scaled)[0]
-            probabilities = self.model.predict_proba(features_scaled)[0]
-            
-            # Get class name
-            prediction_class = self.class_mapping.get(prediction, f"CLASS_{prediction}")
+            # Get class probabilities
+            probabilities = self.predict_proba(df)[0]
             
-            # Get confidence score
-            confidence = float(probabilities[prediction]) * 100
-            
-            # Determine risk level
-            risk_level = self.get_risk_level(prediction_class, confidence)
-            
-            # Create result dictionary
-            result = {
-                'prediction': prediction_class,
-                'confidence': confidence,
-                'risk_level': risk_level,
-                'probabilities': {
-                    self.class_mapping.get(i, f"CLASS_{i}"): float(prob * 100)
-                    for i, prob in enumerate(probabilities)
-                },
-                'explanation': self.get_explanation(prediction_class, confidence)
-            }
-            
-            return result
+            return self.build_result(probabilities)
             
         except Exception as e:
             print(f"Error during prediction: {str(e)}")
             raise
     
+    def predict_proba(self, df):
+        """Scale prepared features and return class probabilities"""
+        with timed('scaling'):
+            features_scaled = self.scaler.transform(df)
+        with timed('model_inference'):
+            return self.model.predict_proba(features_scaled)
+    
+    def build_result(self, probabilities):
+        """Build the prediction result dictionary from class probabilities"""
+        prediction = int(np.argmax(probabilities))
+        
+        # Get class name
+        prediction_class = self.class_mapping.get(prediction, f"CLASS_{prediction}")
+        
+        # Get confidence score
+        confidence = float(probabilities[prediction]) * 100
+        
+        # Determine risk level
+        risk_level = self.get_risk_level(prediction_class, confidence)
+        
+        # Create result dictionary
+        result = {
+            'prediction': prediction_class,
+            'confidence': confidence,
+            'risk_level': risk_level,
+            'probabilities': {
+                self.class_mapping.get(i, f"CLASS_{i}"): float(prob * 100)
+                for i, prob in enumerate(probabilities)
+            },
+            'explanation': self.get_explanation(prediction_class, confidence)
+        }
+        
+        return result
+    
     def get_risk_level(self, prediction_class, confidence):
         """Determine risk level based on prediction and confidence"""
         if prediction_class == 'SEIZURE':
@@ -131,12 +154,62 @@ class SeizurePredictor:
         return explanations.get(prediction_class, "Unable to generate explanation.")
     
     def predict_batch(self, features_list):
-        """Make predictions on multiple samples"""
-        results = []
-        for features in features_list:
-            result = self.predict(features)
-            results.append(result)
-        return results
+        """Make predictions on multiple samples with a single model call"""
+        if len(features_list) == 0:
+            return []
+        
+        df = self.prepare_input(list(features_list))
+        probabilities = self.predict_proba(df)
+        
+        return [self.build_result(row) for row in probabilities]
+
+
+class DeepModelPredictor(SeizurePredictor):
+    """
+    SeizurePredictor backed by one of the CNN-LSTM runtimes
+    Reuses the RandomForest feature columns so both accept the same feature dicts
+    """
+    
+    BACKENDS = ('cnn_lstm', 'tflite', 'torchscript')
+    
+    def __init__(self, model_dir='models', backend='tflite'):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported backend. Supported: {self.BACKENDS}")
+        self.backend = backend
+        super().__init__(model_dir)
+    
+    def load_model(self):
+        """Load the deep model runtime and feature columns"""
+        try:
+            if self.backend == 'cnn_lstm':
+                from modules.cnn_lstm_model import CNNLSTMSeizureModel
+                self.model = CNNLSTMSeizureModel()
+                self.model.load_model(self.model_dir)
+            elif self.backend == 'tflite':
+                from modules.lite_predictor import CNNLSTMLitePredictor
+                self.model = CNNLSTMLitePredictor(self.model_dir)
+            else:
+                from modules.torch_cnn_lstm_model import TorchScriptSeizurePredictor
+                self.model = TorchScriptSeizurePredictor(self.model_dir)
+            
+            # Deep models carry their own scaler
+            self.scaler = self.model.scaler
+            
+            features_path = os.path.join(self.model_dir, 'feature_columns.pkl')
+            self.feature_columns = joblib.load(features_path)
+            
+        except FileNotFoundError as e:
+            print(f"Error: Model files not found. Please train the model first.")
+            raise
+        except Exception as e:
+            print(f"Error loading model: {str(e)}")
+            raise
+    
+    def predict_proba(self, df):
+        """Run the deep model (it scales internally) and return class probabilities"""
+        with timed('model_inference'):
+            _, probabilities = self.model.predict(df.values)
+        return probabilities
 
 
 if __name__ == "__main__":
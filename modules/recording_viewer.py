@@ -0,0 +1,158 @@
+"""
+Module 13: Recording Viewer
+Browses long EEG recordings at any zoom: one pass over the file builds a
+min/max signal pyramid and a per-window seizure probability timeline, and
+each view returns only about as many points as the plot is wide
+"""
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.signal_pyramid import SignalPyramid
+
+CLASSES = ('NORMAL', 'PREICTAL', 'SEIZURE')
+
+
+class ArrayRecording:
+    """In-memory (channels, samples) recording with the EDFReader interface"""
+    
+    def __init__(self, data, sfreq: float, channels: Optional[List[str]] = None, units: str = 'uV'):
+        self.data = np.asarray(data, dtype=np.float32)
+        self.sfreq = float(sfreq)
+        self.channels = channels or [f'EEG {i + 1}' for i in range(self.data.shape[0])]
+        self.units = [units] * self.data.shape[0]
+        self.n_samples = self.data.shape[1]
+        self.duration = self.n_samples / self.sfreq
+    
+    @property
+    def n_channels(self):
+        return self.data.shape[0]
+    
+    def volts_per_unit(self):
+        from utils.edf_reader import VOLTS_PER_UNIT
+        return np.array([VOLTS_PER_UNIT.get(unit.lower(), 1.0) for unit in self.units], dtype=np.float32)
+    
+    def read(self, start, stop, channels=None):
+        channels = slice(None) if channels is None else np.asarray(channels)
+        return self.data[channels, max(int(start), 0):int(stop)]
+
+
+class RecordingViewer:
+    def __init__(self, recording, predict_batch_fn: Optional[Callable[[List[Dict]], List[Dict]]] = None,
+                 feature_fn: Optional[Callable[[np.ndarray, float], Dict]] = None,
+                 window_seconds: float = 10.0, chunk_seconds: float = 600.0, base_bin: int = 256):
+        """
+        Initialize recording viewer and index the recording
+        
+        Args:
+            recording: EDFReader or ArrayRecording
+            predict_batch_fn: Maps a list of feature dicts to prediction results
+                (e.g. SeizurePredictor.predict_batch); None skips the timeline
+            feature_fn: Maps a (channels, samples) window in volts and sfreq to
+                a feature dict (e.g. FileProcessor.extract_features_from_eeg)
+            window_seconds: Length of each timeline window
+            chunk_seconds: Samples read per step while indexing; bounds memory
+            base_bin: Samples per point of the pyramid's finest level
+        """
+        self.recording = recording
+        self.sfreq = recording.sfreq
+        self.window_seconds = window_seconds
+        self.pyramid = SignalPyramid(recording.n_channels, recording.sfreq, base_bin=base_bin,
+                                     read_raw=recording.read)
+        self.timeline = None
+        
+        window = int(round(window_seconds * self.sfreq))
+        # Whole timeline windows per chunk, so no window spans two chunks
+        chunk = max(int(chunk_seconds * self.sfreq) // window, 1) * window
+        to_volts = recording.volts_per_unit()[:, None]
+        times, probabilities = [], []
+        
+        for start in range(0, recording.n_samples, chunk):
+            data = recording.read(start, start + chunk)
+            self.pyramid.append(data)
+            
+            if predict_batch_fn is None or feature_fn is None:
+                continue
+            n_windows = data.shape[1] // window
+            features = [feature_fn(data[:, i * window:(i + 1) * window] * to_volts, self.sfreq)
+                        for i in range(n_windows)]
+            for i, result in enumerate(predict_batch_fn(features)):
+                times.append((start + (i + 0.5) * window) / self.sfreq)
+                probabilities.append([result['probabilities'].get(name, 0.0) for name in CLASSES])
+        
+        self.pyramid.close()
+        if predict_batch_fn is not None and feature_fn is not None:
+            probabilities = np.array(probabilities, dtype=np.float32).reshape(-1, len(CLASSES))
+            self.timeline = {'time': np.array(times), **{name: probabilities[:, i] for i, name in enumerate(CLASSES)}}
+    
+    @classmethod
+    def from_edf(cls, edf_path, **kwargs):
+        from utils.edf_reader import EDFReader
+        return cls(EDFReader(edf_path), **kwargs)
+    
+    @property
+    def channels(self):
+        return self.recording.channels
+    
+    @property
+    def duration(self):
+        return self.recording.n_samples / self.sfreq
+    
+    def view(self, start: float, end: float, channels: Optional[List[int]] = None, max_points: int = 1000) -> Dict:
+        """
+        Plot data for [start, end) seconds
+        
+        Returns:
+            Dictionary with time, min and max per channel (see SignalPyramid.view),
+            bin_samples, channels (names) and timeline (the probability windows
+            inside the view, or None)
+        """
+        channels = list(range(len(self.channels))) if channels is None else list(channels)
+        result = self.pyramid.view(start, end, max_points=max_points, channels=channels)
+        result['channels'] = [self.channels[i] for i in channels]
+        
+        result['timeline'] = None
+        if self.timeline is not None:
+            inside = (self.timeline['time'] >= start) & (self.timeline['time'] < end)
+            result['timeline'] = {key: values[inside] for key, values in self.timeline.items()}
+        return result
+    
+    def get_status(self) -> Dict:
+        return {
+            'channels': len(self.channels),
+            'sfreq': self.sfreq,
+            'duration': self.duration,
+            'pyramid_bytes': self.pyramid.nbytes(),
+            'timeline_windows': 0 if self.timeline is None else len(self.timeline['time'])
+        }
+
+
+if __name__ == "__main__":
+    # Test recording viewer on one hour of synthetic 19-channel EEG
+    import time
+    from generate_eeg_dataset import EEGSynthesizer, schedule_events
+    
+    rng = np.random.default_rng(0)
+    synth = EEGSynthesizer(rng, 19, 256, schedule_events(rng, 3600))
+    data, _ = synth.chunk(0, 3600 * 256)
+    
+    def dummy_predict_batch(features):
+        return [{'probabilities': {'NORMAL': 90.0, 'PREICTAL': 5.0, 'SEIZURE': 5.0}} for _ in features]
+    
+    def dummy_features(window, sfreq):
+        return {'std': float(window.std())}
+    
+    start = time.perf_counter()
+    viewer = RecordingViewer(ArrayRecording(data, 256), dummy_predict_batch, dummy_features)
+    print(f"Indexed in {time.perf_counter() - start:.2f}s: {viewer.get_status()}")
+    
+    for window in ((0, 3600), (600, 660), (1000, 1002)):
+        start = time.perf_counter()
+        view = viewer.view(*window)
+        print(f"{window}: {view['min'].shape[1]} points x {len(view['channels'])} channels, "
+              f"{view['bin_samples']} samples per point, {(time.perf_counter() - start) * 1000:.1f} ms")
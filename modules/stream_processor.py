@@ -0,0 +1,212 @@
+"""
+Module 11: Stream Processor
+Turns a continuous stream of raw multichannel EEG frames into sliding-window
+features and predictions, one window per completed hop
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.metrics import timed
+
+
+class RingBuffer:
+    """Fixed-capacity (samples x channels) float32 buffer holding the newest samples"""
+    
+    def __init__(self, capacity: int, n_channels: int):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, n_channels), dtype=np.float32)
+        self.position = 0
+        self.total = 0
+    
+    def write(self, samples: np.ndarray):
+        """Append (n, channels) samples, overwriting the oldest"""
+        n = len(samples)
+        if n >= self.capacity:
+            samples = samples[-self.capacity:]
+            self.data[:] = samples
+            self.position = 0
+        else:
+            first = min(n, self.capacity - self.position)
+            self.data[self.position:self.position + first] = samples[:first]
+            self.data[:n - first] = samples[first:]
+            self.position = (self.position + n) % self.capacity
+        self.total += n
+    
+    def latest(self, n: int) -> np.ndarray:
+        """Copy of the newest n samples in time order"""
+        start = (self.position - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.data[start:start + n].copy()
+        return np.concatenate([self.data[start:], self.data[:self.position]])
+
+
+class StreamProcessor:
+    def __init__(self,
+                 predict_fn: Callable[[Dict], Dict],
+                 feature_fn: Callable[[np.ndarray, float], Dict],
+                 n_channels: int,
+                 sfreq: float = 256.0,
+                 window_seconds: float = 2.0,
+                 hop_seconds: float = 0.5,
+                 max_backlog: int = 4,
+                 stream_id: Optional[str] = None,
+                 alert_engine=None):
+        """
+        Initialize stream processor
+        
+        Args:
+            predict_fn: Maps a feature dict to a prediction result
+            feature_fn: Maps a (channels, samples) window and sfreq to a feature dict
+            n_channels: Channels per sample frame
+            sfreq: Sampling rate in Hz
+            window_seconds: Length of each analysed window
+            hop_seconds: Stride between windows; one prediction per hop
+            max_backlog: Most windows evaluated for one incoming chunk; older
+                completed hops are skipped so latency stays bounded when a
+                client sends faster than real time
+            stream_id: Identifier echoed in every message
+            alert_engine: Optional AlertEngine; adds the smoothed alert level
+                and any onset/offset events to every message
+        """
+        self.predict_fn = predict_fn
+        self.feature_fn = feature_fn
+        self.n_channels = n_channels
+        self.sfreq = sfreq
+        self.window = int(round(window_seconds * sfreq))
+        self.hop = int(round(hop_seconds * sfreq))
+        if self.window <= 0 or self.hop <= 0:
+            raise ValueError("window and hop must each span at least one sample")
+        
+        self.max_backlog = max_backlog
+        self.stream_id = stream_id
+        self.buffer = RingBuffer(self.window, n_channels)
+        self.frame_bytes = 4 * n_channels
+        self.window_index = 0
+        self.skipped = 0
+        self._remainder = b''
+        self.alert_engine = alert_engine
+        self.alert_state = alert_engine.create_state(stream_id) if alert_engine is not None else None
+    
+    def parse(self, data: bytes) -> np.ndarray:
+        """
+        Decode little-endian float32 frames (channel values of one sample
+        after another); bytes of an incomplete trailing frame are kept for
+        the next chunk
+        """
+        if self._remainder:
+            data = self._remainder + data
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = data[usable:]
+        return np.frombuffer(data, dtype='<f4', count=usable // 4).reshape(-1, self.n_channels)
+    
+    def feed(self, data: bytes) -> List[Dict]:
+        """
+        Add a chunk of raw frames and return one window per hop it completes
+        
+        Returns:
+            List of dicts with window_index, start_sample, end_sample and features
+        """
+        samples = self.parse(data)
+        windows = []
+        
+        # Windows end at window + k * hop samples; find those this chunk completes
+        # and evaluate only the newest max_backlog of them
+        total = self.buffer.total
+        if total < self.window:
+            first_end = self.window
+        else:
+            first_end = self.window + ((total - self.window) // self.hop + 1) * self.hop
+        available = total + len(samples)
+        completed = (available - first_end) // self.hop + 1 if available >= first_end else 0
+        evaluate_from = completed - self.max_backlog
+        
+        offset = 0
+        for hop_number in range(completed):
+            end = first_end + hop_number * self.hop
+            self.buffer.write(samples[offset:end - total])
+            offset = end - total
+            
+            if hop_number < evaluate_from:
+                self.skipped += 1
+            else:
+                features = self.feature_fn(self.buffer.latest(self.window).T, self.sfreq)
+                windows.append({
+                    'window_index': self.window_index,
+                    'start_sample': end - self.window,
+                    'end_sample': end,
+                    'features': features
+                })
+            self.window_index += 1
+        
+        self.buffer.write(samples[offset:])
+        return windows
+    
+    def process(self, data: bytes) -> List[Dict]:
+        """
+        feed() then predict every completed window
+        
+        Returns:
+            JSON-serializable messages, one per evaluated window
+        """
+        received = time.perf_counter()
+        messages = []
+        
+        for window in self.feed(data):
+            with timed('stream_prediction'):
+                result = self.predict_fn(window['features'])
+            message = {
+                'stream_id': self.stream_id,
+                'window_index': window['window_index'],
+                'start_time': window['start_sample'] / self.sfreq,
+                'end_time': window['end_sample'] / self.sfreq,
+                'prediction': result['prediction'],
+                'confidence': result['confidence'],
+                'risk_level': result['risk_level'],
+                'probabilities': result['probabilities'],
+                'skipped_windows': self.skipped
+            }
+            if self.alert_state is not None:
+                message['alerts'] = self.alert_engine.update(self.alert_state, result['probabilities'],
+                                                             message['end_time'])
+                message['alert_level'] = self.alert_engine.level(self.alert_state)
+            message['latency_ms'] = (time.perf_counter() - received) * 1000
+            messages.append(message)
+        
+        return messages
+    
+    def get_stats(self) -> Dict:
+        return {
+            'stream_id': self.stream_id,
+            'samples': self.buffer.total,
+            'windows': self.window_index,
+            'skipped_windows': self.skipped,
+            'pending_bytes': len(self._remainder),
+            'alert_level': self.alert_engine.level(self.alert_state) if self.alert_state is not None else None
+        }
+
+
+if __name__ == "__main__":
+    # Test stream processor with a synthetic 19-channel stream
+    def dummy_predict(features):
+        return {'prediction': 'NORMAL', 'confidence': 90.0, 'risk_level': 'LOW',
+                'probabilities': {'NORMAL': 90.0}}
+    
+    def dummy_features(window, sfreq):
+        return {f'ch{i}_std': float(channel.std()) for i, channel in enumerate(window)}
+    
+    processor = StreamProcessor(dummy_predict, dummy_features, n_channels=19, stream_id='demo')
+    stream = np.random.randn(256 * 5, 19).astype('<f4').tobytes()
+    
+    # Send in uneven chunks that split frames
+    for start in range(0, len(stream), 3001):
+        for message in processor.process(stream[start:start + 3001]):
+            print(f"window {message['window_index']}: {message['start_time']:.2f}-{message['end_time']:.2f}s "
+                  f"({message['latency_ms']:.2f} ms)")
+    print(processor.get_stats())
@@ -3,8 +3,15 @@ Module 4: Symptom Checker
 Analyzes user symptoms and provides risk assessment
 """
 import re
+import sys
+from pathlib import Path
 from typing import Dict, List, Tuple
 
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.metrics import timed_stage
+
 
 class SymptomChecker:
     def __init__(self):
@@ -67,6 +74,7 @@ class SymptomChecker:
             }
         }
     
+    @timed_stage('symptom_analysis')
     def analyze_symptoms(self, symptom_text: str) -> Dict:
         """Main method to analyze symptom text"""
         # Normalize text
@@ -0,0 +1,419 @@
+"""
+PyTorch CNN + LSTM Model for Seizure Detection
+CPU implementation of the CNN-LSTM architecture with TorchScript serving
+"""
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+import joblib
+import copy
+import os
+
+# Note: PyTorch is pinned in requirements.txt but still treated as optional
+try:
+    import torch
+    from torch import nn
+    from torch.utils.data import DataLoader, TensorDataset
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+    print("PyTorch not available. Install with: pip install torch")
+
+
+if TORCH_AVAILABLE:
+    class CNNLSTMNetwork(nn.Module):
+        """
+        Layer-for-layer port of the Keras CNN-LSTM network
+        Input is (batch, timesteps, 1), output is class logits
+        """
+        
+        def __init__(self, num_classes=3):
+            super().__init__()
+            
+            # CNN layers for feature extraction
+            blocks = []
+            in_channels = 1
+            for out_channels in (64, 128, 256):
+                blocks += [
+                    nn.Conv1d(in_channels, out_channels, kernel_size=3),
+                    nn.ReLU(),
+                    nn.BatchNorm1d(out_channels),
+                    nn.MaxPool1d(kernel_size=2),
+                    nn.Dropout(0.3)
+                ]
+                in_channels = out_channels
+            self.features = nn.Sequential(*blocks)
+            
+            # LSTM layers for temporal patterns
+            self.lstm1 = nn.LSTM(256, 128, batch_first=True)
+            self.lstm1_dropout = nn.Dropout(0.3)
+            self.lstm2 = nn.LSTM(128, 64, batch_first=True)
+            self.lstm2_dropout = nn.Dropout(0.3)
+            
+            # Dense layers for classification
+            self.classifier = nn.Sequential(
+                nn.Linear(64, 64),
+                nn.ReLU(),
+                nn.Dropout(0.3),
+                nn.Linear(64, 32),
+                nn.ReLU(),
+                nn.Dropout(0.2),
+                nn.Linear(32, num_classes)
+            )
+        
+        def forward(self, x):
+            # Conv1d expects channels first
+            x = self.features(x.transpose(1, 2))
+            
+            x, _ = self.lstm1(x.transpose(1, 2))
+            x = self.lstm1_dropout(x)
+            x, _ = self.lstm2(x)
+            x = self.lstm2_dropout(x[:, -1])
+            
+            return self.classifier(x)
+    
+    class CNNLSTMServingModule(nn.Module):
+        """Wraps the network so the exported graph returns probabilities"""
+        
+        def __init__(self, network):
+            super().__init__()
+            self.network = network
+        
+        def forward(self, x):
+            return torch.softmax(self.network(x), dim=1)
+
+
+class TorchCNNLSTMSeizureModel:
+    """
+    PyTorch CNN + LSTM hybrid model for seizure detection
+    Mirrors the CNNLSTMSeizureModel interface so either backend can be trained or served
+    """
+    
+    def __init__(self, input_shape=(100, 1), num_classes=3, num_threads=None, num_workers=2):
+        """
+        Initialize CNN-LSTM model
+        
+        Args:
+            input_shape: Shape of input data (timesteps, features)
+            num_classes: Number of output classes (3: Normal, Preictal, Seizure)
+            num_threads: Intra-op CPU threads for torch (None keeps the torch default)
+            num_workers: DataLoader worker processes used during training
+        """
+        if not TORCH_AVAILABLE:
+            raise ImportError("PyTorch is required for the PyTorch CNN-LSTM model")
+        
+        self.input_shape = input_shape
+        self.num_classes = num_classes
+        self.num_workers = num_workers
+        self.model = None
+        self.scaler = StandardScaler()
+        self.history = None
+        
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+    
+    def build_model(self):
+        """Build CNN + LSTM architecture"""
+        self.model = CNNLSTMNetwork(num_classes=self.num_classes)
+        return self.model
+    
+    def prepare_data(self, X, y, test_size=0.2):
+        """Prepare and reshape data for CNN-LSTM"""
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=42, stratify=y
+        )
+        
+        # Scale features
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
+        
+        # Reshape for CNN-LSTM (samples, timesteps, features)
+        X_train_reshaped = X_train_scaled.reshape(X_train_scaled.shape[0], -1, 1)
+        X_test_reshaped = X_test_scaled.reshape(X_test_scaled.shape[0], -1, 1)
+        
+        return X_train_reshaped, X_test_reshaped, y_train, y_test
+    
+    def _make_loader(self, X, y, batch_size, shuffle):
+        """Wrap arrays in a DataLoader"""
+        dataset = TensorDataset(
+            torch.as_tensor(np.asarray(X), dtype=torch.float32),
+            torch.as_tensor(np.asarray(y), dtype=torch.long)
+        )
+        return DataLoader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=shuffle,
+            num_workers=self.num_workers,
+            persistent_workers=self.num_workers > 0
+        )
+    
+    def train(self, X_train, y_train, X_val, y_val, epochs=50, batch_size=32, patience=10):
+        """Train the model with early stopping on validation loss"""
+        if self.model is None:
+            self.build_model()
+        
+        train_loader = self._make_loader(X_train, y_train, batch_size, shuffle=True)
+        optimizer = torch.optim.Adam(self.model.parameters(), lr=1e-3)
+        criterion = nn.CrossEntropyLoss()
+        
+        self.history = {'loss': [], 'accuracy': [], 'val_loss': [], 'val_accuracy': []}
+        best_loss = float('inf')
+        best_state = None
+        epochs_without_improvement = 0
+        
+        for epoch in range(epochs):
+            self.model.train()
+            total_loss = 0.0
+            correct = 0
+            
+            for X_batch, y_batch in train_loader:
+                optimizer.zero_grad()
+                logits = self.model(X_batch)
+                loss = criterion(logits, y_batch)
+                loss.backward()
+                optimizer.step()
+                
+                total_loss += loss.item() * len(y_batch)
+                correct += (logits.argmax(dim=1) == y_batch).sum().item()
+            
+            val_accuracy, val_loss = self._score(X_val, y_val)
+            self.history['loss'].append(total_loss / len(train_loader.dataset))
+            self.history['accuracy'].append(correct / len(train_loader.dataset))
+            self.history['val_loss'].append(val_loss)
+            self.history['val_accuracy'].append(val_accuracy)
+            
+            print(f"Epoch {epoch + 1}/{epochs} - loss: {self.history['loss'][-1]:.4f} - "
+                  f"val_loss: {val_loss:.4f} - val_accuracy: {val_accuracy:.4f}")
+            
+            # Early stopping (restores best weights like the Keras callback)
+            if val_loss < best_loss:
+                best_loss = val_loss
+                best_state = copy.deepcopy(self.model.state_dict())
+                epochs_without_improvement = 0
+            else:
+                epochs_without_improvement += 1
+                if epochs_without_improvement >= patience:
+                    break
+        
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
+        
+        return self.history
+    
+    def _score(self, X, y):
+        """Return (accuracy, loss) without printing"""
+        self.model.eval()
+        with torch.inference_mode():
+            logits = self.model(torch.as_tensor(np.asarray(X), dtype=torch.float32))
+            targets = torch.as_tensor(np.asarray(y), dtype=torch.long)
+            loss = nn.functional.cross_entropy(logits, targets).item()
+            accuracy = (logits.argmax(dim=1) == targets).float().mean().item()
+        return accuracy, loss
+    
+    def evaluate(self, X_test, y_test):
+        """Evaluate model performance"""
+        accuracy, loss = self._score(X_test, y_test)
+        
+        print(f"\n{'='*50}")
+        print(f"Test Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)")
+        print(f"Test Loss: {loss:.4f}")
+        print(f"{'='*50}")
+        
+        return accuracy, loss
+    
+    def predict(self, X):
+        """Make predictions"""
+        # Scale and reshape
+        X_scaled = self.scaler.transform(X)
+        X_reshaped = X_scaled.reshape(X_scaled.shape[0], -1, 1)
+        
+        # Predict
+        self.model.eval()
+        with torch.inference_mode():
+            logits = self.model(torch.as_tensor(X_reshaped, dtype=torch.float32))
+            predictions = torch.softmax(logits, dim=1).numpy()
+        predicted_classes = np.argmax(predictions, axis=1)
+        
+        return predicted_classes, predictions
+    
+    def export_torchscript(self, model_dir='models', quantize=True):
+        """
+        Export model to TorchScript for serving
+        
+        Args:
+            model_dir: Directory to write the TorchScript file and scaler to
+            quantize: Apply dynamic int8 quantization to the LSTM and Linear layers
+        """
+        os.makedirs(model_dir, exist_ok=True)
+        
+        network = copy.deepcopy(self.model).eval()
+        if quantize:
+            network = torch.ao.quantization.quantize_dynamic(
+                network, {nn.LSTM, nn.Linear}, dtype=torch.qint8
+            )
+        
+        serving_module = CNNLSTMServingModule(network).eval()
+        example = torch.zeros((1,) + tuple(self.input_shape), dtype=torch.float32)
+        with torch.inference_mode():
+            scripted = torch.jit.trace(serving_module, example)
+        
+        script_path = os.path.join(model_dir, 'torch_cnn_lstm_model.ts')
+        scripted.save(script_path)
+        
+        scaler_path = os.path.join(model_dir, 'torch_cnn_lstm_scaler.pkl')
+        joblib.dump(self.scaler, scaler_path)
+        
+        print(f"\nTorchScript model saved to: {script_path}")
+        print(f"Scaler saved to: {scaler_path}")
+        
+        return script_path
+    
+    def save_model(self, model_dir='models'):
+        """Save model weights and scaler"""
+        os.makedirs(model_dir, exist_ok=True)
+        
+        # Save weights
+        model_path = os.path.join(model_dir, 'torch_cnn_lstm_model.pt')
+        torch.save(self.model.state_dict(), model_path)
+        
+        # Save scaler
+        scaler_path = os.path.join(model_dir, 'torch_cnn_lstm_scaler.pkl')
+        joblib.dump(self.scaler, scaler_path)
+        
+        print(f"\nModel saved to: {model_path}")
+        print(f"Scaler saved to: {scaler_path}")
+    
+    def load_model(self, model_dir='models'):
+        """Load saved model weights and scaler"""
+        model_path = os.path.join(model_dir, 'torch_cnn_lstm_model.pt')
+        scaler_path = os.path.join(model_dir, 'torch_cnn_lstm_scaler.pkl')
+        
+        self.build_model()
+        self.model.load_state_dict(torch.load(model_path, map_location='cpu'))
+        self.model.eval()
+        self.scaler = joblib.load(scaler_path)
+        
+        print("Model and scaler loaded successfully!")
+
+
+class TorchScriptSeizurePredictor:
+    """
+    Serving wrapper for an exported TorchScript CNN-LSTM
+    Exposes the same predict(X) contract as CNNLSTMSeizureModel
+    """
+    
+    def __init__(self, model_dir='models', num_threads=None):
+        """
+        Initialize TorchScript predictor
+        
+        Args:
+            model_dir: Directory containing torch_cnn_lstm_model.ts and its scaler
+            num_threads: Intra-op CPU threads for torch (None keeps the torch default)
+        """
+        if not TORCH_AVAILABLE:
+            raise ImportError("PyTorch is required for TorchScript serving")
+        
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        
+        self.model_dir = model_dir
+        self.model = None
+        self.scaler = None
+        self.load_model()
+    
+    def load_model(self):
+        """Load TorchScript model and scaler"""
+        script_path = os.path.join(self.model_dir, 'torch_cnn_lstm_model.ts')
+        scaler_path = os.path.join(self.model_dir, 'torch_cnn_lstm_scaler.pkl')
+        
+        self.model = torch.jit.load(script_path, map_location='cpu')
+        self.model.eval()
+        self.scaler = joblib.load(scaler_path)
+        
+        print("TorchScript model and scaler loaded successfully!")
+    
+    def predict(self, X):
+        """Make predictions"""
+        # Scale and reshape
+        X_scaled = self.scaler.transform(X)
+        X_reshaped = X_scaled.reshape(X_scaled.shape[0], -1, 1)
+        
+        # Predict
+        with torch.inference_mode():
+            predictions = self.model(torch.as_tensor(X_reshaped, dtype=torch.float32)).numpy()
+        predicted_classes = np.argmax(predictions, axis=1)
+        
+        return predicted_classes, predictions
+
+
+def train_torch_cnn_lstm_model(dataset_path='datasets/seizure_dataset.csv', num_threads=None, num_workers=2):
+    """
+    Complete training pipeline for the PyTorch CNN-LSTM model
+    """
+    if not TORCH_AVAILABLE:
+        print("PyTorch not available. Please install: pip install torch")
+        return
+    
+    print("Loading dataset...")
+    df = pd.read_csv(dataset_path)
+    
+    # Prepare features and target
+    if 'target' in df.columns:
+        target_col = 'target'
+    elif 'label' in df.columns:
+        target_col = 'label'
+    elif 'class' in df.columns:
+        target_col = 'class'
+    else:
+        target_col = df.columns[-1]
+    
+    X = df.drop(columns=[target_col]).values
+    y = df[target_col].values
+    
+    print(f"Dataset shape: {X.shape}")
+    print(f"Classes: {np.unique(y)}")
+    
+    # Initialize model
+    input_shape = (X.shape[1], 1)
+    model = TorchCNNLSTMSeizureModel(
+        input_shape=input_shape,
+        num_classes=len(np.unique(y)),
+        num_threads=num_threads,
+        num_workers=num_workers
+    )
+    
+    # Prepare data
+    X_train, X_test, y_train, y_test = model.prepare_data(X, y)
+    
+    print(f"\nTraining set: {X_train.shape}")
+    print(f"Test set: {X_test.shape}")
+    
+    # Build and train
+    print("\nBuilding CNN-LSTM model...")
+    model.build_model()
+    print(model.model)
+    
+    print("\nTraining model...")
+    model.train(X_train, y_train, X_test, y_test, epochs=50, batch_size=32)
+    
+    # Evaluate
+    print("\nEvaluating model...")
+    accuracy, loss = model.evaluate(X_test, y_test)
+    
+    # Save
+    model.save_model()
+    model.export_torchscript()
+    
+    print("\n✓ PyTorch CNN-LSTM model training complete!")
+    
+    return model
+
+
+if __name__ == "__main__":
+    if TORCH_AVAILABLE:
+        train_torch_cnn_lstm_model()
+    else:
+        print("Please install PyTorch to use the PyTorch CNN-LSTM model:")
+        print("pip install torch")
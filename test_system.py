@@ -88,6 +88,208 @@ def test_doctor_recommender():
         return False
 
 
+def test_doctor_store():
+    """Test the columnar doctor store against the pandas filter and sort it replaced, and its JSON bytes"""
+    print("\nTesting Doctor Store...")
+    try:
+        import json
+        from generate_sample_dataset import create_doctor_directory
+        from modules.doctor_recommender import DoctorRecommender, DOCTOR_COLUMNS
+        
+        recommender = DoctorRecommender()
+        df = create_doctor_directory(5000, random_state=0)
+        recommender.doctors_df = df
+        
+        for kwargs in ({}, {'risk_level': 'HIGH', 'location': 'boston'},
+                       {'location': 'tx', 'specialization': 'epilepsy', 'top_n': 40}):
+            expected = df
+            if kwargs.get('risk_level') == 'HIGH':
+                expected = expected[expected['accepts_emergency']]
+            for field in ('location', 'specialization'):
+                if field in kwargs:
+                    expected = expected[expected[field].str.contains(kwargs[field], case=False)]
+            expected = expected.sort_values(['rating', 'experience_years'], ascending=False, kind='stable')
+            expected = expected.head(kwargs.get('top_n', 5))[list(DOCTOR_COLUMNS)].to_dict('records')
+            
+            doctors = recommender.recommend_doctors(**kwargs)
+            assert doctors == expected
+            # Same bytes jsonify would write for the dicts
+            assert recommender.recommend_doctors_json(**kwargs) == json.dumps(
+                doctors, sort_keys=True, separators=(',', ':')).encode()
+        
+        assert recommender.recommend_doctors_json(location='nowhere') == b'[]'
+        assert recommender.doctors_df['name'].tolist() == df['name'].tolist()
+        
+        print(f"✓ Doctor store working")
+        print(f"  - {recommender.store.nbytes() / 1e6:.2f} MB vs {df.memory_usage(deep=True).sum() / 1e6:.2f} MB as a DataFrame")
+        return True
+    except Exception as e:
+        print(f"✗ Doctor store error: {str(e)}")
+        return False
+
+
+def test_doctor_reload():
+    """Test incremental reload of a changed doctor CSV against a fresh load, with queries running meanwhile"""
+    print("\nTesting Doctor Reload...")
+    try:
+        import os
+        import tempfile
+        import threading
+        import numpy as np
+        import pandas as pd
+        from generate_sample_dataset import create_doctor_directory
+        from modules.doctor_recommender import DoctorRecommender
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'neurologists.csv')
+            df = create_doctor_directory(5000, random_state=0)
+            df.to_csv(path, index=False)
+            recommender = DoctorRecommender(csv_path=path)
+            assert recommender.reload() == {'changed': False}
+            
+            # Edit ratings, drop rows and add doctors with a new name and city
+            rng = np.random.default_rng(0)
+            edited = df.copy()
+            edited.loc[rng.choice(len(df), 50, replace=False), 'rating'] = 2.5
+            edited = edited.drop(index=rng.choice(len(df), 20, replace=False))
+            added = create_doctor_directory(10, random_state=1)
+            added.loc[0, ['name', 'location']] = ['Dr. Zed Quorra', 'Reno, NV']
+            edited = pd.concat([edited.iloc[:2000], added, edited.iloc[2000:]], ignore_index=True)
+            edited.to_csv(path, index=False)
+            
+            errors, done = [], threading.Event()
+            
+            def query():
+                while not done.is_set():
+                    try:
+                        recommender.recommend_doctors_json(risk_level='HIGH', top_n=10)
+                        recommender.search_doctors('Okafr', top_n=5)
+                        recommender.nearest_doctors(42.3, -71.0, top_n=5)
+                    except Exception as e:
+                        errors.append(e)
+            
+            thread = threading.Thread(target=query)
+            thread.start()
+            result = recommender.reload()
+            done.set()
+            thread.join()
+            assert not errors, errors[0]
+            assert result['incremental'] and result['added'] == 60 and result['removed'] == 70
+            assert 'name' in result['rebuilt'] and 'hospital' not in result['rebuilt']
+            
+            fresh = DoctorRecommender(csv_path=path)
+            for kwargs in ({'top_n': 30}, {'risk_level': 'HIGH', 'location': 'reno'}):
+                assert recommender.recommend_doctors_json(**kwargs) == fresh.recommend_doctors_json(**kwargs)
+            assert recommender.search_doctors('Zed Quora') == fresh.search_doctors('Zed Quora')
+            assert recommender.search_doctors('Zed Quora')[0]['name'] == 'Dr. Zed Quorra'
+            assert recommender.nearest_doctors(39.5, -119.8, top_n=5) == fresh.nearest_doctors(39.5, -119.8, top_n=5)
+            assert recommender.get_all_locations() == fresh.get_all_locations()
+            
+            # Only one row changes, so its types would be guessed from it alone
+            edited.loc[0, 'phone'] = '5551234567'
+            edited.to_csv(path, index=False)
+            assert recommender.reload()['added'] == 1
+            fresh = DoctorRecommender(csv_path=path)
+            name = edited.loc[0, 'name']
+            assert recommender.search_doctors(name, top_n=50) == fresh.search_doctors(name, top_n=50)
+            assert '5551234567' in [doctor['phone'] for doctor in recommender.search_doctors(name, top_n=50)]
+        
+        print(f"✓ Doctor reload working")
+        print(f"  - {result['added']} rows parsed, {result['removed']} removed in {result['seconds']}s "
+              f"(rebuilt: {', '.join(result['rebuilt'])})")
+        return True
+    except Exception as e:
+        print(f"✗ Doctor reload error: {str(e)}")
+        return False
+
+
+def test_nearest_doctors():
+    """Test KD-tree nearest-doctor search against a brute-force haversine scan"""
+    print("\nTesting Nearest Doctors...")
+    try:
+        import numpy as np
+        from generate_sample_dataset import create_doctor_directory
+        from modules.doctor_recommender import DoctorRecommender, EARTH_RADIUS_KM
+        
+        recommender = DoctorRecommender()
+        df = create_doctor_directory(20000, random_state=0)
+        df.loc[:99, ['latitude', 'longitude']] = np.nan
+        df.loc[:49, 'location'] = 'Unknown'
+        recommender.doctors_df = df
+        
+        # Missing coordinates fall back to the city's; unknown cities are left out
+        latitude, longitude = np.radians(recommender.geo_index.latitude), np.radians(recommender.geo_index.longitude)
+        assert np.isnan(latitude[:50]).all() and not np.isnan(latitude[50:]).any()
+        
+        lat, lon = np.radians(32.0), np.radians(-97.5)
+        a = np.sin((latitude - lat) / 2) ** 2 + np.cos(lat) * np.cos(latitude) * np.sin((longitude - lon) / 2) ** 2
+        distance_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+        located = ~np.isnan(distance_km)
+        
+        nearest = recommender.nearest_doctors(32.0, -97.5, top_n=10, rank_by='distance')
+        expected = np.sort(distance_km[located])[:10]
+        assert np.allclose([d['distance_km'] for d in nearest], expected, atol=0.01)
+        
+        matches = (located & df['accepts_emergency'].to_numpy()
+                   & df['specialization'].str.contains('epilepsy', case=False).to_numpy()
+                   & (np.nan_to_num(distance_km, nan=np.inf) <= 400))
+        scores = df['rating'].to_numpy() * np.exp(-distance_km / 50.0)
+        best = recommender.nearest_doctors(32.0, -97.5, top_n=5, radius_km=400, specialization='epilepsy',
+                                           emergency=True)
+        expected = np.sort(scores[matches])[::-1][:5]
+        assert np.allclose([d['score'] for d in best], expected, atol=1e-4)
+        assert all(d['accepts_emergency'] and d['distance_km'] <= 400 for d in best)
+        assert recommender.nearest_doctors(32.0, -97.5, radius_km=1) == []
+        
+        print(f"✓ Nearest doctors working")
+        print(f"  - Nearest: {nearest[0]['name']}, {nearest[0]['location']} ({nearest[0]['distance_km']} km)")
+        return True
+    except Exception as e:
+        print(f"✗ Nearest doctors error: {str(e)}")
+        return False
+
+
+def test_doctor_search():
+    """Test typo-tolerant doctor search and autocomplete on the trigram index"""
+    print("\nTesting Doctor Search...")
+    try:
+        from generate_sample_dataset import create_doctor_directory
+        from modules.doctor_recommender import DoctorRecommender
+        from utils.trigram_index import edit_distances
+        import numpy as np
+        
+        # Substring edit distance: "smth" is one edit from a word of the text
+        texts = [b'dr john smith', b'smith', b'xyz']
+        matrix = np.zeros((3, 13), dtype=np.uint8)
+        for i, text in enumerate(texts):
+            matrix[i, :len(text)] = np.frombuffer(text, np.uint8)
+        assert edit_distances(b'smth', matrix, np.array([13, 5, 3])).tolist() == [1, 1, 4]
+        assert edit_distances(b'jonh', matrix, np.array([13, 5, 3]))[0] == 1
+        
+        recommender = DoctorRecommender()
+        recommender.doctors_df = create_doctor_directory(5000, random_state=0)
+        
+        # Misspelled last name and city
+        doctors = recommender.search_doctors('Okafr', top_n=5)
+        assert len(doctors) == 5 and all(d['name'].endswith('Okafor') and d['edit_distance'] == 1 for d in doctors)
+        assert [d['rating'] for d in doctors] == sorted((d['rating'] for d in doctors), reverse=True)
+        doctors = recommender.search_doctors('Bostn', fields=('location',), top_n=3)
+        assert doctors and all(d['location'] == 'Boston, MA' for d in doctors)
+        assert recommender.search_by_name('qqqqqq') == []
+        
+        suggestions = recommender.autocomplete('bos')
+        assert suggestions[0] == {'text': 'Boston, MA', 'field': 'location',
+                                  'doctors': int((recommender.doctors_df['location'] == 'Boston, MA').sum())}
+        assert all(s['text'].lower().split()[-1].startswith('ok') for s in recommender.autocomplete('ok', fields=('name',)))
+        
+        print(f"✓ Doctor search working")
+        print(f"  - 'bos' suggests {suggestions[0]['text']} ({suggestions[0]['doctors']} doctors)")
+        return True
+    except Exception as e:
+        print(f"✗ Doctor search error: {str(e)}")
+        return False
+
+
 def test_file_processor():
     """Test file processor module"""
     print("\nTesting File Processor...")
@@ -108,6 +310,31 @@ def test_file_processor():
         return False
 
 
+def test_text_numbers():
+    """Test vectorized number parsing matches the regex it replaces, and labelled values"""
+    print("\nTesting Text Number Extraction...")
+    try:
+        import re
+        import numpy as np
+        from utils.text_numbers import extract_numbers
+        
+        text = ("EEG report 2024-01-15\nDelta power: 12.5 uV\ndelta power = 13.5\n"
+                "Fp1-F7: -3.25, range 5-3, version 1.2.3, 12. at 12:30")
+        numbers, labelled = extract_numbers(text)
+        expected = [float(n) for n in re.findall(r'-?\d+\.?\d*', text)]
+        
+        assert np.array_equal(numbers, expected)
+        assert labelled == {'delta_power': 13.0, 'fp1_f7': -3.25}
+        assert len(extract_numbers("no digits here")[0]) == 0
+        
+        print(f"✓ Text number extraction working")
+        print(f"  - {len(numbers)} numbers, labels: {', '.join(labelled)}")
+        return True
+    except Exception as e:
+        print(f"✗ Text number extraction error: {str(e)}")
+        return False
+
+
 def test_predictor():
     """Test predictor module (requires trained model)"""
     print("\nTesting Predictor...")
@@ -138,6 +365,500 @@ def test_predictor():
         return False
 
 
+def test_model_registry():
+    """Test model registry hot swap (requires trained model)"""
+    print("\nTesting Model Registry...")
+    try:
+        import time
+        from modules.model_registry import ModelRegistry
+        import numpy as np
+        
+        registry = ModelRegistry()
+        registry.register('v1', 'random_forest', 'models')
+        registry.register('v2', 'random_forest', 'models')
+        registry.load('v1')
+        registry.activate('v1')
+        
+        with registry.acquire() as (version, predictor):
+            dummy_features = {col: np.random.randn() for col in predictor.feature_columns}
+            
+            # Swap while a request is in flight on v1
+            registry.load('v2')
+            registry.activate('v2')
+            assert registry.versions['v1'].predictor is not None
+        
+        assert registry.versions['v1'].predictor is None
+        result = registry.predict(dummy_features)
+        assert 'prediction' in result
+        
+        # Activating a version while it loads (as POST /api/models/<v>/activate
+        # does) waits for that load instead of failing
+        registry.register('v3', 'random_forest', 'models')
+        create_predictor = registry._create_predictor
+        registry._create_predictor = lambda entry: (time.sleep(0.5), create_predictor(entry))[1]
+        loading = registry.load_async('v3')
+        while registry.versions['v3'].status != 'loading':
+            time.sleep(0.01)
+        registry.load_async('v3', activate=True).join()
+        loading.join()
+        assert registry.active_version == 'v3'
+        
+        print(f"✓ Model Registry working")
+        print(f"  - Active version: {registry.active_version}")
+        return True
+    except FileNotFoundError:
+        print(f"⚠ Model Registry: Model not found (train model first)")
+        return None
+    except Exception as e:
+        print(f"✗ Model Registry error: {str(e)}")
+        return False
+
+
+def test_incremental_updater():
+    """Test feedback-driven incremental model updates (requires trained model)"""
+    print("\nTesting Incremental Updater...")
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        from modules.model_registry import ModelRegistry
+        from modules.incremental_updater import FeedbackStore, IncrementalUpdater
+        
+        registry = ModelRegistry()
+        registry.register('default', 'random_forest', 'models')
+        registry.load('default')
+        registry.activate('default')
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FeedbackStore(os.path.join(tmp, 'feedback.jsonl'))
+            with registry.acquire() as (_, predictor):
+                columns = predictor.feature_columns
+                n_trees = len(predictor.model.estimators_)
+            
+            # Only one class confirmed; the new trees must still cover every class
+            for _ in range(20):
+                store.add({col: np.random.randn() + 1 for col in columns}, 2)
+            
+            updater = IncrementalUpdater(registry, store, versions_root=tmp, trees_per_update=5,
+                                         min_new_labels=10, publish='activate')
+            summary = updater.update()
+            assert summary['trees'] == n_trees + 5 and updater.pending_labels() == 0
+            assert registry.active_version == summary['version']
+            assert len(registry.predict({col: 0.0 for col in columns})['probabilities']) == 3
+        
+        print(f"✓ Incremental Updater working")
+        print(f"  - Published: {summary['version']} in {summary['fit_seconds']:.2f}s")
+        return True
+    except FileNotFoundError:
+        print(f"⚠ Incremental Updater: Model not found (train model first)")
+        return None
+    except Exception as e:
+        print(f"✗ Incremental Updater error: {str(e)}")
+        return False
+
+
+def test_prediction_cache():
+    """Test prediction cache keying, eviction and invalidation"""
+    print("\nTesting Prediction Cache...")
+    try:
+        from modules.prediction_cache import PredictionCache
+        
+        cache = PredictionCache(capacity=2, ttl_seconds=60, decimals=2)
+        columns = ['feature_1', 'feature_2']
+        
+        key = cache.make_key('v1', {'feature_1': 0.1234, 'feature_2': 1.0}, columns)
+        result = {'prediction': 'NORMAL', 'probabilities': {'NORMAL': 90.0}}
+        cache.put(key, result)
+        result['probabilities']['NORMAL'] = 0.0
+        
+        # Near-identical vectors share an entry, other versions do not
+        hit = cache.get(cache.make_key('v1', {'feature_1': 0.1229, 'feature_2': 1.0}, columns))
+        assert hit['probabilities'] == {'NORMAL': 90.0}
+        hit['probabilities']['NORMAL'] = 0.0
+        assert cache.get(key)['probabilities'] == {'NORMAL': 90.0}
+        assert cache.get(cache.make_key('v2', {'feature_1': 0.1234, 'feature_2': 1.0}, columns)) is None
+        
+        # Least recently used entry is evicted first
+        cache.put(cache.make_key('v1', {'feature_1': 2.0}, columns), {'prediction': 'SEIZURE'})
+        cache.put(cache.make_key('v1', {'feature_1': 3.0}, columns), {'prediction': 'PREICTAL'})
+        assert cache.get(key) is None
+        
+        cache.clear()
+        assert cache.get_stats()['size'] == 0
+        
+        print(f"✓ Prediction Cache working")
+        print(f"  - Hit rate: {cache.get_stats()['hit_rate']:.2f}")
+        return True
+    except Exception as e:
+        print(f"✗ Prediction Cache error: {str(e)}")
+        return False
+
+
+def test_asgi_backpressure():
+    """Test a full ASGI pool rejects a prediction before it reaches the micro batcher, and stream slots are returned"""
+    print("\nTesting ASGI Backpressure...")
+    try:
+        import asyncio
+        import sys
+        import threading
+        from pathlib import Path
+        try:
+            sys.path.append(str(Path(__file__).parent / 'backend'))
+            from asgi import BoundedPool, DuplexStreamingResponse, ServiceBusy
+        except ImportError as e:
+            print(f"⚠ ASGI Backpressure: {str(e)}")
+            return None
+        from modules.micro_batcher import MicroBatcher
+        
+        received = []
+        batcher = MicroBatcher(lambda batch: received.extend(batch) or [len(received)] * len(batch),
+                               max_batch_size=8, max_wait_ms=1)
+        pool = BoundedPool('test', max_workers=1, max_pending=1)
+        
+        pool.in_flight = pool.max_pending
+        try:
+            asyncio.run(pool.wait(batcher.submit, {'feature_1': 0.0}))
+            raise AssertionError("A full pool admitted the request")
+        except ServiceBusy:
+            pass
+        assert received == [] and pool.in_flight == pool.max_pending
+        
+        pool.in_flight = 0
+        assert asyncio.run(pool.wait(batcher.submit, {'feature_1': 1.0})) == 1
+        assert received == [{'feature_1': 1.0}] and pool.in_flight == 0
+        
+        # A batch function returning too few results fails every waiting request
+        short = MicroBatcher(lambda batch: batch[:-1], max_batch_size=8, max_wait_ms=1, timeout_s=1)
+        try:
+            short.predict({'feature_1': 2.0})
+            raise AssertionError("A short result list was not reported")
+        except RuntimeError:
+            pass
+        assert short.timeout == 1
+        
+        # A client gone before the response starts still returns its stream slot
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        
+        async def body():
+            yield 'never sent'
+        
+        async def send(message):
+            raise OSError("client disconnected")
+        
+        response = DuplexStreamingResponse(body(), on_close=slots.release, media_type='application/x-ndjson')
+        try:
+            asyncio.run(response({'type': 'http'}, None, send))
+            raise AssertionError("The failed send was not raised")
+        except OSError:
+            pass
+        assert slots.acquire(blocking=False)
+        
+        print(f"✓ ASGI backpressure working")
+        print(f"  - Rejected request never queued, stream slot returned")
+        return True
+    except Exception as e:
+        print(f"✗ ASGI backpressure error: {str(e)}")
+        return False
+
+
+def test_metrics():
+    """Test stage timing histograms and Prometheus output"""
+    print("\nTesting Metrics...")
+    try:
+        from utils.metrics import metrics, timed
+        from modules.symptom_checker import SymptomChecker
+        
+        with timed('test_stage'):
+            pass
+        SymptomChecker().analyze_symptoms("I had a seizure")
+        
+        text = metrics.render()
+        assert '# TYPE seizureguard_stage_duration_seconds histogram' in text
+        assert 'seizureguard_stage_duration_seconds_count{stage="test_stage"} 1' in text
+        assert 'stage="symptom_analysis",le="+Inf"' in text
+        
+        print(f"✓ Metrics working")
+        return True
+    except Exception as e:
+        print(f"✗ Metrics error: {str(e)}")
+        return False
+
+
+def test_eeg_dataset():
+    """Test synthetic EEG shards and the EDF writer"""
+    print("\nTesting EEG Dataset Generator...")
+    try:
+        import tempfile
+        import numpy as np
+        from generate_eeg_dataset import write_shard
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            seed = np.random.SeedSequence(7)
+            npy = write_shard(0, seed, tmp, fmt='npy', duration_s=20, n_channels=4, seizures_per_hour=0)
+            data = np.load(f"{tmp}/{npy['files'][0]}")
+            assert data.shape == (20 * 256, 4) and data.dtype == np.float32
+            
+            edf = write_shard(1, seed, tmp, fmt='edf', duration_s=20, n_channels=4, seizures_per_hour=0)
+            with open(f"{tmp}/{edf['files'][0]}", 'rb') as f:
+                raw = f.read()
+            header_bytes, n_records = int(raw[184:192]), int(raw[236:244])
+            assert header_bytes == 256 * 5 and n_records == 20
+            assert len(raw) == header_bytes + n_records * 4 * 256 * 2
+            
+            # Same seed sequence, same samples in every format
+            edf_samples = np.frombuffer(raw[header_bytes:header_bytes + 512], '<i2')
+            expected = np.rint((data[:256, 0].astype(np.float64) + 1000) * 65535 / 2000 - 32768)
+            assert np.array_equal(edf_samples[:256], expected)
+        
+        print(f"✓ EEG dataset generator working")
+        return True
+    except Exception as e:
+        print(f"✗ EEG dataset generator error: {str(e)}")
+        return False
+
+
+def test_stream_processor():
+    """Test sliding windows over an arbitrarily chunked EEG stream"""
+    print("\nTesting Stream Processor...")
+    try:
+        import numpy as np
+        from modules.stream_processor import StreamProcessor
+        
+        def predict(features):
+            return {'prediction': 'NORMAL', 'confidence': 100.0, 'risk_level': 'LOW',
+                    'probabilities': {'NORMAL': 100.0}}
+        
+        windows = []
+        def features(window, sfreq):
+            windows.append(window)
+            return {}
+        
+        signal = np.random.randn(256 * 4, 3).astype('<f4')
+        processor = StreamProcessor(predict, features, n_channels=3, window_seconds=1, hop_seconds=0.25)
+        
+        # Chunks that split frames must give the same windows as one big write
+        raw = signal.tobytes()
+        messages = []
+        for start in range(0, len(raw), 1001):
+            messages += processor.process(raw[start:start + 1001])
+        
+        assert [m['window_index'] for m in messages] == list(range(13))
+        assert messages[-1]['end_time'] == 4.0
+        assert np.array_equal(windows[5], signal[5 * 64:5 * 64 + 256].T)
+        
+        # A burst far ahead of real time only evaluates the newest max_backlog hops
+        burst = StreamProcessor(predict, features, n_channels=3, window_seconds=1, hop_seconds=0.25,
+                                max_backlog=2)
+        assert len(burst.process(raw)) == 2 and burst.skipped == 11
+        
+        print(f"✓ Stream processor working")
+        print(f"  - {len(messages)} windows from {len(raw)} bytes")
+        return True
+    except Exception as e:
+        print(f"✗ Stream processor error: {str(e)}")
+        return False
+
+
+def test_alert_engine():
+    """Test smoothed, debounced alert onsets and offsets"""
+    print("\nTesting Alert Engine...")
+    try:
+        from modules.alert_engine import AlertEngine
+        
+        engine = AlertEngine(alpha=0.5, onset_windows=2, offset_windows=2)
+        normal = {'NORMAL': 90, 'PREICTAL': 5, 'SEIZURE': 5}
+        seizure = {'NORMAL': 5, 'PREICTAL': 5, 'SEIZURE': 90}
+        
+        # A single seizure window between normal ones must not raise an alert
+        timeline = [normal] * 4 + [seizure] + [normal] * 4
+        assert engine.evaluate([{'time': i, 'probabilities': p} for i, p in enumerate(timeline)])['events'] == []
+        
+        timeline = [normal] * 4 + [seizure] * 6 + [normal] * 6
+        events = engine.evaluate([{'time': i, 'probabilities': p} for i, p in enumerate(timeline)])['events']
+        assert [(e['event'], e['level']) for e in events] == [('onset', 'SEIZURE'), ('offset', 'SEIZURE')]
+        assert events[1]['duration'] > 0
+        
+        # Engine-held state per stream
+        for t in range(3):
+            engine.update_stream('a', seizure, t)
+            engine.update_stream('b', normal, t)
+        assert engine.get_status() == {'streams': 2, 'active_alerts': {'SEIZURE': 1}}
+        
+        print(f"✓ Alert engine working")
+        print(f"  - Seizure alert at {events[0]['time']}s, cleared at {events[1]['time']}s")
+        return True
+    except Exception as e:
+        print(f"✗ Alert engine error: {str(e)}")
+        return False
+
+
+def test_ocr_preprocessing():
+    """Test deskew and text-region detection on a rotated synthetic photo"""
+    print("\nTesting OCR Preprocessing...")
+    try:
+        import os
+        import tempfile
+        import cv2
+        import numpy as np
+        from benchmarks.bench_ocr import render_report_photo
+        from utils.ocr import load_grayscale, preprocess_for_ocr, find_text_regions, estimate_skew
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.jpg')
+            render_report_photo(path, np.random.default_rng(0), angle=3.0)
+            gray, shape = load_grayscale(path)
+        
+        page, angle = preprocess_for_ocr(gray)
+        regions = find_text_regions(page)
+        
+        # PIL rotates counter-clockwise, so the correction is negative
+        assert shape == (4032, 3024) and page.shape[1] == 2550
+        assert abs(angle + 3.0) < 0.5 and abs(estimate_skew(page)) < 0.3
+        # Title and table, plus at most a few specks
+        assert 2 <= len(regions) <= 5
+        assert max(w * h for _, _, w, h in regions) < 0.3 * page.size
+        
+        print(f"✓ OCR preprocessing working")
+        print(f"  - Deskewed {angle:+.2f} degrees, {len(regions)} text regions")
+        return True
+    except Exception as e:
+        print(f"✗ OCR preprocessing error: {str(e)}")
+        return False
+
+
+def test_waveform_digitizer():
+    """Test signal recovery from a rendered EEG chart, and that a report is not mistaken for one"""
+    print("\nTesting Waveform Digitizer...")
+    try:
+        import os
+        import tempfile
+        import cv2
+        import numpy as np
+        from benchmarks.bench_ocr import render_report_photo
+        from generate_eeg_dataset import EEGSynthesizer, schedule_events, render_chart
+        from utils.ocr import load_grayscale
+        from utils.waveform_digitizer import digitize_strip
+        
+        rng = np.random.default_rng(3)
+        synth = EEGSynthesizer(rng, 19, 256, schedule_events(rng, 10, seizures_per_hour=0))
+        data, _ = synth.chunk(0, 2560)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            chart_path = os.path.join(tmp, 'chart.png')
+            report_path = os.path.join(tmp, 'report.jpg')
+            render_chart(chart_path, data)
+            render_report_photo(report_path, rng, angle=2.0)
+            
+            # A dense page of joined-up script inks nearly every column of every line
+            page = np.full((3508, 2480), 250, dtype=np.uint8)
+            words = "patient reports recurrent episodes of altered awareness followed by confusion".split()
+            for y in range(150, 3400, 45):
+                line = ' '.join(rng.choice(words, 14))
+                cv2.putText(page, line, (150, y), cv2.FONT_HERSHEY_SCRIPT_SIMPLEX, 1.0, 20, 2, cv2.LINE_AA)
+            text_path = os.path.join(tmp, 'text.png')
+            cv2.imwrite(text_path, page)
+            
+            chart = digitize_strip(load_grayscale(chart_path)[0])
+            report = digitize_strip(load_grayscale(report_path)[0])
+            text = digitize_strip(load_grayscale(text_path)[0])
+        
+        assert chart['is_waveform'] and chart['data'].shape == (19, 2560)
+        correlations = [np.corrcoef(chart['data'][c], data[c])[0, 1] for c in range(19)]
+        assert np.median(correlations) > 0.8 and min(correlations) > 0.5
+        assert not report['is_waveform']
+        assert np.median(text['coverage']) >= 0.9 and not text['is_waveform']
+        
+        print(f"✓ Waveform digitizer working")
+        print(f"  - 19 traces recovered, median correlation {np.median(correlations):.2f}")
+        return True
+    except Exception as e:
+        print(f"✗ Waveform digitizer error: {str(e)}")
+        return False
+
+
+def test_recording_viewer():
+    """Test EDF memory mapping, min/max pyramid views and the probability timeline"""
+    print("\nTesting Recording Viewer...")
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        from utils.edf_writer import write_edf
+        from utils.edf_reader import EDFReader
+        from modules.recording_viewer import RecordingViewer
+        
+        rng = np.random.default_rng(0)
+        data = rng.normal(0, 30, (4, 256 * 600))
+        data[2, 100000] = 900.0
+        
+        def predict_batch(features):
+            return [{'probabilities': {'NORMAL': 70.0, 'PREICTAL': 20.0, 'SEIZURE': 10.0}} for _ in features]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_edf(os.path.join(tmp, 'recording.edf'), data, 256)
+            reader = EDFReader(path)
+            assert reader.channels == ['EEG 1', 'EEG 2', 'EEG 3', 'EEG 4'] and reader.duration == 600
+            assert np.allclose(reader.read(1000, 2000, [1]), data[1:2, 1000:2000], atol=0.05)
+            
+            viewer = RecordingViewer(reader, predict_batch, lambda window, sfreq: {'std': float(window.std())})
+            whole = viewer.view(0, 600, max_points=500)
+            zoomed = viewer.view(100, 104, max_points=2000)
+            del reader, viewer
+        
+        # Every view stays within max_points and the spike survives decimation
+        assert whole['min'].shape == (4, whole['time'].size) and whole['time'].size <= 500
+        assert abs(whole['max'][2].max() - 900.0) < 0.05
+        assert zoomed['bin_samples'] == 1 and zoomed['min'].shape == (4, 1024)
+        assert len(whole['timeline']['time']) == 60 and np.all(whole['timeline']['SEIZURE'] == 10.0)
+        
+        print(f"✓ Recording viewer working")
+        print(f"  - 10 min view: {whole['time'].size} points of {whole['bin_samples']} samples")
+        return True
+    except Exception as e:
+        print(f"✗ Recording viewer error: {str(e)}")
+        return False
+
+
+def test_ocr_pool():
+    """Test pooled OCR keeps image order and applies the numeric whitelist"""
+    print("\nTesting OCR Pool...")
+    try:
+        import re
+        import shutil
+        import numpy as np
+        from PIL import Image, ImageDraw, ImageFont
+        from utils.ocr import NUMERIC_WHITELIST
+        from utils.ocr_pool import OCRPool
+        
+        pool = OCRPool(size=2)
+        if pool.backend == 'cli' and shutil.which('tesseract') is None:
+            print(f"⚠ OCR Pool: no tesseract binary or tesserocr language data found")
+            return None
+        
+        font = ImageFont.load_default(size=32)
+        lines = ["alpha 12.5", "beta -3.25", "gamma 100.0"]
+        crops = []
+        for line in lines:
+            image = Image.new('L', (400, 60), color=255)
+            ImageDraw.Draw(image).text((10, 10), line, font=font, fill=0)
+            crops.append(np.asarray(image))
+        
+        texts = pool.recognize(crops)
+        numbers = pool.recognize(crops, whitelist=NUMERIC_WHITELIST)
+        pool.close()
+        
+        assert [re.findall(r'-?\d+\.?\d*', t) for t in texts] == [['12.5'], ['-3.25'], ['100.0']]
+        assert all(not any(c.isalpha() for c in t) for t in numbers)
+        
+        print(f"✓ OCR pool working")
+        print(f"  - Backend: {pool.backend}, {pool.stats['images']} images")
+        return True
+    except Exception as e:
+        print(f"✗ OCR pool error: {str(e)}")
+        return False
+
+
 def main():
     """Run all tests"""
     print("="*60)
@@ -151,8 +872,25 @@ def main():
     results.append(("Symptom Checker", test_symptom_checker()))
     results.append(("Chatbot", test_chatbot()))
     results.append(("Doctor Recommender", test_doctor_recommender()))
+    results.append(("Doctor Store", test_doctor_store()))
+    results.append(("Doctor Reload", test_doctor_reload()))
+    results.append(("Nearest Doctors", test_nearest_doctors()))
+    results.append(("Doctor Search", test_doctor_search()))
     results.append(("File Processor", test_file_processor()))
+    results.append(("Text Numbers", test_text_numbers()))
+    results.append(("OCR Preprocessing", test_ocr_preprocessing()))
+    results.append(("Waveform Digitizer", test_waveform_digitizer()))
+    results.append(("OCR Pool", test_ocr_pool()))
+    results.append(("Recording Viewer", test_recording_viewer()))
     results.append(("Predictor", test_predictor()))
+    results.append(("Model Registry", test_model_registry()))
+    results.append(("Incremental Updater", test_incremental_updater()))
+    results.append(("Prediction Cache", test_prediction_cache()))
+    results.append(("ASGI Backpressure", test_asgi_backpressure()))
+    results.append(("Metrics", test_metrics()))
+    results.append(("EEG Dataset", test_eeg_dataset()))
+    results.append(("Stream Processor", test_stream_processor()))
+    results.append(("Alert Engine", test_alert_engine()))
     
     # Summary
     print("\n" + "="*60)
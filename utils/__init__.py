@@ -1,12 +1,29 @@
 """
 Utility functions
+
+Readers are imported on first attribute access (PEP 562) so OCR, PDF and
+EDF libraries only load when a file of that type is processed
 """
-from .pdf_reader import extract_text_from_pdf
-from .image_reader import extract_text_from_image
-from .edf_reader import read_edf_file
-
-__all__ = [
-    'extract_text_from_pdf',
-    'extract_text_from_image',
-    'read_edf_file'
-]
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'extract_text_from_pdf': '.pdf_reader',
+    'extract_text_from_image': '.image_reader',
+    'read_edf_file': '.edf_reader',
+    'write_edf': '.edf_writer'
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,13 +1,19 @@
 """
 EDF Reader Utility for EEG data
 """
-import mne
+import os
+
 import numpy as np
 
+# Physical dimensions mne converts to volts
+VOLTS_PER_UNIT = {'v': 1.0, 'mv': 1e-3, 'uv': 1e-6, 'µv': 1e-6, 'nv': 1e-9}
+
 
 def read_edf_file(edf_path):
     """Read EDF file and extract EEG data"""
     try:
+        import mne
+        
         raw = mne.io.read_raw_edf(edf_path, preload=True, verbose=False)
         data = raw.get_data()
         sfreq = raw.info['sfreq']
@@ -21,3 +27,93 @@ def read_edf_file(edf_path):
         }
     except Exception as e:
         raise Exception(f"Error reading EDF: {str(e)}")
+
+
+class EDFReader:
+    def __init__(self, edf_path):
+        """
+        Memory-mapped EDF reader: only the header is read up front and
+        read() converts just the requested samples, so a 24-hour recording
+        can be browsed without loading it
+        
+        Signals with a different sample rate from the first one (such as
+        EDF+ annotations) are left out.
+        
+        Args:
+            edf_path: Path to an .edf file
+        """
+        with open(edf_path, 'rb') as f:
+            fixed = f.read(256)
+            ns = int(fixed[252:256])
+            fields = f.read(256 * ns)
+        
+        def column(offset, width):
+            return [fields[offset + i * width:offset + (i + 1) * width].decode('latin-1').strip() for i in range(ns)]
+        
+        offsets, widths = [], [16, 80, 8, 8, 8, 8, 8, 80, 8, 32]
+        for width in widths:
+            offsets.append(sum(w * ns for w in widths[:len(offsets)]))
+        labels, _, units, pmin, pmax, dmin, dmax, _, spr, _ = [column(o, w) for o, w in zip(offsets, widths)]
+        
+        header_bytes = int(fixed[184:192])
+        record_duration = float(fixed[244:252])
+        spr = np.array([int(n) for n in spr])
+        record_samples = int(spr.sum())
+        n_records = int(fixed[236:244])
+        if n_records < 0:
+            n_records = (os.path.getsize(edf_path) - header_bytes) // (2 * record_samples)
+        
+        keep = np.flatnonzero((spr == spr[0]) & np.array([label != 'EDF Annotations' for label in labels]))
+        self.path = edf_path
+        self.channels = [labels[i] for i in keep]
+        self.units = [units[i] for i in keep]
+        self.samples_per_record = int(spr[0])
+        self.sfreq = self.samples_per_record / record_duration
+        self.n_samples = n_records * self.samples_per_record
+        self.duration = self.n_samples / self.sfreq
+        
+        # (records, samples of every signal in turn); each kept signal is a column block
+        self._records = np.memmap(edf_path, dtype='<i2', mode='r', offset=header_bytes,
+                                  shape=(n_records, record_samples))
+        self._starts = np.concatenate([[0], np.cumsum(spr)])[keep]
+        pmin, pmax = np.array(pmin, float)[keep], np.array(pmax, float)[keep]
+        dmin, dmax = np.array(dmin, float)[keep], np.array(dmax, float)[keep]
+        self._gain = ((pmax - pmin) / (dmax - dmin)).astype(np.float32)
+        self._offset = (pmin - dmin * (pmax - pmin) / (dmax - dmin)).astype(np.float32)
+    
+    @property
+    def n_channels(self):
+        return len(self.channels)
+    
+    def volts_per_unit(self):
+        """Factor per channel from its physical dimension to volts (1.0 if unknown)"""
+        return np.array([VOLTS_PER_UNIT.get(unit.lower(), 1.0) for unit in self.units], dtype=np.float32)
+    
+    def read(self, start, stop, channels=None):
+        """
+        Samples [start, stop) in physical units
+        
+        Args:
+            start: First sample
+            stop: Sample after the last one (clipped to the recording)
+            channels: Channel indices (default: all)
+        
+        Returns:
+            float32 array of shape (channels, samples)
+        """
+        spr = self.samples_per_record
+        start, stop = max(int(start), 0), min(int(stop), self.n_samples)
+        channels = np.arange(self.n_channels) if channels is None else np.asarray(channels)
+        if stop <= start:
+            return np.empty((len(channels), 0), dtype=np.float32)
+        
+        first, last = start // spr, -(-stop // spr)
+        records = self._records[first:last]
+        trim = slice(start - first * spr, stop - first * spr)
+        out = np.empty((len(channels), stop - start), dtype=np.float32)
+        for row, channel in enumerate(channels):
+            begin = self._starts[channel]
+            digital = records[:, begin:begin + spr].reshape(-1)[trim]
+            np.multiply(digital, self._gain[channel], out=out[row])
+            out[row] += self._offset[channel]
+        return out
@@ -0,0 +1,163 @@
+"""
+EDF Writer Utility
+Minimal streaming writer for EDF (European Data Format) files using only numpy
+"""
+import datetime
+
+import numpy as np
+
+DIGITAL_MIN = -32768
+DIGITAL_MAX = 32767
+
+
+def _field(value, width: int) -> bytes:
+    """Left-aligned, space-padded ASCII header field"""
+    text = str(value)
+    if len(text) > width:
+        raise ValueError(f"EDF header value {text!r} does not fit in {width} characters")
+    return text.ljust(width).encode('ascii')
+
+
+def _number(value, width: int = 8) -> bytes:
+    """Format a number to fit an 8-character header field"""
+    text = f"{value:g}" if isinstance(value, float) else str(value)
+    return _field(text[:width], width)
+
+
+class EDFWriter:
+    def __init__(self, path, channel_names, sfreq: int, record_duration: int = 1,
+                 physical_min: float = -1000.0, physical_max: float = 1000.0,
+                 physical_dimension: str = 'uV', n_records: int = None,
+                 patient_id: str = 'X X X X', recording_id: str = 'Startdate X X X X',
+                 start_time: datetime.datetime = None):
+        """
+        Initialize EDF writer
+        
+        Args:
+            path: Output .edf path
+            channel_names: Signal labels (at most 16 characters each)
+            sfreq: Sampling rate in Hz (integer, every signal uses the same rate)
+            record_duration: Seconds per data record
+            physical_min: Lowest representable value, in physical_dimension units
+            physical_max: Highest representable value; samples outside are clipped
+            physical_dimension: Unit of the signals
+            n_records: Number of data records if known; otherwise patched on close
+            patient_id: Local patient identification field
+            recording_id: Local recording identification field
+            start_time: Recording start (defaults to 2000-01-01 00:00:00 so output is reproducible)
+        """
+        if int(sfreq) != sfreq:
+            raise ValueError("EDF requires an integer number of samples per record")
+        
+        self.path = path
+        self.channel_names = list(channel_names)
+        self.sfreq = int(sfreq)
+        self.record_duration = record_duration
+        self.samples_per_record = self.sfreq * record_duration
+        self.physical_min = physical_min
+        self.physical_max = physical_max
+        self.physical_dimension = physical_dimension
+        self.n_records = n_records
+        self.patient_id = patient_id
+        self.recording_id = recording_id
+        self.start_time = start_time or datetime.datetime(2000, 1, 1)
+        
+        self.records_written = 0
+        self._pending = np.empty((len(self.channel_names), 0), dtype=np.float64)
+        self._scale = (DIGITAL_MAX - DIGITAL_MIN) / (physical_max - physical_min)
+        self._file = open(path, 'wb')
+        self._file.write(self.header())
+    
+    def header(self) -> bytes:
+        """Fixed 256-byte header followed by 256 bytes per signal"""
+        ns = len(self.channel_names)
+        n_records = self.n_records if self.n_records is not None else -1
+        
+        parts = [
+            _field('0', 8),
+            _field(self.patient_id, 80),
+            _field(self.recording_id, 80),
+            _field(self.start_time.strftime('%d.%m.%y'), 8),
+            _field(self.start_time.strftime('%H.%M.%S'), 8),
+            _number(256 * (ns + 1)),
+            _field('', 44),
+            _number(n_records),
+            _number(self.record_duration),
+            _number(ns, 4),
+        ]
+        
+        # Signal fields are stored field by field, not signal by signal
+        per_signal = [
+            (self.channel_names, 16),
+            (['AgAgCl electrode'] * ns, 80),
+            ([self.physical_dimension] * ns, 8),
+            ([float(self.physical_min)] * ns, 8),
+            ([float(self.physical_max)] * ns, 8),
+            ([DIGITAL_MIN] * ns, 8),
+            ([DIGITAL_MAX] * ns, 8),
+            ([''] * ns, 80),
+            ([self.samples_per_record] * ns, 8),
+            ([''] * ns, 32),
+        ]
+        for values, width in per_signal:
+            for value in values:
+                parts.append(_number(value, width) if isinstance(value, (int, float)) else _field(value, width))
+        
+        return b''.join(parts)
+    
+    def write(self, data):
+        """
+        Append samples; complete records are written immediately
+        
+        Args:
+            data: Array of shape (n_channels, n_samples) in physical units
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if self._pending.shape[1]:
+            data = np.concatenate([self._pending, data], axis=1)
+        
+        n_complete = data.shape[1] // self.samples_per_record
+        if n_complete:
+            self._write_records(data[:, :n_complete * self.samples_per_record], n_complete)
+        self._pending = data[:, n_complete * self.samples_per_record:]
+    
+    def _write_records(self, data, n_records):
+        digital = np.rint((data - self.physical_min) * self._scale + DIGITAL_MIN)
+        np.clip(digital, DIGITAL_MIN, DIGITAL_MAX, out=digital)
+        
+        # (channels, records * spr) -> (records, channels, spr): each record holds every channel in turn
+        records = digital.reshape(len(self.channel_names), n_records, self.samples_per_record).transpose(1, 0, 2)
+        self._file.write(records.astype('<i2').tobytes())
+        self.records_written += n_records
+    
+    def close(self):
+        """Zero-pad a trailing partial record and fix up the record count"""
+        if self._file.closed:
+            return
+        
+        if self._pending.shape[1]:
+            padding = self.samples_per_record - self._pending.shape[1]
+            self.write(np.zeros((len(self.channel_names), padding)))
+        
+        if self.n_records != self.records_written:
+            self._file.seek(236)
+            self._file.write(_number(self.records_written))
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def write_edf(path, data, sfreq, channel_names=None, **kwargs):
+    """Write a (n_channels, n_samples) array to an EDF file in one call"""
+    data = np.asarray(data)
+    channel_names = channel_names or [f'EEG {i + 1}' for i in range(data.shape[0])]
+    n_records = -(-data.shape[1] // (int(sfreq) * kwargs.get('record_duration', 1)))
+    
+    with EDFWriter(path, channel_names, sfreq, n_records=n_records, **kwargs) as writer:
+        writer.write(data)
+    return path
@@ -1,15 +1,13 @@
 """
 Image Reader Utility using OCR
 """
-import pytesseract
-from PIL import Image
 
 
-def extract_text_from_image(image_path):
-    """Extract text from image using OCR"""
+def extract_text_from_image(image_path, numeric_only=False):
+    """Extract text from image using OCR (see utils.ocr for the preprocessing)"""
     try:
-        image = Image.open(image_path)
-        text = pytesseract.image_to_string(image)
-        return text
+        from .ocr import ocr_image
+        
+        return ocr_image(image_path, numeric_only=numeric_only)['text']
     except Exception as e:
         raise Exception(f"Error reading image: {str(e)}")
@@ -0,0 +1,146 @@
+"""
+Metrics Utility
+Low-overhead latency histograms with Prometheus text exposition
+"""
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Upper bounds in seconds, from sub-millisecond feature work to multi-second OCR
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram; one bisect and three additions per observation"""
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+    
+    def snapshot(self):
+        """Return (cumulative bucket counts, sum, count)"""
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+        
+        cumulative = []
+        running = 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = 'seizureguard'):
+        """
+        Initialize metrics registry
+        
+        Args:
+            namespace: Prefix for every exported metric name
+        """
+        self.namespace = namespace
+        self.histograms = {}
+        self.help = {}
+        self._lock = threading.Lock()
+    
+    def describe(self, name: str, help_text: str):
+        """Set the HELP line for a metric"""
+        self.help[name] = help_text
+    
+    def histogram(self, name: str, labels: dict = None) -> Histogram:
+        """Get or create the histogram for a metric name and label set"""
+        key = (name, tuple(sorted((labels or {}).items())))
+        hist = self.histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.get(key)
+                if hist is None:
+                    hist = Histogram()
+                    self.histograms[key] = hist
+        return hist
+    
+    def observe(self, name: str, value: float, labels: dict = None):
+        self.histogram(name, labels).observe(value)
+    
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        by_name = {}
+        for (name, labels), hist in list(self.histograms.items()):
+            by_name.setdefault(name, []).append((labels, hist))
+        
+        lines = []
+        for name in sorted(by_name):
+            full_name = f"{self.namespace}_{name}"
+            if name in self.help:
+                lines.append(f"# HELP {full_name} {self.help[name]}")
+            lines.append(f"# TYPE {full_name} histogram")
+            
+            for labels, hist in sorted(by_name[name], key=lambda item: item[0]):
+                cumulative, total, count = hist.snapshot()
+                label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+                prefix = label_text + ',' if label_text else ''
+                
+                for bound, value in zip(hist.buckets, cumulative):
+                    lines.append(f'{full_name}_bucket{{{prefix}le="{bound}"}} {value}')
+                lines.append(f'{full_name}_bucket{{{prefix}le="+Inf"}} {cumulative[-1]}')
+                suffix = f'{{{label_text}}}' if label_text else ''
+                lines.append(f"{full_name}_sum{suffix} {total}")
+                lines.append(f"{full_name}_count{suffix} {count}")
+        
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Process-wide registry shared by all modules
+metrics = MetricsRegistry()
+
+STAGE_METRIC = 'stage_duration_seconds'
+metrics.describe(STAGE_METRIC, 'Time spent in each processing stage (stages may nest)')
+_stage_histograms = {}
+
+
+class timed:
+    """Record the wall time of a with-block under the given stage name"""
+    
+    # A plain class avoids the generator overhead of @contextmanager
+    __slots__ = ('hist', 'start')
+    
+    def __init__(self, stage: str):
+        hist = _stage_histograms.get(stage)
+        if hist is None:
+            hist = _stage_histograms[stage] = metrics.histogram(STAGE_METRIC, {'stage': stage})
+        self.hist = hist
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.hist.observe(time.perf_counter() - self.start)
+        return False
+
+
+def timed_stage(stage: str):
+    """Decorator form of timed()"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
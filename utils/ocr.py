@@ -0,0 +1,237 @@
+"""
+OCR Utility
+OpenCV preprocessing for photographed and scanned reports (downscale to
+about 300 DPI, grayscale, adaptive threshold, deskew, text-block detection)
+so tesseract reads only the regions that contain text, on the shared
+OCR pool (utils/ocr_pool.py)
+"""
+import numpy as np
+
+from .metrics import timed
+
+# A letter-size page at 300 DPI; tesseract gains nothing from more pixels
+OCR_TARGET_WIDTH = 2550
+
+# Line and block detection only needs the layout, not glyph detail
+LAYOUT_WIDTH = 1275
+
+# Characters of the numbers extract_features_from_text reads (its labels need
+# letters, so they are lost); without the space tesseract runs neighbouring
+# numbers together
+NUMERIC_WHITELIST = '0123456789.- '
+
+
+def load_grayscale(image_path, target_width=OCR_TARGET_WIDTH):
+    """
+    Decode an image as grayscale, letting the JPEG decoder downscale by
+    2, 4 or 8 while the result stays at least target_width wide
+    
+    Returns:
+        (grayscale uint8 array, (height, width) of the original image)
+    """
+    import cv2
+    from PIL import Image
+    
+    # Reads the header only
+    with Image.open(image_path) as image:
+        width, height = image.size
+    
+    reduction = 1
+    while reduction < 8 and width // (reduction * 2) >= target_width:
+        reduction *= 2
+    flag = {
+        1: cv2.IMREAD_GRAYSCALE,
+        2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+        4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+        8: cv2.IMREAD_REDUCED_GRAYSCALE_8
+    }[reduction]
+    
+    gray = cv2.imread(image_path, flag)
+    if gray is None:
+        raise ValueError(f"Could not decode image: {image_path}")
+    return gray, (height, width)
+
+
+def binarize(gray):
+    """Black text on white with a local threshold, robust to uneven phone lighting"""
+    import cv2
+    
+    block = max(15, (gray.shape[1] // 80) | 1)
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, block, 15)
+
+
+def _ink(binary, layout_width=LAYOUT_WIDTH):
+    """
+    White-on-black glyph mask at layout resolution, without speckle and
+    without connected components too large to be a character (page edges,
+    table rules, shadows), so they neither skew the angle estimate nor
+    become regions
+    
+    Returns:
+        (mask, factor from mask to binary coordinates)
+    """
+    import cv2
+    
+    # Remove speckle at full resolution, where strokes are still thicker than it
+    ink = cv2.morphologyEx(cv2.bitwise_not(binary), cv2.MORPH_OPEN, np.ones((2, 2), np.uint8))
+    factor = max(binary.shape[1] / layout_width, 1.0)
+    if factor > 1:
+        small = cv2.resize(ink, (layout_width, int(round(binary.shape[0] / factor))), interpolation=cv2.INTER_AREA)
+        ink = cv2.threshold(small, 63, 255, cv2.THRESH_BINARY)[1]
+    
+    height, width = ink.shape
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    
+    # Few components are that large; clear each inside its own bounding box
+    large = np.flatnonzero((stats[1:, cv2.CC_STAT_HEIGHT] > height // 20)
+                           | (stats[1:, cv2.CC_STAT_WIDTH] > width // 10)) + 1
+    for label in large:
+        x, y, w, h = stats[label, :4]
+        box = ink[y:y + h, x:x + w]
+        box[labels[y:y + h, x:x + w] == label] = 0
+    return ink, factor
+
+
+def estimate_skew(binary, max_angle=15.0):
+    """
+    Page rotation in degrees, as the median angle of text lines (characters
+    merged horizontally), or 0.0 when no line is long enough to tell
+    """
+    import cv2
+    
+    ink, _ = _ink(binary)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(ink.shape[1] // 60, 9), 1))
+    lines = cv2.dilate(ink, kernel)
+    contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    # Orientation of each long, thin line blob from its second-order moments
+    angles = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w < ink.shape[1] / 10 or w < 5 * h:
+            continue
+        m = cv2.moments(contour)
+        angle = np.degrees(0.5 * np.arctan2(2 * m['mu11'], m['mu20'] - m['mu02']))
+        if abs(angle) <= max_angle:
+            angles.append(angle)
+    return float(np.median(angles)) if angles else 0.0
+
+
+def rotate(image, angle, border=255):
+    """Rotate about the centre, keeping the size and filling corners with border"""
+    import cv2
+    
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+
+
+def preprocess_for_ocr(gray, target_width=OCR_TARGET_WIDTH, deskew=True):
+    """
+    Downscale, threshold and deskew a grayscale page
+    
+    Returns:
+        (binary page, skew angle corrected in degrees)
+    """
+    import cv2
+    
+    if gray.shape[1] > target_width:
+        scale = target_width / gray.shape[1]
+        gray = cv2.resize(gray, (target_width, int(round(gray.shape[0] * scale))), interpolation=cv2.INTER_AREA)
+    
+    binary = binarize(gray)
+    angle = estimate_skew(binary) if deskew else 0.0
+    if abs(angle) >= 0.3:
+        # Rotate the grayscale page and threshold again; rotating the binary image jags the strokes
+        binary = binarize(rotate(gray, angle))
+    return binary, angle
+
+
+def find_text_regions(binary, padding=8):
+    """
+    Bounding boxes (x, y, w, h) of text blocks, top to bottom and left to
+    right, found by merging characters into lines and lines into blocks
+    """
+    import cv2
+    
+    ink, factor = _ink(binary)
+    height, width = ink.shape
+    lines = cv2.dilate(ink, cv2.getStructuringElement(cv2.MORPH_RECT, (max(width // 40, 5), 1)))
+    
+    # Bridge gaps up to 1.5 line heights, so a paragraph or table is one tesseract call
+    contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    min_height = max(height // 400, 4)
+    boxes = [cv2.boundingRect(c) for c in contours]
+    heights = [h for _, _, w, h in boxes if h >= min_height and w >= max(3 * h, width // 20)]
+    if not heights:
+        return []
+    gap = max(int(np.median(heights) * 1.5), 3)
+    blocks = cv2.dilate(lines, cv2.getStructuringElement(cv2.MORPH_RECT, (1, gap)))
+    contours, _ = cv2.findContours(blocks, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    regions = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if h < min_height or w < 2 * min_height:
+            continue
+        # Fragments of the photo edge or rotation fill left after _ink()
+        if x == 0 or y == 0 or x + w == width or y + h == height:
+            continue
+        x0, y0 = max(int(x * factor) - padding, 0), max(int(y * factor) - padding, 0)
+        x1 = min(int((x + w) * factor) + padding, binary.shape[1])
+        y1 = min(int((y + h) * factor) + padding, binary.shape[0])
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+    
+    regions.sort(key=lambda box: (box[1], box[0]))
+    return regions
+
+
+def ocr_regions(page, regions, numeric_only=False, pool=None):
+    """
+    OCR each region on the shared pool and join the text in reading order
+    
+    Args:
+        page: Binary page from preprocess_for_ocr
+        regions: Boxes from find_text_regions (an empty list reads the whole page)
+        numeric_only: Restrict recognition to digits, '.' and '-'
+        pool: OCRPool to use (default: the process-wide pool)
+    """
+    from .ocr_pool import get_ocr_pool
+    
+    crops = [page[y:y + h, x:x + w] for x, y, w, h in regions] or [page]
+    texts = (pool or get_ocr_pool()).recognize(crops, whitelist=NUMERIC_WHITELIST if numeric_only else None)
+    return '\n'.join(text.strip() for text in texts if text.strip())
+
+
+def ocr_gray(gray, numeric_only=False, pool=None):
+    """
+    Preprocess a grayscale page (from load_grayscale) and OCR its text regions
+    
+    Returns:
+        Dictionary with text, skew_angle and regions
+    """
+    with timed('ocr_preprocess'):
+        page, angle = preprocess_for_ocr(gray)
+        regions = find_text_regions(page)
+    
+    with timed('ocr_recognition'):
+        text = ocr_regions(page, regions, numeric_only=numeric_only, pool=pool)
+    
+    return {
+        'text': text,
+        'skew_angle': angle,
+        'regions': len(regions)
+    }
+
+
+def ocr_image(image_path, numeric_only=False, pool=None):
+    """
+    Load an image file and OCR its text regions
+    
+    Returns:
+        Dictionary with text, image_shape (original height, width), skew_angle and regions
+    """
+    with timed('ocr_preprocess'):
+        gray, image_shape = load_grayscale(image_path)
+    return {'image_shape': image_shape, **ocr_gray(gray, numeric_only=numeric_only, pool=pool)}
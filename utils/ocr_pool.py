@@ -0,0 +1,157 @@
+"""
+OCR Pool Utility
+Warm tesseract engines shared by every request in the process, with the
+number of concurrent recognitions bounded by the pool size.
+
+With tesserocr installed, each pool thread keeps its own PyTessBaseAPI, so
+the language model is loaded once per thread instead of once per image.
+Without it, images are written to a list file and one tesseract process
+reads a whole batch, so process start-up is paid per batch, not per image.
+"""
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+
+class OCRPool:
+    def __init__(self, size: Optional[int] = None, lang: str = 'eng', backend: Optional[str] = None):
+        """
+        Initialize OCR pool
+        
+        Args:
+            size: Engines (tesserocr) or concurrent tesseract processes (cli);
+                defaults to the CPU count
+            lang: Tesseract language
+            backend: 'tesserocr' or 'cli' (default: tesserocr when it is installed
+                and finds lang's traineddata, via TESSDATA_PREFIX if set)
+        """
+        if backend is None:
+            backend = 'tesserocr' if self._tesserocr_has(lang) else 'cli'
+        if backend not in ('tesserocr', 'cli'):
+            raise ValueError("backend must be 'tesserocr' or 'cli'")
+        
+        self.size = size or os.cpu_count() or 1
+        self.lang = lang
+        self.backend = backend
+        self.stats = {'images': 0, 'batches': 0, 'engines': 0}
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='ocr')
+        self._local = threading.local()
+        self._engines = []
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _tessdata_kwargs():
+        return {'path': os.environ['TESSDATA_PREFIX']} if os.environ.get('TESSDATA_PREFIX') else {}
+    
+    @classmethod
+    def _tesserocr_has(cls, lang: str) -> bool:
+        """tesserocr is importable and finds traineddata for lang"""
+        try:
+            import tesserocr
+        except ImportError:
+            return False
+        return lang in tesserocr.get_languages(**cls._tessdata_kwargs())[1]
+    
+    def _engine(self):
+        """The calling pool thread's tesserocr API, created on first use and kept"""
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            from tesserocr import PyTessBaseAPI, PSM
+            
+            api = self._local.api = PyTessBaseAPI(lang=self.lang, psm=PSM.SINGLE_BLOCK, **self._tessdata_kwargs())
+            with self._lock:
+                self._engines.append(api)
+                self.stats['engines'] += 1
+        return api
+    
+    def _read_tesserocr(self, image: np.ndarray, whitelist: Optional[str]) -> str:
+        api = self._engine()
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        
+        # Variables persist on the engine; an empty whitelist allows every character
+        api.SetVariable('tessedit_char_whitelist', whitelist or '')
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+        return api.GetUTF8Text()
+    
+    def _read_cli(self, images: List[np.ndarray], whitelist: Optional[str]) -> List[str]:
+        """One tesseract process for the whole batch; pages come back separated by form feeds"""
+        import cv2
+        
+        with tempfile.TemporaryDirectory(prefix='ocr_') as tmp:
+            paths = []
+            for i, image in enumerate(images):
+                path = os.path.join(tmp, f'{i}.png')
+                cv2.imwrite(path, image)
+                paths.append(path)
+            list_path = os.path.join(tmp, 'images.txt')
+            with open(list_path, 'w') as f:
+                f.write('\n'.join(paths) + '\n')
+            
+            command = ['tesseract', list_path, 'stdout', '-l', self.lang, '--psm', '6']
+            if whitelist:
+                command += ['-c', f'tessedit_char_whitelist={whitelist}']
+            # Parallelism comes from the pool; keep each process single-threaded
+            env = dict(os.environ, OMP_THREAD_LIMIT='1')
+            output = subprocess.run(command, capture_output=True, env=env, check=True).stdout
+        
+        pages = output.decode('utf-8', errors='replace').split('\f')
+        return (pages + [''] * len(images))[:len(images)]
+    
+    def recognize(self, images: List[np.ndarray], whitelist: Optional[str] = None) -> List[str]:
+        """
+        OCR each image (uint8 grayscale or RGB array) as one text block
+        
+        Args:
+            images: Page crops, read in order
+            whitelist: Characters recognition is restricted to (None allows all)
+        
+        Returns:
+            Text of each image, in the same order
+        """
+        if not images:
+            return []
+        
+        with self._lock:
+            self.stats['images'] += len(images)
+        
+        if self.backend == 'tesserocr':
+            return list(self._executor.map(lambda image: self._read_tesserocr(image, whitelist), images))
+        
+        # Contiguous batches, one per pool thread, so start-up is paid at most size times
+        batches = [list(batch) for batch in np.array_split(np.arange(len(images)), min(self.size, len(images)))]
+        with self._lock:
+            self.stats['batches'] += len(batches)
+        results = self._executor.map(lambda batch: self._read_cli([images[i] for i in batch], whitelist), batches)
+        return [text for batch_texts in results for text in batch_texts]
+    
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for api in self._engines:
+                api.End()
+            self._engines = []
+    
+    def get_status(self):
+        return {'backend': self.backend, 'size': self.size, 'lang': self.lang, **self.stats}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> OCRPool:
+    """Process-wide pool, sized by OCR_POOL_SIZE (default: CPU count) and created on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                size = int(os.environ['OCR_POOL_SIZE']) if os.environ.get('OCR_POOL_SIZE') else None
+                _pool = OCRPool(size=size, lang=os.environ.get('OCR_LANG', 'eng'))
+    return _pool
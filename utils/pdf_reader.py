@@ -1,12 +1,13 @@
 """
 PDF Reader Utility
 """
-import pdfplumber
 
 
 def extract_text_from_pdf(pdf_path):
     """Extract text from PDF file"""
     try:
+        import pdfplumber
+        
         text = ""
         with pdfplumber.open(pdf_path) as pdf:
             for page in pdf.pages:
@@ -0,0 +1,75 @@
+"""
+Sampling Profiler Utility
+Samples one thread's Python stack at a fixed interval and writes folded
+stacks ("frame;frame;frame count") that flamegraph.pl and speedscope read
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: int = None, interval: float = 0.001):
+        """
+        Initialize sampling profiler
+        
+        Args:
+            thread_id: Thread to sample (defaults to the calling thread)
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+    
+    def folded(self) -> str:
+        """Collapsed stack format, one stack per line"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+    
+    def write(self, output_dir: str = 'profiles', name: str = 'request') -> str:
+        """Write folded stacks to output_dir and return the file path"""
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{name}.folded")
+        with open(path, 'w') as f:
+            f.write(self.folded())
+        return path
+
+
+if __name__ == "__main__":
+    # Test sampling profiler
+    def busy(n):
+        return sum(i * i for i in range(n))
+    
+    profiler = SamplingProfiler(interval=0.0005).start()
+    busy(2_000_000)
+    profiler.stop()
+    
+    print(f"Samples: {sum(profiler.samples.values())}")
+    print(profiler.folded().splitlines()[0])
@@ -0,0 +1,148 @@
+"""
+Signal Pyramid Utility
+Multi-resolution min/max summaries of long multichannel signals, built
+incrementally chunk by chunk, so any time window can be drawn with about as
+many points as the plot is wide. Min/max decimation keeps every spike
+visible, which averaging or point-picking methods such as LTTB do not guarantee.
+"""
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class SignalPyramid:
+    def __init__(self, n_channels: int, sfreq: float, base_bin: int = 256, factor: int = 4,
+                 n_levels: int = 10, read_raw: Optional[Callable] = None):
+        """
+        Initialize signal pyramid
+        
+        Args:
+            n_channels: Channels per sample
+            sfreq: Sampling rate in Hz
+            base_bin: Samples summarized by one point of the finest level;
+                memory is about 2 * 4/3 / base_bin of the float32 signal
+            factor: Bin size ratio between consecutive levels
+            n_levels: Number of levels (the coarsest bins span
+                base_bin * factor ** (n_levels - 1) samples)
+            read_raw: Optional read(start, stop, channels) -> (channels, samples)
+                array, used for windows finer than the base level
+        """
+        self.n_channels = n_channels
+        self.sfreq = sfreq
+        self.factor = factor
+        self.bins = [base_bin * factor ** level for level in range(n_levels)]
+        self.read_raw = read_raw
+        self.n_samples = 0
+        
+        self._mins = [[] for _ in self.bins]
+        self._maxs = [[] for _ in self.bins]
+        self._raw_pending = np.empty((n_channels, 0), dtype=np.float32)
+        self._pending = [(np.empty((n_channels, 0), np.float32), np.empty((n_channels, 0), np.float32))
+                         for _ in self.bins[1:]]
+        self.closed = False
+    
+    def append(self, samples: np.ndarray):
+        """
+        Add the next (channels, samples) block; complete bins are summarized
+        at every level and the rest waits for the next block
+        """
+        if self.closed:
+            raise ValueError("Pyramid is closed")
+        samples = np.asarray(samples, dtype=np.float32)
+        self.n_samples += samples.shape[1]
+        if self._raw_pending.shape[1]:
+            samples = np.concatenate([self._raw_pending, samples], axis=1)
+        
+        base = self.bins[0]
+        complete = samples.shape[1] // base * base
+        self._raw_pending = samples[:, complete:]
+        blocks = samples[:, :complete].reshape(self.n_channels, -1, base)
+        self._add(0, blocks.min(axis=2), blocks.max(axis=2), flush=False)
+    
+    def close(self):
+        """Summarize the trailing partial bins; call once the signal has ended"""
+        if self.closed:
+            return
+        tail = self._raw_pending
+        if tail.shape[1]:
+            self._add(0, tail.min(axis=1, keepdims=True), tail.max(axis=1, keepdims=True), flush=True)
+        else:
+            self._add(0, tail, tail, flush=True)
+        self._raw_pending = tail[:, :0]
+        self.closed = True
+    
+    def _add(self, level: int, mins: np.ndarray, maxs: np.ndarray, flush: bool):
+        """Store new bins of a level and carry them up to the coarser levels"""
+        if mins.shape[1]:
+            self._mins[level].append(mins)
+            self._maxs[level].append(maxs)
+        if level + 1 == len(self.bins):
+            return
+        
+        pending_min, pending_max = self._pending[level]
+        mins = np.concatenate([pending_min, mins], axis=1)
+        maxs = np.concatenate([pending_max, maxs], axis=1)
+        if flush and mins.shape[1] % self.factor:
+            # Padding that neither min nor max can pick
+            pad = ((0, 0), (0, self.factor - mins.shape[1] % self.factor))
+            mins = np.pad(mins, pad, constant_values=np.inf)
+            maxs = np.pad(maxs, pad, constant_values=-np.inf)
+        
+        complete = mins.shape[1] // self.factor * self.factor
+        self._pending[level] = (mins[:, complete:], maxs[:, complete:])
+        self._add(level + 1,
+                  mins[:, :complete].reshape(self.n_channels, -1, self.factor).min(axis=2),
+                  maxs[:, :complete].reshape(self.n_channels, -1, self.factor).max(axis=2),
+                  flush)
+    
+    def level(self, level: int):
+        """(mins, maxs) of a level, each (channels, bins) float32"""
+        for store in (self._mins, self._maxs):
+            if len(store[level]) != 1:
+                # Merge the appended blocks once, not on every view
+                blocks = store[level] or [np.empty((self.n_channels, 0), np.float32)]
+                store[level] = [np.concatenate(blocks, axis=1)]
+        return self._mins[level][0], self._maxs[level][0]
+    
+    def nbytes(self) -> int:
+        return sum(block.nbytes for blocks in self._mins + self._maxs for block in blocks)
+    
+    def view(self, start: float, end: float, max_points: int = 1000,
+             channels: Optional[List[int]] = None) -> Dict:
+        """
+        Summary of [start, end) seconds with at most max_points bins per channel
+        
+        Returns:
+            Dictionary with time (bin centres, seconds), min and max
+            ((channels, bins) arrays; equal when bin_samples is 1) and bin_samples
+        """
+        first = max(int(start * self.sfreq), 0)
+        stop = min(int(np.ceil(end * self.sfreq)), self.n_samples)
+        channels = list(range(self.n_channels)) if channels is None else list(channels)
+        needed = max(-(-(stop - first) // max(max_points, 1)), 1)
+        
+        if needed < self.bins[0] and self.read_raw is not None:
+            # Finer than the stored levels: decimate the raw samples on the fly
+            first = first // needed * needed
+            data = self.read_raw(first, stop, channels)
+            if needed == 1:
+                times = (first + np.arange(data.shape[1])) / self.sfreq
+                return {'time': times, 'min': data, 'max': data, 'bin_samples': 1}
+            complete = data.shape[1] // needed * needed
+            blocks = data[:, :complete].reshape(len(channels), -1, needed)
+            mins, maxs = blocks.min(axis=2), blocks.max(axis=2)
+            if complete < data.shape[1]:
+                mins = np.concatenate([mins, data[:, complete:].min(axis=1, keepdims=True)], axis=1)
+                maxs = np.concatenate([maxs, data[:, complete:].max(axis=1, keepdims=True)], axis=1)
+            bin_samples = needed
+            first_bin = first // needed
+        else:
+            level = next((k for k, size in enumerate(self.bins) if size >= needed), len(self.bins) - 1)
+            bin_samples = self.bins[level]
+            level_min, level_max = self.level(level)
+            first_bin, last_bin = first // bin_samples, -(-stop // bin_samples)
+            mins = level_min[channels, first_bin:last_bin]
+            maxs = level_max[channels, first_bin:last_bin]
+        
+        times = ((first_bin + np.arange(mins.shape[1])) * bin_samples + bin_samples / 2) / self.sfreq
+        return {'time': times, 'min': mins, 'max': maxs, 'bin_samples': bin_samples}
@@ -0,0 +1,222 @@
+"""
+Text Numbers Utility
+Vectorized number extraction for OCR and PDF text: the text is scanned as a
+byte array, the tokens matched by the pattern -?\\d+\\.?\\d* are packed into
+one space-separated buffer and parsed by NumPy in a single call, so no
+Python object is created per number. Values printed after a label
+("Delta power: 12.3") are grouped under the label.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Longest label looked at before a colon, in bytes
+MAX_LABEL_BYTES = 32
+
+# Bytes a label may contain: letters, digits, space, _ - ( ) / %
+_LABEL_BYTES = np.zeros(256, dtype=bool)
+for _chars in (b'abcdefghijklmnopqrstuvwxyz', b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'0123456789', b' _-()/%'):
+    _LABEL_BYTES[np.frombuffer(_chars, np.uint8)] = True
+
+_SPACE, _MINUS, _DOT, _COLON, _EQUALS, _TAB = b' -.:=\t'
+
+
+def _as_bytes(text) -> np.ndarray:
+    if isinstance(text, str):
+        text = text.encode('utf-8', errors='ignore')
+    return np.frombuffer(text, dtype=np.uint8)
+
+
+def _number_spans(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (start, end) byte offsets of the numbers re.findall(r'-?\\d+\\.?\\d*')
+    would return, with the trailing '.' of "12." left out
+    """
+    digit = (data - 48).astype(np.uint8) < 10
+    if not digit.any():
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    
+    # Maximal digit runs; boundaries alternate start, end, start...
+    boundaries = np.flatnonzero(digit[1:] != digit[:-1]) + 1
+    if digit[0]:
+        boundaries = np.concatenate([[0], boundaries])
+    if digit[-1]:
+        boundaries = np.concatenate([boundaries, [len(data)]])
+    run_starts, run_ends = boundaries[0::2], boundaries[1::2]
+    
+    # Runs joined by a single '.' form chains like 1.2.3.4; the regex reads
+    # them pairwise (1.2, 3.4), so even positions start a number and odd
+    # positions are the fraction of the one before
+    dotted = np.zeros(len(run_starts), dtype=bool)
+    gap_is_dot = data[np.minimum(run_ends[:-1], len(data) - 1)] == _DOT
+    dotted[1:] = (run_starts[1:] == run_ends[:-1] + 1) & gap_is_dot
+    index = np.arange(len(run_starts))
+    chain_start = np.maximum.accumulate(np.where(dotted, 0, index))
+    whole = ((index - chain_start) & 1) == 0
+    has_fraction = np.zeros(len(run_starts), dtype=bool)
+    has_fraction[:-1] = dotted[1:] & whole[:-1]
+    
+    whole = np.flatnonzero(whole)
+    starts = run_starts[whole]
+    ends = run_ends[whole + has_fraction[whole]]
+    
+    # A '-' right before the integer part belongs to the number
+    negative = data[starts - 1] == _MINUS
+    negative[0] &= starts[0] > 0
+    return starts - negative, ends
+
+
+def _parse_spans(data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Float values of the byte spans, parsed in one np.fromstring call"""
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.float64)
+    
+    # Keep only the span bytes, then put a space in front of each number
+    # (spans can touch, as in "5-3")
+    keep = np.zeros(len(data) + 1, dtype=np.int8)
+    keep[starts] += 1
+    keep[ends] -= 1
+    keep = np.cumsum(keep[:-1], dtype=np.int8).view(bool)
+    lengths = ends - starts
+    packed = np.insert(data[keep], np.cumsum(lengths) - lengths, _SPACE)
+    
+    values = np.fromstring(packed.tobytes(), dtype=np.float64, sep=' ')
+    if len(values) != len(starts):
+        raise ValueError("Number parsing went out of step with the tokenizer")
+    return values
+
+
+def parse_numbers(text) -> np.ndarray:
+    """
+    Every number in text as float64, in order; the same values as
+    [float(n) for n in re.findall(r'-?\\d+\\.?\\d*', text)] for ASCII digits
+    
+    Args:
+        text: str or bytes
+    """
+    data = _as_bytes(text)
+    return _parse_spans(data, *_number_spans(data))
+
+
+def _skip_spaces_back(data: np.ndarray, positions: np.ndarray, limit: int = 3) -> np.ndarray:
+    """Each position moved back over up to limit spaces or tabs (-1 past the start)"""
+    positions = positions.copy()
+    for _ in range(limit):
+        inside = positions >= 0
+        blank = np.zeros(len(positions), dtype=bool)
+        blank[inside] = np.isin(data[positions[inside]], (_SPACE, _TAB))
+        if not blank.any():
+            break
+        positions[blank] -= 1
+    return positions
+
+
+def _clean_label(raw: bytes) -> str:
+    """Feature name for a label, or '' if it is not one (no letter in its last word, e.g. "at 12:30")"""
+    words = raw.decode('ascii').split()
+    if not words or not any(c.isalpha() for c in words[-1]):
+        return ''
+    # Drop a word the window cut through
+    if len(raw) == MAX_LABEL_BYTES and len(words) > 1 and not raw[:1].isspace():
+        words = words[1:]
+    name = ''.join(c if c.isalnum() else '_' for c in '_'.join(words).lower())
+    return '_'.join(part for part in name.split('_') if part)
+
+
+def _group_rows(windows: np.ndarray):
+    """
+    np.unique over the label windows, as (unique rows, first index, inverse);
+    rows are grouped by a 64-bit hash, which is far cheaper to sort than
+    the 32-byte strings, and checked against their group's first row
+    """
+    words = np.ascontiguousarray(windows).view(np.uint64)
+    hashes = np.zeros(len(words), dtype=np.uint64)
+    for column in range(words.shape[1]):
+        hashes = (hashes ^ words[:, column]) * np.uint64(0x100000001B3)
+    
+    _, first_seen, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    if not (windows == windows[first_seen][inverse]).all():
+        rows = np.ascontiguousarray(windows).view(f'V{windows.shape[1]}').ravel()
+        _, first_seen, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    return windows[first_seen], first_seen, inverse.ravel()
+
+
+def extract_numbers(text, max_labels: int = 50) -> Tuple[np.ndarray, Dict[str, float]]:
+    """
+    Numbers in text plus the labelled ones grouped by label
+    
+    A labelled value is a number after "label:" or "label =", where the label
+    is the run of letters, digits, spaces and _-()/% before the colon
+    (at most MAX_LABEL_BYTES). A label seen several times gets the mean of
+    its values.
+    
+    Args:
+        text: str or bytes
+        max_labels: Distinct labels kept, in order of first appearance
+    
+    Returns:
+        (float64 array of every number, {label_name: value})
+    """
+    data = _as_bytes(text)
+    starts, ends = _number_spans(data)
+    values = _parse_spans(data, starts, ends)
+    if len(values) == 0:
+        return values, {}
+    
+    # Numbers right after ':' or '=' (spaces allowed in between)
+    separator = _skip_spaces_back(data, starts - 1)
+    labelled = separator >= 0
+    labelled[labelled] = np.isin(data[separator[labelled]], (_COLON, _EQUALS))
+    label_ends = _skip_spaces_back(data, separator[labelled] - 1) + 1
+    numbers = np.flatnonzero(labelled)
+    has_text = label_ends > 0
+    numbers, label_ends = numbers[has_text], label_ends[has_text]
+    if len(numbers) == 0:
+        return values, {}
+    
+    # Window of MAX_LABEL_BYTES before each label end; bytes up to the last
+    # non-label byte are blanked, so equal labels give equal rows
+    offsets = np.arange(-MAX_LABEL_BYTES, 0)
+    positions = label_ends[:, None] + offsets[None, :]
+    windows = np.where(positions >= 0, data[np.maximum(positions, 0)], 0).astype(np.uint8)
+    outside = ~_LABEL_BYTES[windows]
+    last_outside = np.where(outside.any(axis=1), MAX_LABEL_BYTES - 1 - np.argmax(outside[:, ::-1], axis=1), -1)
+    windows[offsets[None, :] + MAX_LABEL_BYTES <= last_outside[:, None]] = _SPACE
+    
+    unique_rows, first_seen, inverse = _group_rows(windows)
+    sums = np.bincount(inverse, weights=values[numbers], minlength=len(unique_rows))
+    counts = np.bincount(inverse, minlength=len(unique_rows))
+    
+    # Rows that differ only in spacing or case share a name
+    named = {}
+    for row in np.argsort(first_seen, kind='stable'):
+        name = _clean_label(unique_rows[row].tobytes())
+        if not name:
+            continue
+        if name not in named:
+            if len(named) >= max_labels:
+                continue
+            named[name] = [0.0, 0]
+        named[name][0] += sums[row]
+        named[name][1] += counts[row]
+    
+    return values, {name: float(total / count) for name, (total, count) in named.items()}
+
+
+def summarize(values: np.ndarray) -> Dict[str, float]:
+    """Mean, std, max, min and count of the values"""
+    return {
+        'text_mean': float(values.mean()),
+        'text_std': float(values.std()),
+        'text_max': float(values.max()),
+        'text_min': float(values.min()),
+        'text_count': int(len(values))
+    }
+
+
+if __name__ == "__main__":
+    sample = "Patient age: 42\nDelta power: 12.5 uV\ndelta power = 13.5\nFp1-F7: -3.25, 5-3, v1.2.3 at 12:30"
+    numbers, labels = extract_numbers(sample)
+    print(numbers)
+    print(labels)
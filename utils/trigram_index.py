@@ -0,0 +1,259 @@
+"""
+Trigram Index Utility
+Typo-tolerant search and prefix autocomplete over a list of strings. Terms
+are normalized (lowercase, punctuation as spaces) and split into padded
+character trigrams as in PostgreSQL's pg_trgm; an inverted index from
+trigram to terms, kept as sorted NumPy arrays, shortlists the terms sharing
+the most trigrams with a query, and the shortlist is ranked by edit distance
+computed for all candidates at once.
+"""
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+# Bytes of each autocomplete key; longer prefixes are checked against the text
+KEY_BYTES = 16
+
+# Bytes of each term the edit distance looks at
+MAX_TEXT_BYTES = 64
+
+# Trigrams in more than this share of terms (the "the" of names, such as
+# " jo" or "er ") shortlist little and cost most; a query keeps them only
+# when it has fewer than MIN_TRIGRAMS rarer ones. Postings up to
+# SHORT_POSTING terms are always cheap enough to keep.
+COMMON_SHARE = 0.05
+MIN_TRIGRAMS = 3
+SHORT_POSTING = 5000
+
+_SPACE = 32
+
+
+def normalize(text) -> str:
+    """Lowercase words separated by single spaces"""
+    return _NON_WORD.sub(' ', str(text).lower()).strip()
+
+
+def _trigram_codes(padded: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (owner, 24-bit code) of every trigram in the concatenated padded texts;
+    trigrams ending in two spaces only join two words and are left out
+    """
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    offset = np.arange(len(padded)) - np.repeat(starts, lengths)
+    data = np.concatenate([padded, np.zeros(2, np.uint8)]).astype(np.int64)
+    codes = (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+    valid = (offset <= np.repeat(lengths, lengths) - 3) & ~((data[1:-1] == _SPACE) & (data[2:] == _SPACE))
+    return owner[valid], codes[valid]
+
+
+def _pad(text: str) -> bytes:
+    # "  john  smith ": every word starts with two spaces and ends with one
+    return b'  ' + text.encode('utf-8').replace(b' ', b'  ') + b' '
+
+
+def edit_distances(query: bytes, matrix: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Fewest edits (insert, delete, substitute, swap adjacent) turning query
+    into any substring of each text, so a query matching one word of a
+    longer text scores by its typos alone. One pass per query byte, with
+    the candidates and their bytes as the array axes.
+    
+    Args:
+        query: Normalized query bytes
+        matrix: (texts, width) uint8 text bytes, padded with 0
+        lengths: Length of each text
+    """
+    width = matrix.shape[1]
+    steps = np.arange(width + 1, dtype=np.int16)
+    # The substring may start anywhere: row 0 costs nothing
+    before, previous = None, np.zeros((len(matrix), width + 1), dtype=np.int16)
+    for i, byte in enumerate(query):
+        cost = (matrix != byte).astype(np.int16)
+        best = np.empty_like(previous)
+        best[:, 0] = previous[:, 0] + 1
+        best[:, 1:] = np.minimum(previous[:, :-1] + cost, previous[:, 1:] + 1)
+        if before is not None:
+            swapped = (matrix[:, 1:] == query[i - 1]) & (matrix[:, :-1] == byte)
+            best[:, 2:] = np.where(swapped, np.minimum(best[:, 2:], before[:, :-2] + 1), best[:, 2:])
+        # Skipped text bytes: d[j] = min over k <= j of best[k] + (j - k)
+        current = np.minimum.accumulate(best - steps, axis=1) + steps
+        before, previous = previous, current
+    
+    # ... and end anywhere within the text
+    previous[steps[None, :] > lengths[:, None]] = np.iinfo(np.int16).max
+    return previous.min(axis=1)
+
+
+class TrigramIndex:
+    def __init__(self, terms: Sequence[str], weights: Optional[Sequence[float]] = None):
+        """
+        Initialize trigram index
+        
+        Args:
+            terms: Strings to search (e.g. the distinct values of a column)
+            weights: Popularity of each term, used to break ties and to rank
+                autocomplete suggestions (default: all 1)
+        """
+        self.terms = list(terms)
+        self.weights = np.ones(len(self.terms)) if weights is None else np.asarray(weights, dtype=float)
+        self.texts = [normalize(term).encode('utf-8') for term in self.terms]
+        
+        padded = [_pad(text.decode('utf-8')) for text in self.texts]
+        lengths = np.array([len(p) for p in padded], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        owner, codes = _trigram_codes(np.frombuffer(b''.join(padded), np.uint8), starts, lengths)
+        
+        # One entry per (trigram, term), sorted by trigram then term; a plain
+        # sort is much faster here than np.unique's hashing
+        pairs = (codes << 24) | owner
+        pairs.sort()
+        pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])] if len(pairs) else pairs
+        codes = pairs >> 24
+        self.postings = (pairs & 0xFFFFFF).astype(np.int32)
+        self.sizes = np.bincount(self.postings, minlength=len(self.terms))
+        first = np.flatnonzero(np.concatenate([[True], codes[1:] != codes[:-1]])) if len(codes) else np.empty(0, np.int64)
+        self.trigrams = codes[first]
+        self.offsets = np.append(first, len(codes))
+        
+        self._build_text_matrix()
+        self._build_completion_keys()
+    
+    def _build_text_matrix(self):
+        """Normalized texts as one zero-padded byte matrix, so candidates are gathered by indexing"""
+        self.lengths = np.minimum([len(text) for text in self.texts], MAX_TEXT_BYTES).astype(np.int64)
+        starts = np.concatenate([[0], np.cumsum([len(text) for text in self.texts])[:-1]]).astype(np.int64)
+        flat = np.frombuffer(b''.join(self.texts) + b' ', np.uint8)
+        columns = np.arange(self.lengths.max() if len(self.lengths) else 0)
+        inside = columns[None, :] < self.lengths[:, None]
+        self.matrix = np.where(inside, flat[np.minimum(starts[:, None] + columns, len(flat) - 1)], 0).astype(np.uint8)
+    
+    def _build_completion_keys(self):
+        """Sorted KEY_BYTES prefixes of the text from each word start, with their term and offset"""
+        lengths = np.array([len(text) for text in self.texts], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        flat = np.frombuffer(b''.join(self.texts) + b' ', np.uint8)
+        owner = np.repeat(np.arange(len(self.texts)), lengths)
+        position = np.arange(len(owner))
+        word = (flat[:-1] != _SPACE) & ((position == starts[owner]) | (flat[np.maximum(position - 1, 0)] == _SPACE))
+        word_starts, owner = position[word], owner[word]
+        
+        # Bytes past the end of the term are 0, as in a NumPy bytes array
+        window = word_starts[:, None] + np.arange(KEY_BYTES)
+        inside = window < (starts + lengths)[owner][:, None]
+        keys = np.where(inside, flat[np.minimum(window, len(flat) - 1)], 0).astype(np.uint8)
+        # Big-endian halves sort like the bytes
+        halves = keys.view('>u8')
+        order = np.lexsort((halves[:, 1], halves[:, 0]))
+        self.keys = keys[order].view(f'S{KEY_BYTES}').ravel()
+        self.key_terms = owner[order].astype(np.int32)
+        self.key_positions = (word_starts - starts[owner])[order].astype(np.int32)
+    
+    def __len__(self):
+        return len(self.terms)
+    
+    def search(self, query: str, limit: int = 10, min_similarity: float = 0.3,
+               max_candidates: int = 200, max_distance: Optional[int] = None) -> List[Tuple[int, int, float]]:
+        """
+        Terms resembling query, best first
+        
+        Candidates share at least min_similarity of the query's trigrams
+        (leaving out common ones, see COMMON_SHARE); the max_candidates
+        sharing most are ranked by edit distance (see edit_distances), then
+        trigram Jaccard similarity, then weight. Terms more than max_distance
+        edits away (default: a third of the query's length, at least 1) are
+        dropped.
+        
+        Returns:
+            (term index, edit distance, Jaccard similarity) tuples
+        """
+        text = normalize(query)
+        if not text or not len(self.terms):
+            return []
+        padded = _pad(text)
+        _, codes = _trigram_codes(np.frombuffer(padded, np.uint8), np.zeros(1, np.int64),
+                                  np.array([len(padded)], dtype=np.int64))
+        codes = np.unique(codes)
+        
+        position = np.minimum(np.searchsorted(self.trigrams, codes), len(self.trigrams) - 1)
+        position = position[self.trigrams[position] == codes]
+        if len(position) == 0:
+            return []
+        lengths = self.offsets[position + 1] - self.offsets[position]
+        rare = lengths <= max(COMMON_SHARE * len(self.terms), SHORT_POSTING)
+        if rare.sum() < MIN_TRIGRAMS:
+            rare = np.isin(np.arange(len(position)), np.argsort(lengths, kind='stable')[:MIN_TRIGRAMS])
+        position, common = position[rare], position[~rare]
+        used = len(position)
+        
+        postings = np.concatenate([self.postings[self.offsets[p]:self.offsets[p + 1]] for p in position])
+        if len(postings) > len(self.terms) // 8:
+            # Counting beats sorting once the postings cover much of the vocabulary
+            shared = np.bincount(postings, minlength=len(self.terms))
+            candidates = np.flatnonzero(shared >= min_similarity * used)
+            shared = shared[candidates]
+        else:
+            candidates, shared = np.unique(postings, return_counts=True)
+            keep = shared >= min_similarity * used
+            candidates, shared = candidates[keep], shared[keep]
+        
+        recall = shared / used
+        if len(candidates) > max_candidates:
+            # Fewer trigrams in the term breaks ties, as Jaccard similarity would
+            top = np.argpartition(-(recall - self.sizes[candidates] / 1e6), max_candidates - 1)[:max_candidates]
+            candidates, shared = candidates[top], shared[top]
+        
+        # Add the common trigrams back for the shortlist: postings are
+        # sorted, so membership is a binary search
+        for p in common:
+            posting = self.postings[self.offsets[p]:self.offsets[p + 1]]
+            found = np.minimum(np.searchsorted(posting, candidates), len(posting) - 1)
+            shared = shared + (posting[found] == candidates)
+        jaccard = shared / (len(codes) + self.sizes[candidates] - shared)
+        
+        lengths = self.lengths[candidates]
+        width = lengths.max() if len(candidates) else 0
+        distances = edit_distances(text.encode('utf-8')[:MAX_TEXT_BYTES], self.matrix[candidates, :width], lengths)
+        if max_distance is None:
+            max_distance = max(len(text) // 3, 1)
+        order = np.lexsort((-self.weights[candidates], -jaccard, distances))
+        order = order[distances[order] <= max_distance][:limit]
+        return [(int(candidates[i]), int(distances[i]), float(jaccard[i])) for i in order]
+    
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[int, bool]]:
+        """
+        Terms with a word starting with prefix (several words may be typed),
+        terms that start with it first, then by weight
+        
+        Returns:
+            (term index, whether the term itself starts with prefix) tuples
+        """
+        text = normalize(prefix).encode('utf-8')
+        if not text:
+            return []
+        key = text[:KEY_BYTES]
+        low = np.searchsorted(self.keys, np.bytes_(key), side='left')
+        high = np.searchsorted(self.keys, np.bytes_(key + b'\xff'), side='left')
+        terms, positions = self.key_terms[low:high], self.key_positions[low:high]
+        if len(text) > KEY_BYTES:
+            match = np.array([self.texts[t].startswith(text, p) for t, p in zip(terms, positions)], dtype=bool)
+            terms, positions = terms[match], positions[match]
+        at_start = positions == 0
+        if len(terms) == 0:
+            return []
+        
+        if len(terms) > 8 * limit:
+            # Short prefixes match much of the vocabulary; only the best
+            # keys can be in the answer (unless a term has 8 matching words)
+            score = at_start * (self.weights.max() + 1) + self.weights[terms]
+            top = np.argpartition(-score, 8 * limit - 1)[:8 * limit]
+            terms, at_start = terms[top], at_start[top]
+        
+        # A term can match at several words; keep its best
+        order = np.lexsort((-self.weights[terms], ~at_start))
+        terms, at_start = terms[order], at_start[order]
+        _, first = np.unique(terms, return_index=True)
+        first = np.sort(first)[:limit]
+        return [(int(terms[i]), bool(at_start[i])) for i in first]
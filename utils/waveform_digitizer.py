@@ -0,0 +1,189 @@
+"""
+Waveform Digitizer Utility
+Recovers per-channel EEG signals from a scanned or photographed chart: trace
+lanes are found from the row ink profile, each lane is scanned column by
+column with array operations, and the traces are resampled to a nominal rate
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def trace_mask(gray, contrast=40):
+    """
+    Dark trace pixels on light paper, without the chart grid
+    
+    Args:
+        gray: Grayscale chart (uint8)
+        contrast: How much darker than its surroundings a pixel must be;
+            high enough to drop the light (usually red) grid
+    """
+    import cv2
+    
+    block = max(15, (gray.shape[1] // 60) | 1)
+    mask = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, block, contrast)
+    
+    # Dark grid lines that survive the threshold ink most of their row or
+    # column, which no trace does
+    mask[(mask > 0).mean(axis=1) > 0.5, :] = 0
+    mask[:, (mask > 0).mean(axis=0) > 0.5] = 0
+    return mask
+
+
+def find_lanes(mask, n_channels: Optional[int] = None, min_spacing: Optional[int] = None):
+    """
+    Row bands (top, bottom) holding one trace each, from peaks of the
+    smoothed row ink profile; with n_channels, the n strongest peaks
+    """
+    import cv2
+    
+    height = mask.shape[0]
+    min_spacing = min_spacing or max(height // 60, 5)
+    profile = (mask > 0).sum(axis=1).astype(np.float32)
+    smooth = max(min_spacing // 2, 3)
+    profile = np.convolve(profile, np.ones(smooth, np.float32) / smooth, mode='same')
+    
+    # Local maxima over a min_spacing window (a 1-D grey dilation), above a noise floor
+    local_max = cv2.dilate(profile.reshape(-1, 1), np.ones((min_spacing, 1), np.uint8)).ravel()
+    candidates = np.flatnonzero((profile == local_max) & (profile > 0.2 * profile.max()))
+    
+    # Plateaus give runs of equal maxima; keep one per min_spacing
+    peaks = []
+    for row in candidates:
+        if not peaks or row - peaks[-1] >= min_spacing:
+            peaks.append(row)
+    peaks = np.array(peaks, dtype=int)
+    if n_channels is not None and len(peaks) > n_channels:
+        peaks = np.sort(peaks[np.argsort(profile[peaks])[-n_channels:]])
+    if len(peaks) == 0:
+        return []
+    
+    # Lane edges halfway between neighbouring baselines
+    middles = (peaks[1:] + peaks[:-1]) // 2
+    half = int(np.median(np.diff(peaks)) // 2) if len(peaks) > 1 else height // 2
+    tops = np.concatenate([[max(peaks[0] - half, 0)], middles])
+    bottoms = np.concatenate([middles, [min(peaks[-1] + half, height)]])
+    return list(zip(tops.tolist(), bottoms.tolist()))
+
+
+def trace_columns(mask, lanes, max_gap: Optional[int] = None):
+    """
+    Column range (start, end) of the traces: the longest run of columns
+    with ink in at least half the lanes, so channel labels in the margin
+    (broken up by gaps between letters) are left out
+    """
+    width = mask.shape[1]
+    max_gap = max_gap or max(width // 500, 2)
+    inked = np.stack([(mask[top:bottom] > 0).any(axis=0) for top, bottom in lanes])
+    columns = inked.mean(axis=0) >= 0.5
+    
+    # Close gaps up to max_gap columns, then find the longest run
+    closed = columns.copy()
+    gap_starts = np.flatnonzero(columns[:-1] & ~columns[1:]) + 1
+    gap_ends = np.flatnonzero(~columns[:-1] & columns[1:]) + 1
+    for start in gap_starts:
+        ends = gap_ends[gap_ends > start]
+        if len(ends) and ends[0] - start <= max_gap:
+            closed[start:ends[0]] = True
+    
+    edges = np.diff(np.concatenate([[0], closed.astype(np.int8), [0]]))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return 0, 0
+    longest = np.argmax(ends - starts)
+    return int(starts[longest]), int(ends[longest])
+
+
+def stroke_continuity(mask, lanes, columns, max_gap: Optional[int] = None):
+    """
+    Share of each lane's inked columns whose ink belongs to a stroke at
+    least a quarter of the trace columns wide: near 1 for a trace, one
+    unbroken line, and near 0 for dense text, which breaks between words
+    even in joined-up script
+    """
+    import cv2
+    
+    x0, x1 = columns
+    max_gap = max_gap or max(mask.shape[1] // 500, 2)
+    ink = (mask[:, x0:x1] > 0).astype(np.uint8)
+    # Bridge the columns trace_mask cleared under dark grid lines
+    bridged = cv2.dilate(ink, np.ones((1, max_gap + 1), np.uint8))
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(bridged, connectivity=8)
+    long = stats[:, cv2.CC_STAT_WIDTH] >= (x1 - x0) / 4
+    long[0] = False
+    on_long = long[labels] & (ink > 0)
+    
+    continuity = []
+    for top, bottom in lanes:
+        found = np.count_nonzero(ink[top:bottom].any(axis=0))
+        continuity.append(float(np.count_nonzero(on_long[top:bottom].any(axis=0)) / max(found, 1)))
+    return continuity
+
+
+def digitize_strip(gray, n_channels: Optional[int] = None, seconds: float = 10.0, sfreq: float = 256.0,
+                   lane_microvolts: float = 100.0, min_coverage: float = 0.9,
+                   min_continuity: float = 0.8) -> Dict:
+    """
+    Extract one signal per trace lane from a chart image
+    
+    Args:
+        gray: Grayscale chart (uint8), e.g. from utils.ocr.load_grayscale
+        n_channels: Expected number of traces (default: every lane found)
+        seconds: Time spanned by the traces, left to right (10 s per page at
+            the usual 30 mm/s)
+        sfreq: Output sampling rate
+        lane_microvolts: Amplitude equal to one lane spacing, which sets the
+            pixel-to-microvolt scale
+        min_coverage: Share of trace columns a lane's trace must be found in
+            for the image to count as a waveform chart
+        min_continuity: Share of a lane's inked columns that must lie on
+            one long stroke (see stroke_continuity); dense text pages reach
+            the coverage too, but not this
+    
+    Returns:
+        Dictionary with data ((channels, samples) float32 in microvolts),
+        sfreq, lanes, columns, coverage and continuity per lane, and
+        is_waveform
+    """
+    mask = trace_mask(gray)
+    lanes = find_lanes(mask, n_channels)
+    result = {'data': None, 'sfreq': sfreq, 'lanes': lanes, 'columns': (0, 0),
+              'coverage': [], 'continuity': [], 'is_waveform': False}
+    if not lanes:
+        return result
+    
+    x0, x1 = trace_columns(mask, lanes)
+    result['columns'] = (x0, x1)
+    if x1 - x0 < gray.shape[1] // 4:
+        return result
+    
+    spacing = float(np.median([bottom - top for top, bottom in lanes]))
+    scale = lane_microvolts / spacing
+    n_out = int(round(seconds * sfreq))
+    x_out = np.linspace(0, x1 - x0 - 1, n_out)
+    data = np.empty((len(lanes), n_out), dtype=np.float32)
+    coverage = []
+    
+    for channel, (top, bottom) in enumerate(lanes):
+        ink = mask[top:bottom, x0:x1] > 0
+        counts = ink.sum(axis=0)
+        found = counts > 0
+        coverage.append(float(found.mean()))
+        if not found.any():
+            data[channel] = 0.0
+            continue
+        
+        # Median inked row per column: robust to a neighbouring trace's spike
+        # crossing into the lane and to thick strokes
+        cumulative = np.cumsum(ink, axis=0)
+        rows = np.argmax(cumulative >= ((counts + 1) // 2)[None, :], axis=0).astype(np.float32)
+        
+        columns = np.arange(x1 - x0)
+        rows = np.interp(columns, columns[found], rows[found])
+        signal = (np.median(rows) - rows) * scale
+        data[channel] = np.interp(x_out, columns, signal)
+    
+    continuity = stroke_continuity(mask, lanes, (x0, x1))
+    is_waveform = np.median(coverage) >= min_coverage and np.median(continuity) >= min_continuity
+    result.update(data=data, coverage=coverage, continuity=continuity, is_waveform=bool(is_waveform))
+    return result